@@ -0,0 +1,106 @@
+"""One scaled dot-product attention computation behind all the attention scenes.
+
+    attention = Attention.from_embeddings(x, w_q, w_k, w_v)   # x: (..., seq, d_model)
+    attention.q, attention.k, attention.v     # (..., seq, d_k) and (..., seq, d_v)
+    attention.scores                          # Q K^T, (..., seq, seq)
+    attention.scaled_scores                   # Q K^T / sqrt(d_k)
+    attention.weights                         # row-softmax of the scaled scores
+                                              # (causal=True: future positions weighted 0)
+    attention.output                          # weights @ V
+
+Everything is computed once, at construction, with batched matmuls: any
+leading dimensions (heads, prompts) are broadcast, and sequence length and
+d_k are whatever the inputs have.
+
+ADDITION_PROMPT is the toy example the video uses throughout: the four
+tokens of '26 + 55 =' with 3-dimensional queries, keys and values. The Q
+and K^T matrices in self_attention and compute_attn, the scores and softmax
+in text_cal and the value weights in value_vector all fetch the prompt
+through tiny_transformer.prompt_attention(): the trained model's attention
+on these tokens (the same layer and head everywhere) when there is a
+checkpoint, ADDITION_PROMPT otherwise. Either way they agree with each
+other. LONG_ADDITION_PROMPT is an 8-token variant for the full-matrix
+attention scene.
+"""
+import numpy as np
+
+
+def softmax(scores, axis=-1):
+    """Numerically stable softmax along `axis`."""
+    scores = np.asarray(scores, dtype=float)
+    exp = np.exp(scores - scores.max(axis=axis, keepdims=True))
+    return exp / exp.sum(axis=axis, keepdims=True)
+
+
+class Attention:
+    def __init__(self, q, k, v, tokens=None, scale=True, causal=False):
+        self.q = np.asarray(q, dtype=float)
+        self.k = np.asarray(k, dtype=float)
+        self.v = np.asarray(v, dtype=float)
+        self.tokens = None if tokens is None else list(tokens)
+        self.scale = scale
+        self.causal = causal
+
+        self.scores = self.q @ np.swapaxes(self.k, -1, -2)
+        self.scaled_scores = self.scores / np.sqrt(self.d_k) if scale else self.scores
+        if causal:
+            # Scores stay whole for display; only the weights ignore later tokens
+            future = np.triu(np.ones((self.seq_len, self.seq_len), dtype=bool), k=1)
+            self.weights = softmax(np.where(future, -np.inf, self.scaled_scores), axis=-1)
+        else:
+            self.weights = softmax(self.scaled_scores, axis=-1)
+        self.output = self.weights @ self.v
+
+    @classmethod
+    def from_embeddings(cls, x, w_q, w_k, w_v, tokens=None, scale=True, causal=False):
+        """Project token embeddings x (..., seq, d_model) with W_Q, W_K, W_V (d_model, d_k/d_v)."""
+        x = np.asarray(x, dtype=float)
+        return cls(x @ np.asarray(w_q), x @ np.asarray(w_k), x @ np.asarray(w_v),
+                   tokens=tokens, scale=scale, causal=causal)
+
+    @property
+    def seq_len(self):
+        return self.q.shape[-2]
+
+    @property
+    def d_k(self):
+        return self.q.shape[-1]
+
+    def rounded(self, decimals=1):
+        """The same attention recomputed from Q, K, V rounded for display, so on-screen sums check out."""
+        # (+ 0.0 turns -0.0 into 0.0, which would otherwise print as "-0.0")
+        q, k, v = (np.round(values, decimals) + 0.0 for values in (self.q, self.k, self.v))
+        return Attention(q, k, v, tokens=self.tokens, scale=self.scale, causal=self.causal)
+
+
+ADDITION_PROMPT = Attention(
+    q=[
+        [0.2, 0.8, 0.1],  # q_26
+        [0.9, 0.1, 0.3],  # q_+
+        [0.4, 0.6, 0.9],  # q_55
+        [0.1, 0.3, 0.7],  # q_=
+    ],
+    k=[
+        [0.3, 0.7, 0.2],  # k_26
+        [0.8, 0.2, 0.4],  # k_+
+        [0.1, 0.9, 0.6],  # k_55
+        [0.5, 0.3, 0.8],  # k_=
+    ],
+    v=[
+        [0.6, 0.1, 0.3],  # v_26
+        [0.2, 0.5, 0.1],  # v_+
+        [0.7, 0.2, 0.4],  # v_55
+        [0.1, 0.8, 0.5],  # v_=
+    ],
+    tokens=["26", "+", "55", "="],
+)
+
+
+def _random_toy_prompt(tokens, seed, dim=3):
+    """Seeded one-decimal queries, keys and values in [0.1, 0.9], short enough to show on screen."""
+    rng = np.random.default_rng(seed)
+    q, k, v = (rng.integers(1, 10, size=(len(tokens), dim)) / 10 for _ in range(3))
+    return Attention(q, k, v, tokens=tokens)
+
+
+LONG_ADDITION_PROMPT = _random_toy_prompt(["12", "+", "34", "+", "56", "+", "7", "="], seed=8)
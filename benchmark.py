@@ -0,0 +1,242 @@
+"""Benchmark every scene and compare against the committed baseline.
+
+Each scene is rendered several times at low quality (and optionally a fixed
+range of plays at high quality), every run in a fresh process so peak RSS
+and import costs are comparable. Per run we record wall time, CPU time
+(including LaTeX/dvisvgm subprocesses), peak RSS, frames per second and the
+number of Tex strings requested / actually compiled. The median of the runs
+is compared with benchmark_baseline.json, and the command exits non-zero if
+any scene got worse than the threshold.
+
+Usage:
+    python benchmark.py                           # all scenes, compare to baseline
+    python benchmark.py softmax -r 5              # one module, five runs
+    python benchmark.py --high-quality-plays 0:2  # also time plays 0..2 at -q h
+    python benchmark.py --update-baseline         # record a new baseline
+
+Baselines are machine specific: regenerate it on the machine that runs the
+comparison (e.g. CI) rather than comparing numbers across hardware.
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from render_all import QUALITIES, REPO_DIR, discover_scenes, render_scene, select_scenes
+
+BASELINE_PATH = REPO_DIR / "benchmark_baseline.json"
+
+DEFAULT_RUNS = 3
+DEFAULT_THRESHOLD = 0.15
+
+# metric -> True if bigger is worse
+METRICS = {
+    "wall_seconds": True,
+    "cpu_seconds": True,
+    "peak_rss_mb": True,
+    "fps": False,
+    "tex_requests": True,
+}
+
+# Differences smaller than this are noise, whatever the relative change
+ABSOLUTE_TOLERANCE = {
+    "wall_seconds": 0.25,
+    "cpu_seconds": 0.25,
+    "peak_rss_mb": 10.0,
+    "fps": 1.0,
+    "tex_requests": 0,
+}
+
+
+def _install_counters():
+    """Count Tex requests, actual LaTeX compiles and written frames in this process."""
+    from manim.mobject.text import tex_mobject
+    from manim.renderer.cairo_renderer import CairoRenderer
+    from manim.utils import tex_file_writing
+
+    counts = {"tex_requests": 0, "tex_compiles": 0, "frames": 0}
+
+    original_tex_to_svg_file = tex_mobject.tex_to_svg_file
+    original_compile_tex = tex_file_writing.compile_tex
+    original_add_frame = CairoRenderer.add_frame
+
+    def tex_to_svg_file(*args, **kwargs):
+        counts["tex_requests"] += 1
+        return original_tex_to_svg_file(*args, **kwargs)
+
+    def compile_tex(tex_file, tex_compiler, output_format):
+        if not Path(tex_file).with_suffix(output_format).exists():
+            counts["tex_compiles"] += 1
+        return original_compile_tex(tex_file, tex_compiler, output_format)
+
+    def add_frame(self, frame, num_frames=1):
+        if not self.skip_animations:
+            counts["frames"] += num_frames
+        return original_add_frame(self, frame, num_frames)
+
+    tex_mobject.tex_to_svg_file = tex_to_svg_file
+    tex_file_writing.compile_tex = compile_tex
+    CairoRenderer.add_frame = add_frame
+    return counts
+
+
+def _cpu_seconds():
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def benchmark_run(module_name, scene_name, options):
+    """Render one scene once in this (fresh) process and measure it. Runs in a worker."""
+    counts = _install_counters()
+    cpu_start = _cpu_seconds()
+    wall_start = time.perf_counter()
+    result = render_scene(module_name, scene_name, options)
+    wall = time.perf_counter() - wall_start
+    cpu = _cpu_seconds() - cpu_start
+    return {
+        "status": result["status"],
+        "error": result["error"],
+        "wall_seconds": wall,
+        "cpu_seconds": cpu,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "frames": counts["frames"],
+        "fps": counts["frames"] / wall if wall else 0.0,
+        "tex_requests": counts["tex_requests"],
+        "tex_compiles": counts["tex_compiles"],
+    }
+
+
+def benchmark_scene(module_name, scene_name, options, runs):
+    """Median metrics over `runs` fresh-process renders, or a failure entry."""
+    samples = []
+    context = multiprocessing.get_context("spawn")
+    for _ in range(runs):
+        # One short-lived worker per run: nothing stays warm between runs
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            sample = pool.submit(benchmark_run, module_name, scene_name, options).result()
+        if sample["status"] != "ok":
+            return {"status": "failed", "error": sample["error"]}
+        samples.append(sample)
+
+    summary = {"status": "ok", "runs": runs, "frames": samples[0]["frames"]}
+    for metric in METRICS:
+        summary[metric] = round(statistics.median(s[metric] for s in samples), 3)
+    # The first run may have had to compile Tex; later ones hit the SVG cache
+    summary["tex_compiles"] = max(s["tex_compiles"] for s in samples)
+    return summary
+
+
+def variant_name(options):
+    """Baseline key for a quality/play-range combination, e.g. "l" or "h[0:2]"."""
+    if options.get("animations"):
+        start, end = options["animations"]
+        return f"{options['quality']}[{start}:{end}]"
+    return options["quality"]
+
+
+def compare(results, baseline, threshold):
+    """Return [(scene, variant, metric, old, new), ...] for every regression."""
+    regressions = []
+    for scene, variants in results.items():
+        for variant, new in variants.items():
+            old = baseline.get("scenes", {}).get(scene, {}).get(variant)
+            if old is None or new["status"] != "ok" or old.get("status") != "ok":
+                continue
+            for metric, bigger_is_worse in METRICS.items():
+                if metric not in old:
+                    continue
+                delta = new[metric] - old[metric] if bigger_is_worse else old[metric] - new[metric]
+                if delta > ABSOLUTE_TOLERANCE[metric] and delta > threshold * abs(old[metric]):
+                    regressions.append((scene, variant, metric, old[metric], new[metric]))
+    return regressions
+
+
+def parse_play_range(value):
+    start, _, end = value.partition(":")
+    try:
+        return int(start), int(end)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected START:END, got {value!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenes", nargs="*", help='"module", "Scene" or "module:Scene" (default: all)')
+    parser.add_argument("-r", "--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITIES), default="l")
+    parser.add_argument("--high-quality-plays", type=parse_play_range, default=None, metavar="START:END",
+                        help="additionally render only plays START..END at high quality")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown that counts as a regression (default: 0.15)")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="write the results as the new baseline instead of comparing")
+    parser.add_argument("--media-dir", default=str(REPO_DIR / "media" / "benchmark"))
+    args = parser.parse_args(argv)
+
+    scenes = select_scenes(discover_scenes(), args.scenes)
+    if not scenes:
+        print("No scenes matched.", file=sys.stderr)
+        return 1
+
+    # Partial-movie caching would turn every run after the first into a no-op
+    base_options = {"media_dir": args.media_dir, "disable_caching": True}
+    variants = [dict(base_options, quality=args.quality)]
+    if args.high_quality_plays:
+        variants.append(dict(base_options, quality="h", animations=args.high_quality_plays))
+
+    results = {}
+    for module_name, scene_name in scenes:
+        scene = f"{module_name}:{scene_name}"
+        for options in variants:
+            summary = benchmark_scene(module_name, scene_name, options, args.runs)
+            results.setdefault(scene, {})[variant_name(options)] = summary
+            if summary["status"] == "ok":
+                print(f"{scene:<55} {variant_name(options):<8} {summary['wall_seconds']:8.2f}s "
+                      f"{summary['cpu_seconds']:8.2f}s cpu {summary['peak_rss_mb']:7.1f}MB "
+                      f"{summary['fps']:7.1f}fps {summary['tex_requests']:4d} tex", flush=True)
+            else:
+                print(f"{scene:<55} {variant_name(options):<8} FAILED\n{summary['error']}",
+                      file=sys.stderr, flush=True)
+
+    failed = any(v["status"] != "ok" for variants_ in results.values() for v in variants_.values())
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline = {
+            "machine": {"platform": platform.platform(), "python": platform.python_version()},
+            "runs": args.runs,
+            "scenes": results,
+        }
+        if baseline_path.exists():
+            # Keep entries for scenes/variants that were not benchmarked this time
+            previous = json.loads(baseline_path.read_text(encoding="utf-8")).get("scenes", {})
+            for scene, variants_ in results.items():
+                previous.setdefault(scene, {}).update(variants_)
+            baseline["scenes"] = previous
+        baseline_path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Baseline written to {baseline_path}")
+        return 1 if failed else 0
+
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --update-baseline to create one.")
+        return 1 if failed else 0
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    regressions = compare(results, baseline, args.threshold)
+    for scene, variant, metric, old, new in regressions:
+        print(f"REGRESSION {scene} [{variant}] {metric}: {old} -> {new}", file=sys.stderr)
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%} against {baseline_path.name}.")
+    return 1 if failed or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+"""Square-bracketed matrix of MathTex entries backed by a NumPy array of values.
+
+    q = BracketMatrix(q_values, origin=LEFT * 3.2, h_spacing=0.7, color=BLUE)
+    q.cell(3, 0)              # the entry in row 3, column 0
+    q.row_bounds(3)           # (left, right, top, bottom) of that row's entries
+    q.bracket_bounds()        # (left, right, top, bottom) of the brackets
+    q.highlight(rows=3)       # rectangle behind row 3; also cols=, cells, slices
+
+q[0] is the flat, row-major VGroup of entries and q[1] the six bracket
+lines, the same layout the scenes used to build by hand. Each distinct
+entry (text and colour) is typeset once and copied, cell positions and
+bounding boxes are computed with array operations, and the box of any
+row/column span or block comes from a SpanIndex built once per matrix, so
+a 32x32 matrix costs about as much Tex as its number of distinct values
+and every highlight after that is O(1). Layout queries follow the matrix when it is
+moved or uniformly scaled.
+"""
+import numpy as np
+from manim import DOWN, ORIGIN, RIGHT, WHITE, YELLOW, Line, MathTex, Rectangle, VGroup
+
+BRACKET_WIDTH = 0.3
+BRACKET_STROKE_WIDTH = 4
+BRACKET_OVERLAP = 0.02
+# Cubic Bezier handles of a straight line, as Line places them
+_LINE_WEIGHTS = np.array([0, 1 / 3, 2 / 3, 1])[:, None]
+
+
+def bracket_segments(left, right, top, bottom, bracket_width=BRACKET_WIDTH, overlap=BRACKET_OVERLAP):
+    """(6, 2, 3) start/end points: left vertical, top, bottom, then the same for the right bracket."""
+    return np.array([
+        [[left, top + overlap, 0], [left, bottom - overlap, 0]],
+        [[left - overlap, top, 0], [left + bracket_width, top, 0]],
+        [[left - overlap, bottom, 0], [left + bracket_width, bottom, 0]],
+        [[right, top + overlap, 0], [right, bottom - overlap, 0]],
+        [[right - bracket_width, top, 0], [right + overlap, top, 0]],
+        [[right - bracket_width, bottom, 0], [right + overlap, bottom, 0]],
+    ], dtype=float)
+
+
+def create_brackets(left, right, top, bottom, color=WHITE, stroke_width=BRACKET_STROKE_WIDTH,
+                    bracket_width=BRACKET_WIDTH, overlap=BRACKET_OVERLAP):
+    """VGroup of the six Lines of a pair of square brackets around the given box."""
+    return VGroup(*(
+        Line(start=start, end=end, stroke_width=stroke_width, color=color)
+        for start, end in bracket_segments(left, right, top, bottom, bracket_width, overlap)
+    ))
+
+
+def grid_positions(shape, origin, h_spacing, v_spacing):
+    """(rows, cols, 3) centres origin + c * h_spacing * RIGHT + r * v_spacing * DOWN."""
+    rows, cols = np.indices(shape)
+    return (
+        np.asarray(origin, dtype=float)
+        + cols[..., None] * (h_spacing * RIGHT)
+        + rows[..., None] * (v_spacing * DOWN)
+    )
+
+
+def _padded_bounds(positions, h_padding, v_padding):
+    """(left, right, top, bottom) `h_padding` / `v_padding` outside the outermost centres."""
+    centres = positions.reshape(-1, 3)
+    return (
+        centres[:, 0].min() - h_padding,
+        centres[:, 0].max() + h_padding,
+        centres[:, 1].max() + v_padding,
+        centres[:, 1].min() - v_padding,
+    )
+
+
+def _box_to_bounds(low, high):
+    return low[0], high[0], high[1], low[1]
+
+
+def _span(index, n):
+    """(start, stop) of None (everything), an index, or a contiguous slice/range."""
+    if index is None:
+        return 0, n
+    if isinstance(index, (slice, range)):
+        start, stop, step = slice(index.start, index.stop, index.step).indices(n)
+        if step != 1 or stop <= start:
+            raise ValueError(f"Expected a non-empty contiguous span, got {index!r}")
+        return start, stop
+    index = int(index)
+    if not -n <= index < n:
+        raise IndexError(f"Index {index} out of range for size {n}")
+    return index % n, index % n + 1
+
+
+class SpanIndex:
+    """
+    Bounding box of any rectangular block of cells in O(1).
+
+    A 2D sparse table: level (a, b) holds the box of every 2**a x 2**b block,
+    so any block is covered by four (overlapping) stored blocks. Building it
+    is O(rows * cols * log(rows) * log(cols)) array work, done once per matrix.
+    """
+
+    def __init__(self, lows, highs):
+        n_rows, n_cols = lows.shape[:2]
+        self.levels = {}
+        row_lows, row_highs = lows, highs
+        a = 0
+        while True:
+            block_lows, block_highs = row_lows, row_highs
+            b = 0
+            while True:
+                self.levels[a, b] = (block_lows, block_highs)
+                width = 1 << b
+                if 2 * width > n_cols:
+                    break
+                block_lows = np.minimum(block_lows[:, :-width], block_lows[:, width:])
+                block_highs = np.maximum(block_highs[:, :-width], block_highs[:, width:])
+                b += 1
+            height = 1 << a
+            if 2 * height > n_rows:
+                break
+            row_lows = np.minimum(row_lows[:-height], row_lows[height:])
+            row_highs = np.maximum(row_highs[:-height], row_highs[height:])
+            a += 1
+
+    def box(self, r0, r1, c0, c1):
+        """(low, high) corners of the cells in rows [r0, r1) x cols [c0, c1)."""
+        a = int(r1 - r0).bit_length() - 1
+        b = int(c1 - c0).bit_length() - 1
+        lows, highs = self.levels[a, b]
+        rows = [r0, r1 - (1 << a)]
+        cols = [c0, c1 - (1 << b)]
+        corner_lows = lows[np.ix_(rows, cols)].reshape(-1, 3)
+        corner_highs = highs[np.ix_(rows, cols)].reshape(-1, 3)
+        return corner_lows.min(axis=0), corner_highs.max(axis=0)
+
+
+class BracketMatrix(VGroup):
+    """
+    values: 2D array-like; entry (r, c) is typeset as entry_format.format(values[r][c]).
+    Entries are centred on origin + c * h_spacing * RIGHT + r * v_spacing * DOWN,
+    or on `positions` (rows x cols x 3) when given. The brackets sit `h_padding` /
+    `v_padding` outside the outermost entry centres unless `bounds`
+    (left, right, top, bottom) is given explicitly.
+    """
+
+    # Array attributes that fully describe the layout (see scene_state.py)
+    SNAPSHOT_FIELDS = ("values", "_positions", "_lows", "_highs", "_bounds", "_anchor")
+
+    def __init__(
+        self,
+        values,
+        origin=ORIGIN,
+        h_spacing=0.9,
+        v_spacing=0.8,
+        h_padding=0.5,
+        v_padding=0.4,
+        positions=None,
+        bounds=None,
+        font_size=36,
+        color=WHITE,
+        cell_colors=None,
+        bracket_color=None,
+        entry_format="{}",
+        element_to_mobject=MathTex,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.values = np.asarray(values)
+        n_rows, n_cols = self.values.shape
+
+        if positions is None:
+            positions = grid_positions((n_rows, n_cols), origin, h_spacing, v_spacing)
+        self._positions = np.asarray(positions, dtype=float).reshape(n_rows, n_cols, 3)
+
+        if bounds is None:
+            bounds = _padded_bounds(self._positions, h_padding, v_padding)
+        self._bounds = np.array(bounds, dtype=float)
+
+        entries = self._create_entries(font_size, color, cell_colors, entry_format, element_to_mobject)
+        brackets = create_brackets(*self._bounds, color=color if bracket_color is None else bracket_color)
+        self.add(entries, brackets)
+        # The left vertical bracket line tracks later moves/scales of the whole matrix
+        self._anchor = np.array([brackets[0].points[0], brackets[0].points[-1]])
+        self._span_index = None
+
+    def _create_entries(self, font_size, color, cell_colors, entry_format, element_to_mobject):
+        # Typeset every distinct (text, colour) once; cells are copies shifted into place
+        prototypes = {}
+        prototype_index = np.empty(self.values.shape, dtype=np.intp)
+        cells = []
+        for (r, c), value in np.ndenumerate(self.values):
+            cell_color = color if cell_colors is None else cell_colors[r][c]
+            text = entry_format.format(value)
+            key = (text, str(cell_color))
+            if key not in prototypes:
+                prototypes[key] = (len(prototypes), element_to_mobject(text, font_size=font_size, color=cell_color))
+            prototype_index[r, c], prototype = prototypes[key]
+            cells.append(prototype.copy())
+
+        protos = [prototype for _, prototype in prototypes.values()]
+        centres = np.array([p.get_center() for p in protos])
+        lows = np.array([p.get_all_points().min(axis=0) for p in protos])
+        highs = np.array([p.get_all_points().max(axis=0) for p in protos])
+
+        shifts = self._positions - centres[prototype_index]
+        for cell, shift in zip(cells, shifts.reshape(-1, 3)):
+            cell.shift(shift)
+        self._lows = self._positions + (lows - centres)[prototype_index]
+        self._highs = self._positions + (highs - centres)[prototype_index]
+        return VGroup(*cells)
+
+    @property
+    def n_rows(self):
+        return self.values.shape[0]
+
+    @property
+    def n_cols(self):
+        return self.values.shape[1]
+
+    @property
+    def entries(self):
+        return self[0]
+
+    @property
+    def brackets(self):
+        return self[1]
+
+    def cell(self, row, col):
+        return self[0][row * self.n_cols + col]
+
+    def row_cells(self, row):
+        return VGroup(*self[0].submobjects[row * self.n_cols:(row + 1) * self.n_cols])
+
+    def column_cells(self, col):
+        return VGroup(*self[0].submobjects[col::self.n_cols])
+
+    def _current(self, points):
+        """Map points from the layout at construction to where the matrix is now."""
+        line = self[1][0]
+        start, end = line.points[0], line.points[-1]
+        scale = np.linalg.norm(end - start) / np.linalg.norm(self._anchor[1] - self._anchor[0])
+        return start + scale * (np.asarray(points) - self._anchor[0])
+
+    def cell_positions(self):
+        """(rows, cols, 3) entry centres."""
+        return self._current(self._positions)
+
+    def cell_center(self, row, col):
+        return self._current(self._positions[row, col])
+
+    def bracket_bounds(self):
+        """(left, right, top, bottom) of the brackets."""
+        left, right, top, bottom = self._bounds
+        return _box_to_bounds(*self._current([[left, bottom, 0], [right, top, 0]]))
+
+    @property
+    def span_index(self):
+        # Built on first use (also for matrices restored from a snapshot)
+        if getattr(self, "_span_index", None) is None:
+            self._span_index = SpanIndex(self._lows, self._highs)
+        return self._span_index
+
+    def span_bounds(self, rows=None, cols=None):
+        """
+        (left, right, top, bottom) around the entries in rows x cols, as typeset.
+        rows/cols: None for all, an index, or a contiguous slice/range.
+        """
+        r0, r1 = _span(rows, self.n_rows)
+        c0, c1 = _span(cols, self.n_cols)
+        return _box_to_bounds(*self._current(self.span_index.box(r0, r1, c0, c1)))
+
+    def cell_bounds(self, row, col):
+        return self.span_bounds(row, col)
+
+    def row_bounds(self, row):
+        return self.span_bounds(rows=row)
+
+    def column_bounds(self, col):
+        return self.span_bounds(cols=col)
+
+    def highlight(self, rows=None, cols=None, color=YELLOW, opacity=0.3, h_buff=0.2, v_buff=0.15):
+        """Borderless rectangle behind the entries in rows x cols (see span_bounds)."""
+        left, right, top, bottom = self.span_bounds(rows, cols)
+        left, right, top, bottom = left - h_buff, right + h_buff, top + v_buff, bottom - v_buff
+        rect = Rectangle(
+            width=right - left,
+            height=top - bottom,
+            fill_color=color,
+            fill_opacity=opacity,
+            stroke_width=0
+        )
+        rect.move_to([(left + right) / 2, (top + bottom) / 2, 0])
+        return rect
+
+    def rearrange(self, positions=None, origin=ORIGIN, h_spacing=0.9, v_spacing=0.8, h_padding=0.5, v_padding=0.4,
+                  bounds=None):
+        """
+        Move the entries to a new layout (the constructor's layout arguments) and redraw the
+        brackets around it. Entries are only shifted, never re-typeset or scaled, so this also
+        works on a matrix restored from a snapshot.
+        """
+        if positions is None:
+            positions = grid_positions(self.values.shape, origin, h_spacing, v_spacing)
+        positions = np.asarray(positions, dtype=float).reshape(self.n_rows, self.n_cols, 3)
+        shifts = positions - self.cell_positions()
+        for cell, shift in zip(self[0], shifts.reshape(-1, 3)):
+            cell.shift(shift)
+
+        # From here on the layout is described in the current coordinates
+        self._lows = self._current(self._lows) + shifts
+        self._highs = self._current(self._highs) + shifts
+        self._positions = positions
+        if bounds is None:
+            bounds = _padded_bounds(positions, h_padding, v_padding)
+        self._bounds = np.array(bounds, dtype=float)
+        for line, (start, end) in zip(self[1], bracket_segments(*self._bounds)):
+            line.set_points(start + _LINE_WEIGHTS * (end - start))
+        self._anchor = np.array([self[1][0].points[0], self[1][0].points[-1]])
+        self._span_index = None
+        return self
+
+    def snapshot_fields(self):
+        return {name: np.asarray(getattr(self, name)).tolist() for name in self.SNAPSHOT_FIELDS}
+
+    @classmethod
+    def from_snapshot(cls, fields):
+        """An empty matrix with the saved layout; scene_state.py restores its submobjects."""
+        matrix = cls.__new__(cls)
+        VGroup.__init__(matrix)
+        for name in cls.SNAPSHOT_FIELDS:
+            setattr(matrix, name, np.asarray(fields[name]))
+        return matrix
@@ -0,0 +1,172 @@
+"""Real token embeddings for tok_em, read straight from a memory-mapped .npy.
+
+    table = load_embedding_table()            # None if there is no data file
+    ids = table.token_ids(["26", "+", "55", "="])
+    vectors = table.gather(ids)               # (4, 768) rows, the rest stays on disk
+    points = table.project(ids)               # (4, 3) in the top-3 principal axes
+
+The table is a (vocab_size, dim) float .npy (data/embeddings.npy, or
+$EMBEDDINGS_PATH), opened with mmap_mode="r": gathering a few rows of a
+50k x 768 table only reads those rows. The vocabulary (data/vocab.json next
+to it, a {token: id} object or a list of tokens) is optional; without it
+tokens are addressed by id only.
+
+The 3D projection is a randomized truncated PCA over the whole table:
+subspace iteration on the covariance, where every pass streams the table in
+row batches through two small matrix products, so memory stays at one batch
+plus dim x (k + oversampling) floats. The fitted mean and components are
+cached in media/embedding_cache, keyed by the file's path, size, mtime and
+the PCA parameters, so only the first render after the table changes pays
+for the fit.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+REPO_DIR = Path(__file__).resolve().parent
+DEFAULT_EMBEDDINGS = REPO_DIR / "data" / "embeddings.npy"
+DEFAULT_CACHE_DIR = REPO_DIR / "media" / "embedding_cache"
+
+# Rows streamed per matrix product while fitting the PCA
+BATCH_ROWS = 8192
+
+
+def _orthonormalize(matrix):
+    q, _ = np.linalg.qr(matrix)
+    return q
+
+
+def randomized_pca(table, n_components=3, oversample=10, n_iter=4, batch_rows=BATCH_ROWS, seed=0):
+    """
+    (mean, components, explained_variance) of the rows of `table`, which may be a memmap.
+    components is (n_components, dim), largest variance first.
+    """
+    n_rows, dim = table.shape
+    batches = [slice(start, min(start + batch_rows, n_rows)) for start in range(0, n_rows, batch_rows)]
+
+    # 1) Mean, one batch at a time
+    mean = np.zeros(dim)
+    for batch in batches:
+        mean += np.asarray(table[batch], dtype=np.float64).sum(axis=0)
+    mean /= n_rows
+
+    def covariance_times(basis):
+        # (X - mean).T @ (X - mean) @ basis / n, without ever holding X
+        product = np.zeros_like(basis)
+        for batch in batches:
+            rows = np.asarray(table[batch], dtype=np.float64) - mean
+            product += rows.T @ (rows @ basis)
+        return product / n_rows
+
+    # 2) Subspace iteration from a random start, re-orthonormalized every pass
+    rank = min(n_components + oversample, dim)
+    basis = _orthonormalize(np.random.default_rng(seed).standard_normal((dim, rank)))
+    for _ in range(n_iter):
+        basis = _orthonormalize(covariance_times(basis))
+
+    # 3) Rayleigh-Ritz: exact eigenpairs of the covariance restricted to the subspace
+    projected = basis.T @ covariance_times(basis)
+    eigenvalues, eigenvectors = np.linalg.eigh((projected + projected.T) / 2)
+    order = np.argsort(eigenvalues)[::-1][:n_components]
+    components = (basis @ eigenvectors[:, order]).T
+    # Fix each axis' sign so the projection does not flip between fits
+    signs = np.sign(components[np.arange(len(components)), np.abs(components).argmax(axis=1)])
+    return mean, components * signs[:, None], eigenvalues[order]
+
+
+class EmbeddingTable:
+    def __init__(self, path, vocab_path=None, cache_dir=DEFAULT_CACHE_DIR):
+        self.path = Path(path)
+        self.matrix = np.load(self.path, mmap_mode="r")
+        if self.matrix.ndim != 2:
+            raise ValueError(f"Expected a (vocab_size, dim) matrix in {self.path}, got shape {self.matrix.shape}")
+        self.vocab = self._load_vocab(vocab_path) if vocab_path is not None and Path(vocab_path).exists() else None
+        self.cache_dir = Path(cache_dir)
+        self._pca = {}
+
+    @staticmethod
+    def _load_vocab(vocab_path):
+        with open(vocab_path, encoding="utf-8") as f:
+            vocab = json.load(f)
+        if isinstance(vocab, list):
+            return {token: index for index, token in enumerate(vocab)}
+        return {token: int(index) for token, index in vocab.items()}
+
+    @property
+    def vocab_size(self):
+        return self.matrix.shape[0]
+
+    @property
+    def dim(self):
+        return self.matrix.shape[1]
+
+    def token_ids(self, tokens):
+        """Ids of `tokens` in the vocabulary (KeyError naming the missing ones)."""
+        if self.vocab is None:
+            raise KeyError(f"No vocabulary next to {self.path}; address tokens by id")
+        missing = [token for token in tokens if token not in self.vocab]
+        if missing:
+            raise KeyError(f"Not in the vocabulary: {missing}")
+        return np.array([self.vocab[token] for token in tokens], dtype=np.intp)
+
+    def gather(self, ids):
+        """(len(ids), dim) float rows; only the distinct rows asked for are read, in file order."""
+        ids = np.asarray(ids, dtype=np.intp)
+        unique, inverse = np.unique(ids, return_inverse=True)
+        return np.asarray(self.matrix[unique], dtype=np.float64)[inverse.reshape(ids.shape)]
+
+    def _cache_path(self, params):
+        stat = self.path.stat()
+        key = json.dumps([str(self.path.resolve()), stat.st_size, stat.st_mtime_ns,
+                          list(self.matrix.shape), str(self.matrix.dtype), params])
+        return self.cache_dir / f"pca-{hashlib.sha256(key.encode()).hexdigest()[:24]}.npz"
+
+    def pca(self, n_components=3, oversample=10, n_iter=4, seed=0):
+        """(mean, components, explained_variance) of the whole table, from the disk cache when possible."""
+        params = {"n_components": n_components, "oversample": oversample, "n_iter": n_iter, "seed": seed}
+        key = tuple(params.values())
+        if key in self._pca:
+            return self._pca[key]
+
+        cache_path = self._cache_path(params)
+        try:
+            with np.load(cache_path) as cached:
+                fit = cached["mean"], cached["components"], cached["explained_variance"]
+        except (OSError, KeyError, ValueError):
+            fit = randomized_pca(self.matrix, **params)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Atomic write: a concurrent render never sees half a file
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".npz")
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, mean=fit[0], components=fit[1], explained_variance=fit[2])
+            os.replace(tmp_path, cache_path)
+        self._pca[key] = fit
+        return fit
+
+    def project(self, ids, n_components=3):
+        """(len(ids), n_components) coordinates of the tokens along the table's principal axes."""
+        mean, components, _ = self.pca(n_components)
+        return (self.gather(ids) - mean) @ components.T
+
+
+def load_embedding_table(path=None, vocab_path=None, cache_dir=DEFAULT_CACHE_DIR):
+    """The EmbeddingTable at `path` ($EMBEDDINGS_PATH, then data/embeddings.npy), or None if there is none."""
+    if path is None:
+        path = os.environ.get("EMBEDDINGS_PATH") or DEFAULT_EMBEDDINGS
+    path = Path(path)
+    if not path.exists():
+        return None
+    if vocab_path is None:
+        vocab_path = path.with_name("vocab.json")
+    return EmbeddingTable(path, vocab_path=vocab_path, cache_dir=cache_dir)
+
+
+def fit_to_extent(points, extent):
+    """Scale points about the origin so the largest |coordinate| is `extent`."""
+    points = np.asarray(points, dtype=float)
+    largest = np.abs(points).max()
+    return points if largest == 0 else points * (extent / largest)
@@ -0,0 +1,135 @@
+"""Reusable frame buffers between the Cairo rasterizer and the encoders.
+
+The render loop has two stages that can overlap:
+
+  1. interpolation + rasterization (main thread; the two share mobject
+     state, so they cannot run apart),
+  2. colour conversion + encoding (one manim worker thread per segment,
+     fed through a bounded queue).
+
+manim already runs stage 2 on its own threads, but every frame handed over
+is a fresh copy of camera.pixel_array (8 MB at 1080p, 33 MB at 4K), so a
+long scene allocates and page-faults its way through gigabytes of
+short-lived arrays. install() replaces that copy with a fixed pool of
+buffers: the rasterizer copies into a free buffer, the encoder thread hands
+it back once the frame is encoded, and when every buffer is in flight the
+rasterizer waits for the encoder. Memory stays bounded by the pool size no
+matter how long the scene is.
+"""
+import logging
+import queue
+import threading
+
+import numpy as np
+
+# A buffer we never got back (e.g. the encoder failed and drained its queue)
+# must not stall rendering forever; after this long we allocate instead.
+ACQUIRE_TIMEOUT = 5.0
+
+logger = logging.getLogger(__name__)
+
+
+class FramePool:
+    """Fixed set of frame buffers shared by the rasterizer and the encoders."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.waits = 0
+        self._free = queue.LifoQueue()
+        self._owned = {}
+        self._shape = None
+        self._lock = threading.Lock()
+
+    def acquire(self, like):
+        """A buffer shaped like `like`; blocks while all buffers are in flight."""
+        with self._lock:
+            if self._shape != (like.shape, like.dtype):
+                # Resolution changed: start a fresh pool, old buffers just expire
+                self._shape = (like.shape, like.dtype)
+                self._free = queue.LifoQueue()
+                self._owned = {}
+            free = self._free
+            if free.empty() and len(self._owned) < self.capacity:
+                buffer = np.empty_like(like)
+                self._owned[id(buffer)] = buffer
+                return buffer
+
+        try:
+            return free.get_nowait()
+        except queue.Empty:
+            self.waits += 1
+        try:
+            return free.get(timeout=ACQUIRE_TIMEOUT)
+        except queue.Empty:
+            logger.warning("No frame buffer returned within %.0fs; allocating a new one", ACQUIRE_TIMEOUT)
+            return np.empty_like(like)
+
+    def release(self, buffer):
+        """Return `buffer` to the pool (no-op for arrays the pool does not own)."""
+        with self._lock:
+            if self._owned.get(id(buffer)) is buffer:
+                self._free.put(buffer)
+
+
+_pool = None
+
+
+def pool_capacity(file_writer):
+    """One buffer per queue slot of every in-flight encoder, plus one being filled."""
+    settings = getattr(file_writer, "settings", None)
+    if settings is None:
+        return 4
+    return settings.encoder_queue_size * settings.max_inflight_encoders + 2
+
+
+def install():
+    """Route rendered frames through a shared FramePool. Returns False if this manim lacks the hooks."""
+    global _pool
+    if _pool is not None:
+        return True
+
+    from manim.renderer.cairo_renderer import CairoRenderer
+    from manim.scene.scene_file_writer import SceneFileWriter
+
+    try:
+        from manim.scene.video_segment_encoder import VideoSegmentEncoder
+    except ImportError:
+        return False
+
+    _pool = FramePool(capacity=4)
+
+    def render(self, scene, time, moving_mobjects=None):
+        self.update_frame(scene, moving_mobjects)
+        if self.skip_animations:
+            return
+        if _pool.capacity != pool_capacity(self.file_writer):
+            _pool.capacity = pool_capacity(self.file_writer)
+        frame = _pool.acquire(self.camera.pixel_array)
+        np.copyto(frame, self.camera.pixel_array)
+        self.add_frame(frame)
+
+    original_write_frame = SceneFileWriter.write_frame
+
+    def write_frame(self, pixels, *, repeat=1):
+        # Only frames that reach an encoder queue are released by the encoder thread
+        job = getattr(self, "_current_encode_job", None)
+        queued = job is not None and not job.failed and self.output_spec.is_video
+        try:
+            return original_write_frame(self, pixels, repeat=repeat)
+        finally:
+            if not queued:
+                _pool.release(pixels)
+
+    original_encode = VideoSegmentEncoder.write_frame
+
+    def encode(self, pixels, *, repeat=1):
+        try:
+            return original_encode(self, pixels, repeat=repeat)
+        finally:
+            # The frame has been converted into the encoder's own buffers by now
+            _pool.release(pixels)
+
+    CairoRenderer.render = render
+    SceneFileWriter.write_frame = write_frame
+    VideoSegmentEncoder.write_frame = encode
+    return True
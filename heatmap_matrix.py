@@ -0,0 +1,188 @@
+"""Large matrices drawn as one colour-mapped image instead of one Tex per cell.
+
+    heatmap = HeatmapMatrix(scores, cell_size=0.08)        # 64x64 -> one 64x64 texture
+    heatmap.labels([(63, 0), (63, 1)])                     # Tex only for the cells asked for
+    heatmap.highlight(rows=63)                             # rectangle over a row, like BracketMatrix
+    self.play(MorphHeatmap(heatmap, softmax(scores)))      # cross-fade the pixels to new values
+
+A BracketMatrix costs a Tex per distinct value and a path per cell; a
+HeatmapMatrix is Group(image, brackets) where the image is an ImageMobject
+with one pixel per cell, coloured through a lookup table and upscaled with
+nearest-neighbour sampling so cells stay crisp. Values are mapped to
+[vmin, vmax] (by default the matrix's own range) and looked up in the LUT
+in a single indexing operation, whatever the matrix size.
+
+MorphHeatmap interpolates the pixel arrays of the current and the new
+colouring directly, so a before/after-softmax transition is one array lerp
+per frame rather than a Transform of thousands of glyphs.
+"""
+import numpy as np
+from manim import (
+    BLUE_D, DARK_BLUE, GREEN_C, RESAMPLING_ALGORITHMS, TEAL_C, WHITE, YELLOW, YELLOW_C,
+    Animation, Group, ImageMobject, ManimColor, MathTex, Rectangle, VGroup,
+)
+from manim.utils.rate_functions import smooth
+
+from bracket_matrix import _span, create_brackets
+
+HEATMAP_COLORS = (DARK_BLUE, BLUE_D, TEAL_C, GREEN_C, YELLOW_C)
+LUT_SIZE = 256
+
+
+def colormap_lut(colors=HEATMAP_COLORS, size=LUT_SIZE):
+    """(size, 4) uint8 RGBA table running linearly through `colors`."""
+    stops = np.array([ManimColor(color).to_rgb() for color in colors])
+    positions = np.linspace(0, 1, len(stops))
+    samples = np.linspace(0, 1, size)
+    rgb = np.column_stack([np.interp(samples, positions, stops[:, channel]) for channel in range(3)])
+    return np.column_stack([np.round(rgb * 255), np.full(size, 255)]).astype(np.uint8)
+
+
+def value_range(values, vmin=None, vmax=None):
+    values = np.asarray(values, dtype=float)
+    vmin = float(values.min()) if vmin is None else vmin
+    vmax = float(values.max()) if vmax is None else vmax
+    return vmin, vmax
+
+
+def values_to_pixels(values, lut, vmin, vmax):
+    """(rows, cols, 4) uint8 pixels: each value's LUT entry, clipped to [vmin, vmax]."""
+    values = np.asarray(values, dtype=float)
+    scale = (len(lut) - 1) / (vmax - vmin) if vmax > vmin else 0.0
+    indices = np.clip(np.round((values - vmin) * scale), 0, len(lut) - 1).astype(np.intp)
+    return lut[indices]
+
+
+class HeatmapMatrix(Group):
+    """
+    values: 2D array-like, drawn as rows x cols cells of `cell_size`, centred on the origin.
+    Brackets sit `h_padding` / `v_padding` outside the image.
+    """
+
+    def __init__(
+        self,
+        values,
+        cell_size=0.1,
+        vmin=None,
+        vmax=None,
+        colors=HEATMAP_COLORS,
+        h_padding=0.15,
+        v_padding=0.15,
+        bracket_color=WHITE,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.values = np.asarray(values, dtype=float)
+        self.vmin, self.vmax = value_range(self.values, vmin, vmax)
+        self.lut = colormap_lut(colors)
+
+        n_rows, n_cols = self.values.shape
+        image = ImageMobject(values_to_pixels(self.values, self.lut, self.vmin, self.vmax))
+        image.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        image.stretch_to_fit_width(n_cols * cell_size)
+        image.stretch_to_fit_height(n_rows * cell_size)
+        image.move_to([0, 0, 0])
+
+        left, right = image.get_left()[0] - h_padding, image.get_right()[0] + h_padding
+        top, bottom = image.get_top()[1] + v_padding, image.get_bottom()[1] - v_padding
+        self.add(image, create_brackets(left, right, top, bottom, color=bracket_color))
+
+    @property
+    def n_rows(self):
+        return self.values.shape[0]
+
+    @property
+    def n_cols(self):
+        return self.values.shape[1]
+
+    @property
+    def image(self):
+        return self[0]
+
+    @property
+    def brackets(self):
+        return self[1]
+
+    def pixels(self, values, vmin=None, vmax=None):
+        """Pixels for `values` through this matrix's LUT, over their own range unless given."""
+        return values_to_pixels(values, self.lut, *value_range(values, vmin, vmax))
+
+    def set_values(self, values, vmin=None, vmax=None):
+        self.values = np.asarray(values, dtype=float)
+        self.vmin, self.vmax = value_range(self.values, vmin, vmax)
+        self.image.pixel_array = values_to_pixels(self.values, self.lut, self.vmin, self.vmax)
+        return self
+
+    def _corners(self):
+        # ImageMobject points are its UL, UR, DL, DR corners, wherever it has been moved
+        top_left, top_right, bottom_left, _ = self.image.points
+        return top_left, top_right - top_left, bottom_left - top_left
+
+    def cell_center(self, row, col):
+        origin, across, down = self._corners()
+        return origin + (col + 0.5) / self.n_cols * across + (row + 0.5) / self.n_rows * down
+
+    def span_bounds(self, rows=None, cols=None):
+        """(left, right, top, bottom) of the cells in rows x cols (None, an index or a contiguous slice)."""
+        r0, r1 = _span(rows, self.n_rows)
+        c0, c1 = _span(cols, self.n_cols)
+        origin, across, down = self._corners()
+        corners = np.array([
+            origin + c / self.n_cols * across + r / self.n_rows * down
+            for r in (r0, r1) for c in (c0, c1)
+        ])
+        return corners[:, 0].min(), corners[:, 0].max(), corners[:, 1].max(), corners[:, 1].min()
+
+    def highlight(self, rows=None, cols=None, color=YELLOW, opacity=0.0, stroke_width=3, buff=0.03):
+        """Outline (optionally filled) around the cells in rows x cols."""
+        left, right, top, bottom = self.span_bounds(rows, cols)
+        rect = Rectangle(
+            width=right - left + 2 * buff,
+            height=top - bottom + 2 * buff,
+            stroke_color=color,
+            stroke_width=stroke_width,
+            fill_color=color,
+            fill_opacity=opacity,
+        )
+        rect.move_to([(left + right) / 2, (top + bottom) / 2, 0])
+        return rect
+
+    def labels(self, cells, entry_format="{:.2f}", font_size=20, color=WHITE, background_opacity=0.75):
+        """Tex of the values of the given (row, col) cells, on a dark backing so they read over the image."""
+        labels = VGroup()
+        for row, col in cells:
+            label = MathTex(entry_format.format(self.values[row, col]), font_size=font_size, color=color)
+            label.move_to(self.cell_center(row, col))
+            if background_opacity:
+                label.add_background_rectangle(opacity=background_opacity)
+            labels.add(label)
+        return labels
+
+
+class MorphHeatmap(Animation):
+    """Cross-fade a HeatmapMatrix's pixels to the colouring of new `values` (same shape)."""
+
+    def __init__(self, heatmap, values, vmin=None, vmax=None, rate_func=smooth, **kwargs):
+        self.target_values = np.asarray(values, dtype=float)
+        if self.target_values.shape != heatmap.values.shape:
+            raise ValueError(f"Expected values of shape {heatmap.values.shape}, got {self.target_values.shape}")
+        self.target_range = value_range(self.target_values, vmin, vmax)
+        self.target_pixels = heatmap.pixels(self.target_values, *self.target_range).astype(float)
+        super().__init__(heatmap, rate_func=rate_func, **kwargs)
+
+    def begin(self):
+        # Nothing to copy or align: only the image's pixel array changes
+        self.start_pixels = self.mobject.image.pixel_array.astype(float)
+        self.interpolate_mobject(0)
+
+    def finish(self):
+        self.interpolate_mobject(1)
+        self.mobject.set_values(self.target_values, *self.target_range)
+
+    def get_all_mobjects(self):
+        return (self.mobject,)
+
+    def interpolate_mobject(self, alpha):
+        alpha = self.rate_func(alpha)
+        pixels = self.start_pixels + alpha * (self.target_pixels - self.start_pixels)
+        self.mobject.image.pixel_array = np.round(pixels).astype(np.uint8)
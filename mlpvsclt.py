@@ -1,6 +1,9 @@
 from manim import *
 import numpy as np
 
+from network_diagram import NetworkDiagram
+from scene_params import scene_params
+
 class MLPvsCLTComparison(Scene):
     def construct(self):
         # Set custom colors for better visual differentiation
@@ -98,61 +101,38 @@ class MLPvsCLTComparison(Scene):
         self.play(*[FadeOut(mob) for mob in self.mobjects], run_time=1.5)
 
     def create_mlp_model(self, color=BLUE):
-        network = VGroup()
-        layers = 4
-        nodes_per_layer = [3, 5, 5, 1]
-
-        for i in range(layers):
-            layer = VGroup()
-            for j in range(nodes_per_layer[i]):
-                node = Circle(radius=0.2, color=color)
-                node.set_fill(color, opacity=0.3)
-                node.move_to([i * 2 - 6, j - (nodes_per_layer[i] - 1) / 2, 0])
-                layer.add(node)
-            network.add(layer)
-
-        connections = VGroup()
-        for i in range(layers - 1):
-            for node1 in network[i]:
-                for node2 in network[i + 1]:
-                    connection = Line(
-                        node1.get_center(),
-                        node2.get_center(),
-                        stroke_opacity=0.4,
-                        stroke_width=0.7,
-                        stroke_color=color
-                    )
-                    connections.add(connection)
+        def neuron():
+            node = Circle(radius=0.2, color=color)
+            node.set_fill(color, opacity=0.3)
+            return node
+
+        network = NetworkDiagram([3, 5, 5, 1], neuron, layer_spacing=2, left=-6)
+        for i in range(len(network.layer_sizes) - 1):
+            network.connect_layers(i, color=color, stroke_width=0.7, stroke_opacity=0.4)
 
         inputs = [
-            Tex("", font_size=30).next_to(network[0][0], LEFT),
-            Tex("", font_size=30).next_to(network[0][1], LEFT),
-            Tex("", font_size=30).next_to(network[0][2], LEFT)
+            Tex("", font_size=30).next_to(network.node(0, 0), LEFT),
+            Tex("", font_size=30).next_to(network.node(0, 1), LEFT),
+            Tex("", font_size=30).next_to(network.node(0, 2), LEFT)
         ]
-        output = Tex("", font_size=34, color=GREEN).next_to(network[3][0], RIGHT)
+        output = Tex("", font_size=34, color=GREEN).next_to(network.node(3, 0), RIGHT)
 
-        return VGroup(network, connections), inputs, output
+        return network, inputs, output
 
     def create_clt_model(self, color=BLUE):
-        network = VGroup()
-        layers = 5
-        nodes_per_layer = [4, 5, 5, 5, 1]
-
-        for i in range(layers):
-            layer = VGroup()
-            for j in range(nodes_per_layer[i]):
-                node = RoundedRectangle(
-                    height=0.25,
-                    width=0.25,
-                    corner_radius=0.05,
-                    color=color
-                )
-                node.set_fill(color, opacity=0.2)
-                node.move_to([i * 1.8 - 3.6, j - (nodes_per_layer[i] - 1) / 2, 0])
-                layer.add(node)
-            network.add(layer)
+        def feature():
+            node = RoundedRectangle(
+                height=0.25,
+                width=0.25,
+                corner_radius=0.05,
+                color=color
+            )
+            node.set_fill(color, opacity=0.2)
+            return node
+
+        network = NetworkDiagram([4, 5, 5, 5, 1], feature, layer_spacing=1.8, left=-3.6)
+        edge_style = dict(color=color, stroke_width=0.5, stroke_opacity=0.3)
 
-        connections = VGroup()
         connection_map = [
             (0, 0, 1, 0),  # 26 → ≈20
             (0, 0, 1, 2),  # 26 → ends in 6
@@ -174,46 +154,32 @@ class MLPvsCLTComparison(Scene):
             (3, 2, 4, 0)
         ]
         # Add connections from connection_map
-        for layer1, node1, layer2, node2 in connection_map:
-            connection = Line(
-                network[layer1][node1].get_center(),
-                network[layer2][node2].get_center(),
-                stroke_opacity=0.3,
-                stroke_width=0.5,
-                stroke_color=color
-            )
-            connections.add(connection)
-
-        # Add random connections
-        np.random.seed(42)
-        for layer_idx in range(layers - 1):
-            current_layer_size = nodes_per_layer[layer_idx]
-            next_layer_size = nodes_per_layer[layer_idx + 1]
-            for i in range(current_layer_size):
-                for j in range(next_layer_size):
-                    existing = any(
-                        (l1 == layer_idx and n1 == i and l2 == layer_idx + 1 and n2 == j)
-                        for l1, n1, l2, n2 in connection_map
-                    )
-                    if not existing and np.random.random() < 0.7:
-                        connection = Line(
-                            network[layer_idx][i].get_center(),
-                            network[layer_idx + 1][j].get_center(),
-                            stroke_opacity=0.3,
-                            stroke_width=0.5,
-                            stroke_color=color
-                        )
-                        connections.add(connection)
+        network.add_edges(
+            [((layer1, node1), (layer2, node2)) for layer1, node1, layer2, node2 in connection_map],
+            **edge_style
+        )
+
+        # Add random connections (collected first, so each layer pair is added in one batch)
+        # (the scene's own stream, so the edges never depend on what else has drawn random numbers)
+        rng = scene_params(self).rng("clt_edges")
+        random_edges = []
+        for layer_idx in range(len(network.layer_sizes) - 1):
+            for i in range(network.layer_sizes[layer_idx]):
+                for j in range(network.layer_sizes[layer_idx + 1]):
+                    existing = network.has_edge((layer_idx, i), (layer_idx + 1, j))
+                    if not existing and rng.random() < 0.7:
+                        random_edges.append(((layer_idx, i), (layer_idx + 1, j)))
+        network.add_edges(random_edges, **edge_style)
 
         inputs = [
-            Tex("", font_size=24).next_to(network[0][i], LEFT)
+            Tex("", font_size=24).next_to(network.node(0, i), LEFT)
             for i in range(4)
         ]
-        output = Tex("", font_size=26).next_to(network[-1][0], RIGHT)
-        return VGroup(network, connections), inputs, output
+        output = Tex("", font_size=26).next_to(network.node(-1, 0), RIGHT)
+        return network, inputs, output
 
     def demonstrate_polysemantic_neurons(self, model, active_color=BLUE, base_color=BLUE):
-        # Unpack the MLP: model is VGroup(network_VGroup, connections_VGroup)
+        # Unpack the MLP: model is a NetworkDiagram, i.e. VGroup(layers, connections)
         network_group, connections = model
         network = network_group  # preserves 4-layer structure
 
@@ -262,22 +228,18 @@ class MLPvsCLTComparison(Scene):
             sim_anims.append(Flash(output_node, color=GREEN, flash_radius=0.4))
             sim_anims.append(output_node.animate.set_fill(GREEN, opacity=0.7))
 
-            # Also identify and flash the three connecting edges:
+            # Also flash the three connecting edges:
             #   a) input_node → first_shared_neuron
             #   b) first_shared_neuron → second_shared_neuron
             #   c) second_shared_neuron → output_node
-            for conn in connections:
-                start_pt = conn.get_start()
-                end_pt = conn.get_end()
-                if (np.allclose(start_pt, input_node.get_center(), atol=0.1) and
-                    np.allclose(end_pt, first_shared_neuron.get_center(), atol=0.1)):
-                    sim_anims.append(ShowPassingFlash(conn.copy().set_stroke(active_color, width=4, opacity=0.8), time_width=0.7))
-                if (np.allclose(start_pt, first_shared_neuron.get_center(), atol=0.1) and
-                    np.allclose(end_pt, second_shared_neuron.get_center(), atol=0.1)):
-                    sim_anims.append(ShowPassingFlash(conn.copy().set_stroke(active_color, width=4, opacity=0.8), time_width=0.7))
-                if (np.allclose(start_pt, second_shared_neuron.get_center(), atol=0.1) and
-                    np.allclose(end_pt, output_node.get_center(), atol=0.1)):
-                    sim_anims.append(ShowPassingFlash(conn.copy().set_stroke(GREEN, width=4, opacity=0.8), time_width=0.7))
+            path = [(0, 1), shared_neurons[0], shared_neurons[1], (len(model.layer_sizes) - 1, 0)]
+            path_edges = model.path_edges(path)
+            sim_anims.extend(model.flash(
+                [edge for edge in path_edges if edge[1] != path[-1]], active_color, stroke_width=4, opacity=0.8
+            ))
+            sim_anims.extend(model.flash(
+                [edge for edge in path_edges if edge[1] == path[-1]], GREEN, stroke_width=4, opacity=0.8
+            ))
 
             # Play all flashes and fills together
             self.play(*sim_anims, run_time=1.0)
@@ -301,8 +263,7 @@ class MLPvsCLTComparison(Scene):
                 self.wait(0.2)
 
     def demonstrate_interpretable_features(self, model, active_color=RED, base_color=BLUE):
-        network_group, connections = model
-        network = network_group
+        network = model.nodes
 
         # Step definitions for CLT computation
         computation_steps = [
@@ -432,31 +393,20 @@ class MLPvsCLTComparison(Scene):
                     feature_node.animate.set_fill(active_color, opacity=0.8)
                 ])
                 # Connections from current tokens → feature
-                for idx in step["input_indices"]:
-                    input_node = all_input_displays[idx][1]
-                    for conn in connections:
-                        if (np.allclose(conn.get_start(), input_node.get_center(), atol=0.1) and
-                            np.allclose(conn.get_end(), feature_node.get_center(), atol=0.1)):
-                            animations.append(
-                                ShowPassingFlash(
-                                    conn.copy().set_stroke(active_color, width=3, opacity=0.9),
-                                    time_width=0.6
-                                )
-                            )
+                feature = (target_layer, feature_idx)
+                active_edges = [
+                    ((0, idx), feature) for idx in step["input_indices"] if model.has_edge((0, idx), feature)
+                ]
                 # Connections from previously‐activated features (if any)
                 if target_layer > 1:
                     prev_layer = target_layer - 1
-                    for prev_node in network[prev_layer]:
-                        if hasattr(prev_node, "fill_opacity") and prev_node.fill_opacity > 0.5:
-                            for conn in connections:
-                                if (np.allclose(conn.get_start(), prev_node.get_center(), atol=0.1) and
-                                    np.allclose(conn.get_end(), feature_node.get_center(), atol=0.1)):
-                                    animations.append(
-                                        ShowPassingFlash(
-                                            conn.copy().set_stroke(active_color, width=3, opacity=0.9),
-                                            time_width=0.6
-                                        )
-                                    )
+                    for source in model.incoming[feature]:
+                        prev_node = model.node(*source)
+                        if source[0] == prev_layer and hasattr(prev_node, "fill_opacity") and prev_node.fill_opacity > 0.5:
+                            active_edges.append((source, feature))
+                animations.extend(
+                    model.flash(active_edges, active_color, stroke_width=3, opacity=0.9, time_width=0.6)
+                )
             self.play(*animations, run_time=0.8)
 
             # Dim the token‐highlight circles again (unless it's the last step)
@@ -478,17 +428,11 @@ class MLPvsCLTComparison(Scene):
             Flash(output_node, color=GREEN, flash_radius=0.4),
             output_node.animate.set_fill(GREEN, opacity=0.8)
         ]
-        for i in range(3):  # three activated features in layer 3
-            feature_node = network[3][i]
-            for conn in connections:
-                if (np.allclose(conn.get_start(), feature_node.get_center(), atol=0.1) and
-                    np.allclose(conn.get_end(), output_node.get_center(), atol=0.1)):
-                    final_animations.append(
-                        ShowPassingFlash(
-                            conn.copy().set_stroke(GREEN, width=3, opacity=0.9),
-                            time_width=0.8
-                        )
-                    )
+        # Edges from the three activated features in layer 3
+        final_edges = [((3, i), (4, 0)) for i in range(3) if model.has_edge((3, i), (4, 0))]
+        final_animations.extend(
+            model.flash(final_edges, GREEN, stroke_width=3, opacity=0.9, time_width=0.8)
+        )
         self.play(*final_animations, run_time=1.0)
 
         self.wait(1.0)
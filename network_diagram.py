@@ -0,0 +1,281 @@
+"""Layered network diagram with an explicit node and edge index.
+
+    network = NetworkDiagram([3, 5, 5, 1], lambda: Circle(radius=0.2), layer_spacing=2, left=-6)
+    network.connect_layers(0, 1, stroke_width=0.7)   # every node of layer 0 to layer 1
+    network.add_edge((2, 1), (2, 2))                   # any single edge, even inside a layer
+    network.node(2, 3)                                 # node 3 of layer 2
+    network.has_edge((0, 1), (1, 2))
+    self.play(*network.flash(network.path_edges([(0, 1), (1, 2), (2, 1)]), color=RED))
+
+A NetworkDiagram is VGroup(nodes, edges), with nodes a VGroup of layer
+VGroups, so `nodes, edges = network` and network[0][layer][i] keep working.
+Looking up an edge is a dict access instead of a scan over every Line, so
+highlighting a path costs O(path length) whatever the size of the network.
+
+Edges are not individual Lines: all edges between one pair of layers live
+in an EdgeBundle, which keeps per-edge colour/width/opacity arrays and
+draws every edge sharing a style as one multi-segment path. A 64-wide
+fully connected layer pair is then a single mobject to style, hash and
+rasterize instead of 4096.
+"""
+from collections import defaultdict
+
+import numpy as np
+from manim import ManimColor, ShowPassingFlash, VGroup, VMobject, WHITE
+
+# Cubic Bezier handles of a straight segment, as Line places them
+_SEGMENT_WEIGHTS = np.array([0, 1 / 3, 2 / 3, 1])[None, :, None]
+
+
+def segment_points(starts, ends):
+    """(n, 4, 3) Bezier control points of straight segments starts[k] -> ends[k]."""
+    starts = np.asarray(starts, dtype=float).reshape(-1, 1, 3)
+    ends = np.asarray(ends, dtype=float).reshape(-1, 1, 3)
+    return starts + _SEGMENT_WEIGHTS * (ends - starts)
+
+
+class EdgeBundle(VGroup):
+    """
+    Straight edges stored as one point array per distinct stroke style.
+
+    Edge k keeps its own color / stroke_width / stroke_opacity (the arrays
+    `colors`, `widths`, `opacities`) and control points (`quads`, (n, 4, 3));
+    the submobjects are one VMobject per style, each holding the edges of
+    that style as separate subpaths. Adding or restyling edges only touches
+    the style groups they leave or join: the other groups, and every
+    VMobject already in the bundle, stay as they are.
+    """
+
+    def __init__(self, starts=(), ends=(), color=WHITE, stroke_width=1.0, stroke_opacity=1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.default_style = (color, stroke_width, stroke_opacity)
+        self.colors = np.zeros(0, dtype=object)
+        self.widths = np.zeros(0)
+        self.opacities = np.zeros(0)
+        self.quads = np.zeros((0, 4, 3))
+        # Which submobject holds edge k, and at which position within it
+        self.edge_group = np.zeros(0, dtype=np.intp)
+        self.edge_slot = np.zeros(0, dtype=np.intp)
+        # style -> submobject index, and the edges of each submobject in slot order
+        self.style_groups = {}
+        self.group_members = []
+        if len(starts):
+            self.add_edges(starts, ends)
+
+    @property
+    def n_edges(self):
+        return len(self.widths)
+
+    def edge_quads(self, indices=None):
+        """(n, 4, 3) current control points of the edges (all, or `indices`)."""
+        if indices is not None:
+            indices = np.atleast_1d(indices)
+            return np.array([
+                self.submobjects[g].points[4 * s:4 * s + 4]
+                for g, s in zip(self.edge_group[indices], self.edge_slot[indices])
+            ]).reshape(-1, 4, 3)
+        for g in range(len(self.group_members)):
+            self._sync_quads(g)
+        return self.quads.copy()
+
+    def _sync_quads(self, g):
+        # The group may have been moved or scaled since its edges were stored
+        members = self.group_members[g]
+        if len(members):
+            self.quads[members] = self.submobjects[g].points.reshape(-1, 4, 3)
+
+    def _group_for(self, style):
+        """Index of the submobject drawing `style`, created (empty) on first use."""
+        if style not in self.style_groups:
+            color, width, opacity = style
+            path = VMobject()
+            path.set_stroke(color, width=width, opacity=opacity)
+            self.style_groups[style] = len(self.submobjects)
+            self.group_members.append(np.zeros(0, dtype=np.intp))
+            self.add(path)
+        return self.style_groups[style]
+
+    def _set_members(self, g, members):
+        self.group_members[g] = members
+        self.edge_group[members] = g
+        self.edge_slot[members] = np.arange(len(members))
+        self.submobjects[g].set_points(self.quads[members].reshape(-1, 3))
+
+    def add_edges(self, starts, ends, color=None, stroke_width=None, stroke_opacity=None):
+        """Append straight edges starts[k] -> ends[k]; returns their indices."""
+        default_color, default_width, default_opacity = self.default_style
+        new_quads = segment_points(starts, ends)
+        count = len(new_quads)
+        style = (
+            ManimColor(default_color if color is None else color).to_hex(),
+            float(default_width if stroke_width is None else stroke_width),
+            float(default_opacity if stroke_opacity is None else stroke_opacity),
+        )
+        indices = np.arange(self.n_edges, self.n_edges + count)
+        self.quads = np.concatenate([self.quads, new_quads])
+        self.colors = np.concatenate([self.colors, np.full(count, style[0], dtype=object)])
+        self.widths = np.concatenate([self.widths, np.full(count, style[1])])
+        self.opacities = np.concatenate([self.opacities, np.full(count, style[2])])
+        self.edge_group = np.concatenate([self.edge_group, np.zeros(count, dtype=np.intp)])
+        self.edge_slot = np.concatenate([self.edge_slot, np.zeros(count, dtype=np.intp)])
+
+        g = self._group_for(style)
+        self._sync_quads(g)
+        self._set_members(g, np.concatenate([self.group_members[g], indices]))
+        return indices
+
+    def set_edge_style(self, indices, color=None, stroke_width=None, stroke_opacity=None):
+        """Restyle the edges at `indices` (an index array, list or slice)."""
+        indices = np.arange(self.n_edges)[indices].reshape(-1)
+        if color is not None:
+            self.colors[indices] = ManimColor(color).to_hex()
+        if stroke_width is not None:
+            self.widths[indices] = stroke_width
+        if stroke_opacity is not None:
+            self.opacities[indices] = stroke_opacity
+
+        # Edges whose style changed, grouped by the style group they join
+        joining = defaultdict(list)
+        for index in indices:
+            style = (self.colors[index], float(self.widths[index]), float(self.opacities[index]))
+            g = self._group_for(style)
+            if g != self.edge_group[index]:
+                joining[g].append(index)
+        if not joining:
+            return self
+
+        moved = np.concatenate([np.array(members, dtype=np.intp) for members in joining.values()])
+        left_groups = np.unique(self.edge_group[moved])
+        for g in left_groups:
+            self._sync_quads(g)
+        is_moved = np.zeros(self.n_edges, dtype=bool)
+        is_moved[moved] = True
+        for g in left_groups:
+            members = self.group_members[g]
+            self._set_members(g, members[~is_moved[members]])
+        for g, members in joining.items():
+            self._sync_quads(g)
+            self._set_members(g, np.concatenate([self.group_members[g], np.array(members, dtype=np.intp)]))
+        return self
+
+    def edge_copy(self, index):
+        """A standalone VMobject of edge `index`, styled like it."""
+        path = VMobject()
+        path.set_points(self.edge_quads(index)[0])
+        path.set_stroke(self.colors[index], width=self.widths[index], opacity=self.opacities[index])
+        return path
+
+    def flash(self, indices, color, stroke_width=4, opacity=0.8, time_width=0.7):
+        """One ShowPassingFlash per edge in `indices`, all running at once."""
+        animations = []
+        for quad in self.edge_quads(indices):
+            path = VMobject()
+            path.set_points(quad)
+            path.set_stroke(color, width=stroke_width, opacity=opacity)
+            animations.append(ShowPassingFlash(path, time_width=time_width))
+        return animations
+
+
+class NetworkDiagram(VGroup):
+    def __init__(self, layer_sizes, node_factory, layer_spacing=2.0, left=0.0, node_spacing=1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.layer_sizes = list(layer_sizes)
+        nodes = VGroup()
+        for layer_index, size in enumerate(self.layer_sizes):
+            layer = VGroup()
+            for i in range(size):
+                node = node_factory()
+                # Layers run left to right, each centred vertically on y = 0
+                node.move_to([left + layer_index * layer_spacing, (i - (size - 1) / 2) * node_spacing, 0])
+                layer.add(node)
+            nodes.add(layer)
+        self.add(nodes, VGroup())
+
+        # (source layer, target layer) -> EdgeBundle, in self.edges
+        self.bundles = {}
+        # (layer, i, layer, j) -> (bundle key, index in that bundle)
+        self.edge_index = {}
+        # (layer, j) -> [(layer, i), ...] in the order the edges were added; likewise outgoing
+        self.incoming = defaultdict(list)
+        self.outgoing = defaultdict(list)
+
+    @property
+    def nodes(self):
+        return self[0]
+
+    @property
+    def edges(self):
+        return self[1]
+
+    def node(self, layer, i):
+        return self[0][layer][i]
+
+    def add_edges(self, pairs, color=WHITE, stroke_width=1.0, stroke_opacity=1.0):
+        """Straight edges for each (source, target) node pair, e.g. ((0, 1), (1, 2))."""
+        by_bundle = defaultdict(list)
+        for source, target in pairs:
+            source, target = tuple(source), tuple(target)
+            if (*source, *target) in self.edge_index:
+                raise ValueError(f"Duplicate edge {source} -> {target}")
+            by_bundle[source[0], target[0]].append((source, target))
+
+        for bundle_key, bundle_pairs in by_bundle.items():
+            if bundle_key not in self.bundles:
+                self.bundles[bundle_key] = EdgeBundle(color=color, stroke_width=stroke_width, stroke_opacity=stroke_opacity)
+                self[1].add(self.bundles[bundle_key])
+            starts = [self.node(*source).get_center() for source, _ in bundle_pairs]
+            ends = [self.node(*target).get_center() for _, target in bundle_pairs]
+            indices = self.bundles[bundle_key].add_edges(
+                starts, ends, color=color, stroke_width=stroke_width, stroke_opacity=stroke_opacity
+            )
+            for (source, target), index in zip(bundle_pairs, indices):
+                self.edge_index[(*source, *target)] = (bundle_key, int(index))
+                self.outgoing[source].append(target)
+                self.incoming[target].append(source)
+
+    def add_edge(self, source, target, **style):
+        self.add_edges([(source, target)], **style)
+
+    def connect_layers(self, layer, next_layer=None, **style):
+        """Edges from every node of `layer` to every node of `next_layer` (default layer + 1)."""
+        next_layer = layer + 1 if next_layer is None else next_layer
+        self.add_edges(
+            [((layer, i), (next_layer, j))
+             for i in range(self.layer_sizes[layer])
+             for j in range(self.layer_sizes[next_layer])],
+            **style,
+        )
+
+    def has_edge(self, source, target):
+        return (*source, *target) in self.edge_index
+
+    def edge(self, source, target):
+        """A standalone copy of the edge `source` -> `target`, or None if they are not connected."""
+        found = self.edge_index.get((*source, *target))
+        if found is None:
+            return None
+        bundle_key, index = found
+        return self.bundles[bundle_key].edge_copy(index)
+
+    def path_edges(self, path):
+        """(source, target) pairs between consecutive nodes of `path` that are connected."""
+        return [(source, target) for source, target in zip(path, path[1:]) if self.has_edge(source, target)]
+
+    def _by_bundle(self, pairs):
+        indices = defaultdict(list)
+        for source, target in pairs:
+            bundle_key, index = self.edge_index[(*source, *target)]
+            indices[bundle_key].append(index)
+        return indices
+
+    def flash(self, pairs, color, stroke_width=4, opacity=0.8, time_width=0.7):
+        """ShowPassingFlash animations along the edges `pairs`, without touching the edges themselves."""
+        animations = []
+        for bundle_key, indices in self._by_bundle(pairs).items():
+            animations.extend(self.bundles[bundle_key].flash(indices, color, stroke_width, opacity, time_width))
+        return animations
+
+    def set_edge_style(self, pairs, **style):
+        for bundle_key, indices in self._by_bundle(pairs).items():
+            self.bundles[bundle_key].set_edge_style(indices, **style)
+        return self
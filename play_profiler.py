@@ -0,0 +1,318 @@
+"""Opt-in per-play() cost breakdown for scenes.
+
+install() wraps a few manim internals so that every self.play / self.wait
+call in a scene gets a record with:
+
+  * line          - the scene source line that made the call
+  * construct     - seconds spent since the previous call returned (building
+                    Tex, matrices, connection scans, ...)
+  * interpolate   - seconds in Scene.update_to_time (animation interpolation
+                    and updaters)
+  * rasterize     - seconds in CairoRenderer.update_frame / get_frame
+  * write_wait    - seconds the render loop blocked handing frames to the
+                    encoder (queue back-pressure)
+  * encode        - seconds the encoder thread spent on this play's frames
+  * frames, mobjects (top level and whole family), animations, skipped
+
+When a scene finishes rendering, a JSON and a sortable HTML report are
+written to <report_dir>/<module>.<Scene>.{json,html}.
+
+Usage:
+    python render_all.py --profile compute_attn
+    python play_profiler.py mlpvsclt:MLPvsCLTComparison
+"""
+import html
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent
+
+TIMING_FIELDS = ("construct", "interpolate", "rasterize", "write_wait", "encode")
+
+_report_dir = None
+_state = threading.local()
+_installed = False
+
+
+def _calling_line():
+    """"file.py:123" of the innermost stack frame that belongs to this repo."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        path = Path(frame.f_code.co_filename)
+        if path.parent == REPO_DIR and path.name != Path(__file__).name:
+            return f"{path.name}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return "?"
+
+
+class SceneProfile:
+    """Play records of one scene render."""
+
+    def __init__(self, scene):
+        self.module = type(scene).__module__
+        self.scene = type(scene).__name__
+        self.records = []
+        self.current = None
+        self.start = time.perf_counter()
+        self.last_end = self.start
+
+    def begin(self, kind, line):
+        now = time.perf_counter()
+        record = {
+            "index": len(self.records),
+            "kind": kind,
+            "line": line,
+            "construct": now - self.last_end,
+            "interpolate": 0.0,
+            "rasterize": 0.0,
+            "write_wait": 0.0,
+            "encode": 0.0,
+            "total": 0.0,
+            "frames": 0,
+            "mobjects": 0,
+            "family": 0,
+            "animations": [],
+            "skipped": False,
+        }
+        record["_start"] = now
+        self.records.append(record)
+        self.current = record
+        return record
+
+    def end(self, scene):
+        record = self.current
+        now = time.perf_counter()
+        record["total"] = now - record.pop("_start")
+        record["mobjects"] = len(scene.mobjects)
+        record["family"] = sum(len(mob.get_family()) for mob in scene.mobjects)
+        record["animations"] = [type(anim).__name__ for anim in scene.animations or []]
+        record["skipped"] = bool(scene.renderer.skip_animations)
+        self.current = None
+        self.last_end = now
+
+    def add(self, field, seconds):
+        if self.current is not None:
+            self.current[field] += seconds
+
+    def summary(self):
+        totals = {field: round(sum(r[field] for r in self.records), 4) for field in TIMING_FIELDS}
+        totals["frames"] = sum(r["frames"] for r in self.records)
+        # Construction after the last play (teardown, final adds) is not in any record
+        totals["wall"] = round(self.last_end - self.start, 4)
+        return totals
+
+    def as_dict(self):
+        records = [
+            {k: round(v, 4) if isinstance(v, float) else v for k, v in r.items()}
+            for r in self.records
+        ]
+        return {"module": self.module, "scene": self.scene, "summary": self.summary(), "plays": records}
+
+
+def _timed(field, method):
+    def wrapper(self, *args, **kwargs):
+        profile = getattr(_state, "profile", None)
+        if profile is None:
+            return method(self, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            profile.add(field, time.perf_counter() - start)
+
+    wrapper.__wrapped__ = method
+    return wrapper
+
+
+def install(report_dir):
+    """Instrument manim for every scene rendered in this process afterwards."""
+    global _report_dir, _installed
+    _report_dir = Path(report_dir)
+    if _installed:
+        return
+    _installed = True
+
+    from manim import Scene
+    from manim.renderer.cairo_renderer import CairoRenderer
+    from manim.scene.scene_file_writer import SceneFileWriter
+
+    original_render = Scene.render
+    original_play = Scene.play
+    original_wait = Scene.wait
+
+    def render(self, *args, **kwargs):
+        _state.profile = SceneProfile(self)
+        try:
+            return original_render(self, *args, **kwargs)
+        finally:
+            # render() joins the encoder threads, so encode times are complete here
+            profile, _state.profile = _state.profile, None
+            write_report(profile, _report_dir)
+
+    def play(self, *args, **kwargs):
+        profile = getattr(_state, "profile", None)
+        if profile is None or profile.current is not None:
+            return original_play(self, *args, **kwargs)
+        kind = getattr(_state, "kind", None) or "play"
+        profile.begin(kind, _calling_line())
+        try:
+            return original_play(self, *args, **kwargs)
+        finally:
+            profile.end(self)
+
+    def wait(self, *args, **kwargs):
+        _state.kind = "wait"
+        try:
+            return original_wait(self, *args, **kwargs)
+        finally:
+            _state.kind = None
+
+    Scene.render = render
+    Scene.play = play
+    Scene.wait = wait
+    Scene.update_to_time = _timed("interpolate", Scene.update_to_time)
+    CairoRenderer.update_frame = _timed("rasterize", CairoRenderer.update_frame)
+    CairoRenderer.get_frame = _timed("rasterize", CairoRenderer.get_frame)
+    SceneFileWriter.write_frame = _timed("write_wait", SceneFileWriter.write_frame)
+
+    original_add_frame = CairoRenderer.add_frame
+
+    def add_frame(self, frame, num_frames=1):
+        profile = getattr(_state, "profile", None)
+        if profile is not None and not self.skip_animations:
+            profile.add("frames", num_frames)
+        return original_add_frame(self, frame, num_frames)
+
+    CairoRenderer.add_frame = add_frame
+
+    # Encoding runs on a worker thread per segment; tie each encoder to its play
+    if hasattr(SceneFileWriter, "_create_segment_encoder"):
+        original_create_encoder = SceneFileWriter._create_segment_encoder
+
+        def create_segment_encoder(self, target):
+            encoder = original_create_encoder(self, target)
+            profile = getattr(_state, "profile", None)
+            encoder._profile_record = profile.current if profile is not None else None
+            return encoder
+
+        SceneFileWriter._create_segment_encoder = create_segment_encoder
+        _instrument_encoder()
+
+
+def _instrument_encoder():
+    from manim.scene.video_segment_encoder import VideoSegmentEncoder
+
+    def timed(method):
+        def wrapper(self, *args, **kwargs):
+            record = getattr(self, "_profile_record", None)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                if record is not None:
+                    record["encode"] += time.perf_counter() - start
+
+        return wrapper
+
+    VideoSegmentEncoder.write_frame = timed(VideoSegmentEncoder.write_frame)
+    VideoSegmentEncoder.finish = timed(VideoSegmentEncoder.finish)
+
+
+def write_report(profile, report_dir):
+    """Write <module>.<Scene>.json and .html under `report_dir`; returns the JSON path."""
+    report_dir = Path(report_dir)
+    report_dir.mkdir(parents=True, exist_ok=True)
+    data = profile.as_dict()
+    stem = f"{profile.module}.{profile.scene}"
+    json_path = report_dir / f"{stem}.json"
+    json_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    (report_dir / f"{stem}.html").write_text(render_html(data), encoding="utf-8")
+    return json_path
+
+
+HTML_COLUMNS = (
+    "index", "kind", "line", "construct", "interpolate", "rasterize",
+    "write_wait", "encode", "total", "frames", "mobjects", "family", "animations",
+)
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ font-family: sans-serif; font-size: 13px; }}
+table {{ border-collapse: collapse; }}
+th, td {{ border: 1px solid #ccc; padding: 2px 6px; text-align: right; }}
+th {{ cursor: pointer; background: #eee; }}
+td.text {{ text-align: left; }}
+tr.skipped {{ color: #999; }}
+</style></head><body>
+<h2>{title}</h2>
+<p>{summary}</p>
+<table id="plays"><thead><tr>{header}</tr></thead><tbody>
+{rows}
+</tbody></table>
+<script>
+document.querySelectorAll("#plays th").forEach((th, col) => th.onclick = () => {{
+  const body = document.querySelector("#plays tbody");
+  const rows = Array.from(body.rows);
+  const desc = th.dataset.desc !== "1";
+  th.dataset.desc = desc ? "1" : "0";
+  const key = r => {{ const t = r.cells[col].textContent; const n = parseFloat(t); return isNaN(n) ? t : n; }};
+  rows.sort((a, b) => (key(a) > key(b) ? 1 : key(a) < key(b) ? -1 : 0) * (desc ? -1 : 1));
+  rows.forEach(r => body.appendChild(r));
+}});
+</script>
+</body></html>
+"""
+
+
+def render_html(data):
+    header = "".join(f"<th>{column}</th>" for column in HTML_COLUMNS)
+    rows = []
+    for record in data["plays"]:
+        cells = []
+        for column in HTML_COLUMNS:
+            value = record[column]
+            if column == "animations":
+                value = ", ".join(value)
+            css = ' class="text"' if isinstance(value, str) else ""
+            cells.append(f"<td{css}>{html.escape(str(value))}</td>")
+        css = ' class="skipped"' if record["skipped"] else ""
+        rows.append(f"<tr{css}>{''.join(cells)}</tr>")
+    summary = ", ".join(f"{key}: {value}" for key, value in data["summary"].items())
+    return HTML_TEMPLATE.format(
+        title=html.escape(f"{data['module']}:{data['scene']}"),
+        summary=html.escape(summary),
+        header=header,
+        rows="\n".join(rows),
+    )
+
+
+def main(argv=None):
+    import argparse
+
+    from render_all import QUALITIES, discover_scenes, render_all, select_scenes
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenes", nargs="+", help='"module", "Scene" or "module:Scene"')
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITIES), default="l")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--media-dir", default=str(REPO_DIR / "media"))
+    args = parser.parse_args(argv)
+
+    scenes = select_scenes(discover_scenes(), args.scenes)
+    if not scenes:
+        print("No scenes matched.", file=sys.stderr)
+        return 1
+    options = {"quality": args.quality, "media_dir": args.media_dir, "profile": True}
+    report_dir = Path(args.media_dir) / "profiles"
+    # No render cache: a cached scene would not be rendered, hence not profiled
+    manifest = render_all(scenes, options, workers=args.jobs, manifest_path=report_dir / "render_manifest.json")
+    print(f"Reports in {report_dir}")
+    return 1 if manifest["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
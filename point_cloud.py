@@ -0,0 +1,177 @@
+"""Point clouds of thousands of 3D points that stay cheap to render.
+
+One Dot3D per point is a full sphere surface of Cairo paths; PointCloud3D
+keeps positions, colours, sizes and opacities as NumPy arrays and draws
+every point as a flat disc facing the camera (a billboard), rendered by the
+camera's point-cloud path as plain pixel writes:
+
+    cloud = PointCloud3D(positions, self.camera, colors=colors, sizes=0.09)
+    self.add(cloud)
+    self.add_fixed_orientation_mobjects(*cloud.labels([0, 3], ["26", "="]))
+    self.play(FadeInPoints(cloud, [4, 5, 6]))
+    self.move_camera(phi=70 * DEGREES, theta=-45 * DEGREES)
+
+Before each frame a (non-time-based) updater stamps every disc in the
+current camera plane, sorts the stamps far to near and keeps only the
+nearest stamp per pixel, all in a handful of array operations. It does no
+work while the camera and the data are unchanged, and being non-time-based
+it does not stop static waits from being frozen.
+
+The cloud's geometry is its `positions` array: move points with
+set_points_data(), not with shift/scale/animate.
+"""
+import numpy as np
+from manim import Animation, Dot, ManimColor, PMobject, VGroup, WHITE, Tex, OUT, UP
+from manim.utils.rate_functions import smooth
+
+# Disc samples per pixel of radius along each axis (>1 leaves no holes)
+SAMPLES_PER_PIXEL = 1.4
+
+
+def _as_rgbs(colors, n):
+    if isinstance(colors, (str, ManimColor)):
+        return np.tile(ManimColor(colors).to_rgb(), (n, 1))
+    unique = {}
+    for color in colors:
+        unique.setdefault(str(color), ManimColor(color).to_rgb())
+    return np.array([unique[str(color)] for color in colors], dtype=float).reshape(n, 3)
+
+
+class PointCloud3D(PMobject):
+    def __init__(self, positions, camera, colors=WHITE, sizes=0.05, opacities=1.0, **kwargs):
+        super().__init__(stroke_width=1, **kwargs)
+        self.positions = np.array(positions, dtype=float).reshape(-1, 3)
+        n = len(self.positions)
+        self.rgbs = _as_rgbs(colors, n)
+        self.sizes = np.broadcast_to(np.asarray(sizes, dtype=float), (n,)).copy()
+        self.opacities = np.broadcast_to(np.asarray(opacities, dtype=float), (n,)).copy()
+        # A function, so copies made by animations share the camera instead of deep-copying it
+        self._camera = lambda: camera
+        self._projection_key = None
+        self.add_updater(lambda mob: mob.update_projection())
+        self.update_projection()
+
+    def set_points_data(self, indices=slice(None), positions=None, colors=None, sizes=None, opacities=None):
+        """Change some points' data; the next frame picks it up."""
+        if positions is not None:
+            self.positions[indices] = positions
+        if colors is not None:
+            count = len(np.arange(len(self.positions))[indices])
+            self.rgbs[indices] = _as_rgbs(colors, count)
+        if sizes is not None:
+            self.sizes[indices] = sizes
+        if opacities is not None:
+            self.opacities[indices] = opacities
+        self._projection_key = None
+        return self
+
+    def _camera_frame(self):
+        camera = self._camera()
+        if hasattr(camera, "generate_rotation_matrix"):
+            rotation = camera.generate_rotation_matrix()
+            zoom = camera.get_zoom()
+            focal_distance = camera.get_focal_distance()
+        else:
+            rotation, zoom, focal_distance = np.identity(3), 1.0, np.inf
+        return camera, rotation, zoom, focal_distance
+
+    def update_projection(self):
+        camera, rotation, zoom, focal_distance = self._camera_frame()
+        key = (
+            rotation.tobytes(), zoom, focal_distance, np.asarray(camera.frame_center).tobytes(),
+            camera.pixel_width, camera.pixel_height, camera.frame_width,
+        )
+        if key == self._projection_key:
+            return self
+        self._projection_key = key
+
+        visible = np.flatnonzero(self.opacities > 0)
+        if len(visible) == 0:
+            self.points = np.zeros((0, 3))
+            self.rgbas = np.zeros((0, 4))
+            return self
+
+        # 1) Depth of every point along the viewing axis; draw far ones first
+        camera_space = (self.positions[visible] - camera.frame_center) @ rotation.T
+        depth = camera_space[:, 2]
+        perspective = np.ones_like(depth) if np.isinf(focal_distance) else \
+            focal_distance / np.maximum(focal_distance - depth, 1e-6)
+        order = visible[np.argsort(depth, kind="stable")]
+
+        # 2) One disc stamp in the camera plane, sampled finely enough for the largest apparent disc
+        units_per_pixel = camera.frame_width / camera.pixel_width / zoom
+        max_radius = float(np.max(self.sizes[visible] * perspective)) / units_per_pixel
+        steps = max(int(np.ceil(max_radius * SAMPLES_PER_PIXEL)), 0)
+        grid = np.linspace(-1, 1, 2 * steps + 1) if steps else np.zeros(1)
+        u, v = np.meshgrid(grid, grid)
+        inside = u ** 2 + v ** 2 <= 1
+        stamp = u[inside, None] * rotation[0] + v[inside, None] * rotation[1]
+
+        samples = self.positions[order, None, :] + self.sizes[order, None, None] * stamp[None]
+        samples = samples.reshape(-1, 3)
+        background = ManimColor(camera.background_color).to_rgb()
+        # No alpha blending in the point-cloud path: fade towards the background instead
+        rgbs = background + (self.rgbs[order] - background) * self.opacities[order, None]
+        rgbas = np.repeat(np.column_stack([rgbs, np.ones(len(order))]), len(stamp), axis=0)
+
+        # 3) Keep only the nearest (last drawn) sample per pixel, so nothing depends on write order
+        pixels = camera.points_to_pixel_coords(self, samples).astype(np.int64)
+        on_screen = np.flatnonzero(
+            (pixels[:, 0] >= 0) & (pixels[:, 0] < camera.pixel_width)
+            & (pixels[:, 1] >= 0) & (pixels[:, 1] < camera.pixel_height)
+        )
+        flat = pixels[on_screen, 1] * camera.pixel_width + pixels[on_screen, 0]
+        _, last = np.unique(flat[::-1], return_index=True)
+        keep = on_screen[np.sort(len(flat) - 1 - last)]
+        self.points = samples[keep]
+        self.rgbas = rgbas[keep]
+        return self
+
+    def marker(self, index, **kwargs):
+        """A flat Dot looking like point `index` from the current view (e.g. to Transform into)."""
+        return Dot(
+            point=self.positions[index],
+            radius=self.sizes[index],
+            color=ManimColor.from_rgb(self.rgbs[index]),
+            **kwargs,
+        )
+
+    def labels(self, indices, texts, offset=(OUT + UP) * 0.3, font_size=30, scale=0.8, color=None, **tex_kwargs):
+        """Tex labels for a subset of the points at position + offset, by default in the points' colours."""
+        labels = VGroup()
+        for index, text in zip(indices, texts):
+            label_color = ManimColor.from_rgb(self.rgbs[index]) if color is None else color
+            label = Tex(text, font_size=font_size, color=label_color, **tex_kwargs).scale(scale)
+            label.move_to(self.positions[index] + np.asarray(offset))
+            labels.add(label)
+        return labels
+
+
+class FadeInPoints(Animation):
+    """Fade points `indices` of a PointCloud3D in, growing them from `scale` times their size."""
+
+    def __init__(self, cloud, indices, scale=1.0, opacity=1.0, rate_func=smooth, **kwargs):
+        self.indices = np.asarray(indices)
+        self.scale_from = scale
+        self.target_opacity = opacity
+        self.target_sizes = cloud.sizes[self.indices].copy()
+        # The cloud's projection updater must keep running while the points appear
+        super().__init__(cloud, rate_func=rate_func, suspend_mobject_updating=False, **kwargs)
+
+    def begin(self):
+        # Nothing to copy or align: only the cloud's arrays change
+        self.interpolate_mobject(0)
+
+    def finish(self):
+        self.interpolate_mobject(1)
+
+    def get_all_mobjects(self):
+        return (self.mobject,)
+
+    def interpolate_mobject(self, alpha):
+        alpha = self.rate_func(alpha)
+        scale = self.scale_from + (1 - self.scale_from) * alpha
+        self.mobject.set_points_data(
+            self.indices, sizes=self.target_sizes * scale, opacities=self.target_opacity * alpha
+        )
+        self.mobject.update_projection()
@@ -0,0 +1,346 @@
+"""Render every Scene in this repo in parallel and write a manifest.
+
+Usage:
+    python render_all.py                      # every scene, low quality
+    python render_all.py -q h -j 8            # high quality on 8 workers
+    python render_all.py text_cal compute_attn:ExtendedAttentionCalculation
+
+Each scene is rendered in its own worker process (manim keeps global state,
+so workers are recycled after every scene). Outputs land in the same
+media/videos/<module>/<quality>/ folders as a plain `manim` call, and a JSON
+manifest with outputs, timings and failures is written next to them.
+Scenes whose source, options and manim version are unchanged since the last
+render are restored from the render cache (see render_cache.py) instead.
+Workers share parsed Tex glyphs through tex_cache.py, and --precompile-tex
+compiles every missing Tex string up front in one LaTeX run (tex_precompile.py).
+Static waits are encoded as variable-frame-rate holds (static_holds.py), and
+frames reach the encoder threads through a bounded buffer pool (frame_pipeline.py).
+"""
+import argparse
+import ast
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from render_cache import RenderCache
+
+REPO_DIR = Path(__file__).resolve().parent
+
+# Base classes (from manim) that mark a class as renderable
+SCENE_BASES = {
+    "Scene", "ThreeDScene", "MovingCameraScene", "ZoomedScene",
+    "VectorScene", "LinearTransformationScene", "SpecialThreeDScene",
+}
+
+QUALITIES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+# Keep each worker single-threaded in BLAS so N workers use N cores, not N*N
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+
+def discover_scenes(repo_dir=REPO_DIR):
+    """
+    Return [(module_name, scene_name), ...] for every Scene subclass defined
+    in the repo's top-level modules. Uses the AST only, so nothing is imported.
+    """
+    parsed = {}
+    for path in sorted(repo_dir.glob("*.py")):
+        try:
+            parsed[path.stem] = ast.parse(path.read_text(encoding="utf-8"))
+        except SyntaxError:
+            continue
+
+    # Subclasses of our own scenes count too, so iterate to a fixed point
+    scene_names = set(SCENE_BASES)
+    found = []
+    changed = True
+    while changed:
+        changed = False
+        for module_name, tree in parsed.items():
+            for node in tree.body:
+                if not isinstance(node, ast.ClassDef):
+                    continue
+                key = (module_name, node.name)
+                if key in found:
+                    continue
+                base_names = {
+                    base.attr if isinstance(base, ast.Attribute) else getattr(base, "id", None)
+                    for base in node.bases
+                }
+                if base_names & scene_names:
+                    found.append(key)
+                    scene_names.add(node.name)
+                    changed = True
+
+    order = {name: i for i, name in enumerate(parsed)}
+    return sorted(found, key=lambda key: order[key[0]])
+
+
+def select_scenes(scenes, patterns):
+    """Filter scenes by "module", "Scene" or "module:Scene" patterns."""
+    if not patterns:
+        return list(scenes)
+    selected = []
+    for module_name, scene_name in scenes:
+        for pattern in patterns:
+            pattern = pattern[:-3] if pattern.endswith(".py") else pattern
+            if pattern in (module_name, scene_name, f"{module_name}:{scene_name}"):
+                selected.append((module_name, scene_name))
+                break
+    return selected
+
+
+def scene_config(module_name, options):
+    """manim config overrides for rendering one scene with the given options."""
+    from manim.constants import QUALITIES as MANIM_QUALITIES
+
+    quality = MANIM_QUALITIES[QUALITIES[options["quality"]]]
+    overrides = {
+        "pixel_height": quality["pixel_height"],
+        "pixel_width": quality["pixel_width"],
+        "frame_rate": quality["frame_rate"],
+        "media_dir": options["media_dir"],
+        # input_file decides the media/videos/<module>/ folder, like the CLI
+        "input_file": str(REPO_DIR / f"{module_name}.py"),
+        "write_to_movie": True,
+        "progress_bar": "none",
+        "verbosity": options.get("verbosity", "WARNING"),
+    }
+    if options.get("disable_caching"):
+        overrides["disable_caching"] = True
+    if options.get("animations"):
+        # Only write plays [start, end]; earlier ones are still run, but skipped
+        overrides["from_animation_number"], overrides["upto_animation_number"] = options["animations"]
+    return overrides
+
+
+def render_scene(module_name, scene_name, options):
+    """Render one scene in the current process and return its manifest entry."""
+    result = {
+        "module": module_name,
+        "scene": scene_name,
+        "status": "ok",
+        "output": None,
+        "frames": 0,
+        "seconds": 0.0,
+        "error": None,
+        # False when disabled or when this manim has no segment encoder to patch
+        "static_holds": False,
+    }
+    start = time.perf_counter()
+    try:
+        from manim import config, tempconfig
+
+        if str(REPO_DIR) not in sys.path:
+            sys.path.insert(0, str(REPO_DIR))
+        if options.get("glyph_cache", True):
+            import tex_cache
+
+            tex_cache.install(Path(options["media_dir"]) / "glyph_cache")
+        if options.get("static_holds", True):
+            import static_holds
+
+            result["static_holds"] = static_holds.install()
+        if options.get("frame_pool", True):
+            import frame_pipeline
+
+            frame_pipeline.install()
+        if options.get("profile"):
+            import play_profiler
+
+            play_profiler.install(Path(options["media_dir"]) / "profiles")
+        overrides = scene_config(module_name, options)
+        # Partial renders get their own file so the full render's movie stays intact
+        name_parts = [scene_name]
+        if options.get("section"):
+            # Fast-forward to one section (see sections.py)
+            os.environ["MANIM_SECTION"] = options["section"]
+            name_parts.append(options["section"])
+        if options.get("animations"):
+            name_parts.append("plays{}-{}".format(*options["animations"]))
+        if len(name_parts) > 1:
+            overrides["output_file"] = "_".join(name_parts)
+        with tempconfig(overrides):
+            module = importlib.import_module(module_name)
+            scene = getattr(module, scene_name)()
+            scene.render()
+            result["output"] = str(scene.renderer.file_writer.movie_file_path)
+            result["frames"] = int(round(scene.renderer.time * config.frame_rate))
+    except Exception:
+        result["status"] = "failed"
+        result["error"] = traceback.format_exc()
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def previous_timings(manifest_path):
+    """Seconds per scene from the last manifest, used to schedule long scenes first."""
+    try:
+        manifest = json.loads(Path(manifest_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {
+        (entry["module"], entry["scene"]): entry.get("render_seconds", entry.get("seconds", 0.0))
+        for entry in manifest.get("scenes", [])
+    }
+
+
+def render_all(scenes, options, workers=None, manifest_path=None, cache=None):
+    """
+    Render `scenes` on a process pool and write the manifest.
+    With a RenderCache, unchanged scenes are restored instead of rendered.
+    Returns the manifest dict.
+    """
+    workers = workers or os.cpu_count() or 1
+    manifest_path = Path(manifest_path or Path(options["media_dir"]) / "render_manifest.json")
+
+    start = time.perf_counter()
+    results = []
+    cache_keys = {}
+    jobs = []
+    for module_name, scene_name in scenes:
+        if cache is None:
+            jobs.append((module_name, scene_name))
+            continue
+        key = cache.key(module_name, scene_name, options)
+        entry = cache.lookup(key)
+        if entry is None:
+            cache_keys[(module_name, scene_name)] = key
+            jobs.append((module_name, scene_name))
+            continue
+        results.append({
+            "module": module_name,
+            "scene": scene_name,
+            "status": "cached",
+            "output": cache.restore(entry),
+            "frames": entry["frames"],
+            "seconds": 0.0,
+            "render_seconds": entry["render_seconds"],
+            "error": None,
+        })
+        print(f"[cached] {module_name}:{scene_name}", flush=True)
+
+    # Longest scenes first keeps the tail of the batch short
+    timings = previous_timings(manifest_path)
+    jobs.sort(key=lambda key: timings.get(key, float("inf")), reverse=True)
+
+    for var in THREAD_ENV_VARS:
+        os.environ.setdefault(var, "1")
+
+    if options.get("precompile_tex") and jobs:
+        from tex_precompile import precompile
+
+        precompile(jobs, options, workers=workers)
+
+    with ProcessPoolExecutor(
+        max_workers=max(min(workers, len(jobs)), 1),
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=1,
+    ) as pool:
+        futures = {
+            pool.submit(render_scene, module_name, scene_name, options): (module_name, scene_name)
+            for module_name, scene_name in jobs
+        }
+        for future in as_completed(futures):
+            module_name, scene_name = futures[future]
+            try:
+                result = future.result()
+            except Exception:
+                # The worker itself died (segfault, OOM kill, ...)
+                result = {
+                    "module": module_name,
+                    "scene": scene_name,
+                    "status": "failed",
+                    "output": None,
+                    "frames": 0,
+                    "seconds": 0.0,
+                    "error": traceback.format_exc(),
+                }
+            if cache is not None and result["status"] == "ok":
+                cache.store(cache_keys[(module_name, scene_name)], result)
+            results.append(result)
+            print(f"[{len(results)}/{len(scenes)}] {result['status']:>6}  "
+                  f"{module_name}:{scene_name}  {result['seconds']:.1f}s", flush=True)
+
+    if cache is not None:
+        cache.save()
+
+    order = {key: i for i, key in enumerate(scenes)}
+    results.sort(key=lambda r: order[(r["module"], r["scene"])])
+    manifest = {
+        "quality": QUALITIES[options["quality"]],
+        "workers": workers,
+        "wall_seconds": round(time.perf_counter() - start, 3),
+        "scene_seconds": round(sum(r["seconds"] for r in results), 3),
+        "cached": sum(r["status"] == "cached" for r in results),
+        "scenes": results,
+        "failures": [f"{r['module']}:{r['scene']}" for r in results if r["status"] == "failed"],
+    }
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenes", nargs="*", help='"module", "Scene" or "module:Scene" (default: all)')
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITIES), default="l")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--media-dir", default=str(REPO_DIR / "media"))
+    parser.add_argument("--manifest", default=None, help="manifest path (default: <media-dir>/render_manifest.json)")
+    parser.add_argument("--no-cache", action="store_true", help="render every scene, ignoring the render cache")
+    parser.add_argument("--no-glyph-cache", action="store_true",
+                        help="re-parse every Tex SVG instead of sharing parsed glyphs between workers")
+    parser.add_argument("--section", default=None,
+                        help="render only this named section of the selected scenes (see sections.py)")
+    parser.add_argument("--no-static-holds", action="store_true",
+                        help="encode every frame of static waits instead of a variable-frame-rate hold")
+    parser.add_argument("--no-frame-pool", action="store_true",
+                        help="copy every frame into a new array instead of reusing pooled buffers")
+    parser.add_argument("--precompile-tex", action="store_true",
+                        help="dry-run the scenes first and compile all their Tex in one LaTeX run")
+    parser.add_argument("--profile", action="store_true",
+                        help="write a per-play() timing report for each rendered scene (see play_profiler.py)")
+    parser.add_argument("--list", action="store_true", help="only list the scenes that would be rendered")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    scenes = select_scenes(discover_scenes(), args.scenes)
+    if args.list:
+        for module_name, scene_name in scenes:
+            print(f"{module_name}:{scene_name}")
+        return 0
+    if not scenes:
+        print("No scenes matched.", file=sys.stderr)
+        return 1
+
+    options = {"quality": args.quality, "media_dir": args.media_dir, "glyph_cache": not args.no_glyph_cache,
+               "static_holds": not args.no_static_holds, "frame_pool": not args.no_frame_pool,
+               "section": args.section,
+               "precompile_tex": args.precompile_tex, "profile": args.profile}
+    cache = None if args.no_cache else RenderCache(Path(args.media_dir) / "render_cache")
+    manifest = render_all(scenes, options, workers=args.jobs, manifest_path=args.manifest, cache=cache)
+    print(f"Rendered {len(scenes)} scenes in {manifest['wall_seconds']:.1f}s "
+          f"({manifest['scene_seconds']:.1f}s of scene time, {manifest['cached']} from cache), "
+          f"{len(manifest['failures'])} failed.")
+    for failure in manifest["failures"]:
+        print(f"  FAILED {failure}", file=sys.stderr)
+    return 1 if manifest["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
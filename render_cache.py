@@ -0,0 +1,241 @@
+"""Content-addressed cache of finished scene movies.
+
+A scene's cache key is a hash of:
+  * the source of the Scene class and everything it reaches in this repo
+    (its helper methods, base classes, module-level functions/constants and
+    any local modules it imports),
+  * the scene's params file, if it has one (see scene_params.py),
+  * the size and mtime of the data files read by the modules it uses
+    (DATA_FILES: the embedding table, the tiny transformer's checkpoint),
+  * the render options (quality etc.),
+  * the installed manim version.
+
+When the key is unchanged the finished movie is copied back from the cache
+instead of re-rendering, so touching text_cal.py only re-renders the scenes
+in text_cal.py.
+"""
+import ast
+import hashlib
+import json
+import os
+import shutil
+from importlib import metadata
+from pathlib import Path
+
+from scene_params import params_digest
+
+REPO_DIR = Path(__file__).resolve().parent
+
+# Bump to invalidate every existing entry after a change to the key format
+CACHE_VERSION = 3
+
+# Options that change where/how loudly we render, but not what is rendered
+NON_RENDER_OPTIONS = {"media_dir", "verbosity", "glyph_cache", "precompile_tex", "profile",
+                      "frame_pool"}
+
+# Data files read by local modules: (environment override, default path relative to the repo).
+# A scene that uses one of these modules also depends on its files.
+DATA_FILES = {
+    "embedding_data": [("EMBEDDINGS_PATH", "data/embeddings.npy"), (None, "data/vocab.json")],
+    "tiny_transformer": [("TINY_TRANSFORMER_PATH", "data/tiny_transformer.npz")],
+}
+
+
+def manim_version():
+    try:
+        return metadata.version("manim")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _names_used(node):
+    """Every bare name loaded inside `node` (attribute chains count by their root)."""
+    return {
+        child.id for child in ast.walk(node)
+        if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Load)
+    }
+
+
+class SourceGraph:
+    """Top-level definitions and local imports of the repo's modules."""
+
+    def __init__(self, repo_dir=REPO_DIR):
+        self.repo_dir = Path(repo_dir)
+        self._modules = {}
+
+    def is_local(self, module_name):
+        return (self.repo_dir / f"{module_name}.py").exists()
+
+    def module(self, module_name):
+        if module_name in self._modules:
+            return self._modules[module_name]
+
+        source = (self.repo_dir / f"{module_name}.py").read_text(encoding="utf-8")
+        tree = ast.parse(source)
+        definitions = {}
+        imports = {}
+        star_imports = []
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                definitions[node.name] = node
+            elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for target in targets:
+                    for name in ast.walk(target):
+                        if isinstance(name, ast.Name):
+                            definitions[name.id] = node
+            elif isinstance(node, ast.Import):
+                for alias in node.names:
+                    root = alias.name.split(".")[0]
+                    if self.is_local(root):
+                        imports[alias.asname or root] = (root, None)
+            elif isinstance(node, ast.ImportFrom) and node.module and self.is_local(node.module):
+                for alias in node.names:
+                    if alias.name == "*":
+                        star_imports.append(node.module)
+                    else:
+                        imports[alias.asname or alias.name] = (node.module, alias.name)
+
+        info = {
+            "source": source,
+            "definitions": definitions,
+            "imports": imports,
+            "star_imports": star_imports,
+        }
+        self._modules[module_name] = info
+        return info
+
+    def dependencies(self, module_name, name):
+        """Source snippets that `module_name.name` depends on, in a stable order."""
+        parts = []
+        self._collect(module_name, name, set(), parts)
+        return parts
+
+    def _collect(self, module_name, name, seen, parts):
+        if (module_name, name) in seen:
+            return
+        seen.add((module_name, name))
+        info = self.module(module_name)
+
+        if name in info["definitions"]:
+            node = info["definitions"][name]
+            segment = ast.get_source_segment(info["source"], node) or ""
+            parts.append(f"# {module_name}.{name}\n{segment}")
+            for used in sorted(_names_used(node)):
+                self._collect(module_name, used, seen, parts)
+        elif name in info["imports"]:
+            target, attr = info["imports"][name]
+            if attr is None:
+                self._collect_module(target, seen, parts)
+            else:
+                self._collect(target, attr, seen, parts)
+        else:
+            for target in info["star_imports"]:
+                if name in self.module(target)["definitions"]:
+                    self._collect(target, name, seen, parts)
+                    break
+
+    def _collect_module(self, module_name, seen, parts):
+        """A whole local module used as a namespace: depend on all of it."""
+        if (module_name, None) in seen:
+            return
+        seen.add((module_name, None))
+        info = self.module(module_name)
+        parts.append(f"# {module_name}\n{info['source']}")
+        local_modules = {target for target, _ in info["imports"].values()} | set(info["star_imports"])
+        for target in sorted(local_modules):
+            self._collect_module(target, seen, parts)
+
+
+def data_fingerprint(parts, repo_dir=REPO_DIR):
+    """{file: [size, mtime_ns] or None} of the DATA_FILES of the modules in `parts` (see dependencies())."""
+    # Every part starts with "# module.name" or "# module"
+    modules = {part[2:].split("\n", 1)[0].split(".")[0] for part in parts}
+    files = {}
+    for module_name in sorted(modules & DATA_FILES.keys()):
+        for env_var, default in DATA_FILES[module_name]:
+            path = Path(env_var and os.environ.get(env_var) or Path(repo_dir) / default)
+            try:
+                stat = path.stat()
+                files[str(path)] = [stat.st_size, stat.st_mtime_ns]
+            except FileNotFoundError:
+                files[str(path)] = None
+    return files
+
+
+class RenderCache:
+    """
+    Maps scene cache keys to finished movies stored under `cache_dir`.
+    Only the coordinating process touches the cache, so no locking is needed.
+    """
+
+    def __init__(self, cache_dir, repo_dir=REPO_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.index_path = self.cache_dir / "index.json"
+        self.graph = SourceGraph(repo_dir)
+        self.manim_version = manim_version()
+        try:
+            self.index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.index = {}
+
+    def key(self, module_name, scene_name, options):
+        render_options = {k: v for k, v in options.items() if k not in NON_RENDER_OPTIONS}
+        sources = self.graph.dependencies(module_name, scene_name)
+        payload = {
+            "version": CACHE_VERSION,
+            "scene": f"{module_name}:{scene_name}",
+            "sources": sources,
+            "data": data_fingerprint(sources, self.graph.repo_dir),
+            "params": params_digest(module_name, scene_name, self.graph.repo_dir / "params"),
+            "options": render_options,
+            "manim": self.manim_version,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def lookup(self, key):
+        """The index entry for `key` if its movie is still in the cache, else None."""
+        entry = self.index.get(key)
+        if entry is None or not (self.cache_dir / entry["blob"]).exists():
+            return None
+        return entry
+
+    def restore(self, entry):
+        """Put the cached movie back at its output path (if it is not already there)."""
+        blob = self.cache_dir / entry["blob"]
+        output = Path(entry["output"])
+        if not (output.exists() and file_digest(output) == entry["sha256"]):
+            output.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(blob, output)
+        return str(output)
+
+    def store(self, key, result):
+        """Copy a freshly rendered movie into the cache under `key`."""
+        output = Path(result["output"])
+        blob = Path(key[:2]) / f"{key}{output.suffix}"
+        (self.cache_dir / blob).parent.mkdir(parents=True, exist_ok=True)
+        # Copy rather than hard-link: manim rewrites outputs in place
+        shutil.copy2(output, self.cache_dir / blob)
+        self.index[key] = {
+            "module": result["module"],
+            "scene": result["scene"],
+            "output": str(output),
+            "blob": blob.as_posix(),
+            "sha256": file_digest(output),
+            "frames": result.get("frames", 0),
+            "render_seconds": result.get("seconds", 0.0),
+        }
+
+    def save(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(self.index, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.index_path)
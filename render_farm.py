@@ -0,0 +1,341 @@
+"""Render farm: split scenes into play ranges and render them on many workers.
+
+A SQLite job table on shared storage coordinates everything, so workers can
+be processes on this machine or on any node that mounts the same media
+directory:
+
+  submit    dry-run each scene to count its plays, and enqueue one job per
+            range of --plays-per-segment plays,
+  work      start --workers local worker processes; each claims a pending
+            job, renders that play range (earlier plays are fast-forwarded
+            without rasterizing), and records the result. Workers heartbeat
+            while rendering; a job whose worker stopped heartbeating is put
+            back in the queue (up to MAX_ATTEMPTS tries),
+  assemble  losslessly concatenate the finished segments of every scene
+            (packet copy, no re-encode) into the usual movie path,
+  status    print the job table,
+  run       submit + work + assemble, for trying it all on one machine.
+
+Usage:
+    python render_farm.py run -q k --workers 4 compute_attn text_cal
+    python render_farm.py submit -q k                 # on the coordinator
+    python render_farm.py work --workers 8            # on every render node
+    python render_farm.py assemble
+"""
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, TimeoutError, as_completed
+from pathlib import Path
+
+from render_all import QUALITIES, REPO_DIR, discover_scenes, render_scene, scene_config, select_scenes
+
+DEFAULT_PLAYS_PER_SEGMENT = 8
+MAX_ATTEMPTS = 3
+
+# A running job whose heartbeat is older than this is considered abandoned
+HEARTBEAT_INTERVAL = 10.0
+HEARTBEAT_TIMEOUT = 60.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          INTEGER PRIMARY KEY,
+    module      TEXT NOT NULL,
+    scene       TEXT NOT NULL,
+    segment     INTEGER NOT NULL,
+    first_play  INTEGER,
+    last_play   INTEGER,
+    options     TEXT NOT NULL,
+    status      TEXT NOT NULL DEFAULT 'pending',
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    worker      TEXT,
+    heartbeat   REAL,
+    output      TEXT,
+    seconds     REAL,
+    error       TEXT,
+    UNIQUE (module, scene, segment, options)
+);
+"""
+
+
+def connect(db_path):
+    """Autocommit connection; transactions are opened explicitly with BEGIN IMMEDIATE."""
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    # Long timeout: many workers contend for the write lock while claiming jobs
+    connection = sqlite3.connect(db_path, timeout=60, isolation_level=None)
+    connection.row_factory = sqlite3.Row
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def count_plays(module_name, scene_name, options):
+    """Number of play()/wait() calls in a scene, from a dry run. Runs in a worker."""
+    from manim import tempconfig
+
+    if str(REPO_DIR) not in sys.path:
+        sys.path.insert(0, str(REPO_DIR))
+    overrides = dict(scene_config(module_name, options), dry_run=True, write_to_movie=False)
+    with tempconfig(overrides):
+        module = importlib.import_module(module_name)
+        scene = getattr(module, scene_name)(skip_animations=True)
+        scene.render()
+        return scene.renderer.num_plays
+
+
+def segment_ranges(num_plays, plays_per_segment):
+    """[(first, last), ...] inclusive play ranges; [None] when one job covers the scene."""
+    if num_plays <= plays_per_segment:
+        return [None]
+    return [
+        (first, min(first + plays_per_segment, num_plays) - 1)
+        for first in range(0, num_plays, plays_per_segment)
+    ]
+
+
+def submit(connection, scenes, options, plays_per_segment, workers=None):
+    """Count plays of `scenes` in parallel and enqueue their segment jobs."""
+    options_json = json.dumps(options, sort_keys=True)
+    with ProcessPoolExecutor(
+        max_workers=max(min(workers or os.cpu_count() or 1, len(scenes)), 1),
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=1,
+    ) as pool:
+        futures = {
+            pool.submit(count_plays, module_name, scene_name, options): (module_name, scene_name)
+            for module_name, scene_name in scenes
+        }
+        for future in as_completed(futures):
+            module_name, scene_name = futures[future]
+            try:
+                num_plays = future.result()
+            except Exception:
+                print(f"Could not dry-run {module_name}:{scene_name}; submitting it as one job.\n"
+                      f"{traceback.format_exc()}", file=sys.stderr)
+                num_plays = 0
+            ranges = segment_ranges(num_plays, plays_per_segment)
+            connection.execute("BEGIN IMMEDIATE")
+            # Resubmitting replaces the scene's old jobs (its play count may have changed)
+            connection.execute(
+                "DELETE FROM jobs WHERE module = ? AND scene = ? AND options = ?",
+                (module_name, scene_name, options_json),
+            )
+            for segment, play_range in enumerate(ranges):
+                first, last = play_range or (None, None)
+                connection.execute(
+                    "INSERT INTO jobs (module, scene, segment, first_play, last_play, options) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (module_name, scene_name, segment, first, last, options_json),
+                )
+            connection.execute("COMMIT")
+            print(f"Submitted {module_name}:{scene_name}: {num_plays} plays in {len(ranges)} segments", flush=True)
+
+
+def requeue_abandoned(connection):
+    """Put running jobs whose worker stopped heartbeating back in the queue (or fail them)."""
+    cutoff = time.time() - HEARTBEAT_TIMEOUT
+    connection.execute(
+        "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+        "error = 'worker stopped heartbeating', worker = NULL "
+        "WHERE status = 'running' AND heartbeat < ?",
+        (MAX_ATTEMPTS, cutoff),
+    )
+
+
+def claim_job(connection, worker_id):
+    """Atomically take the oldest pending job; returns its row or None."""
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        requeue_abandoned(connection)
+        row = connection.execute(
+            "SELECT * FROM jobs WHERE status = 'pending' ORDER BY id LIMIT 1"
+        ).fetchone()
+        if row is not None:
+            connection.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, heartbeat = ?, attempts = attempts + 1 "
+                "WHERE id = ?",
+                (worker_id, time.time(), row["id"]),
+            )
+        connection.execute("COMMIT")
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    return row
+
+
+def finish_job(connection, job_id, worker_id, result, attempts):
+    """Record a render result, unless the job was meanwhile handed to another worker."""
+    if result["status"] == "ok":
+        status = "done"
+    else:
+        status = "failed" if attempts >= MAX_ATTEMPTS else "pending"
+    connection.execute(
+        "UPDATE jobs SET status = ?, output = ?, seconds = ?, error = ?, worker = NULL "
+        "WHERE id = ? AND worker = ?",
+        (status, result["output"], result["seconds"], result["error"], job_id, worker_id),
+    )
+
+
+def jobs_remaining(connection):
+    return connection.execute(
+        "SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'running')"
+    ).fetchone()[0]
+
+
+def work(db_path, worker_id):
+    """Claim and render jobs until the queue is empty. One of these runs per worker process."""
+    connection = connect(db_path)
+    context = multiprocessing.get_context("spawn")
+    while True:
+        job = claim_job(connection, worker_id)
+        if job is None:
+            if jobs_remaining(connection) == 0:
+                return
+            # Others are still rendering; wait in case one of them dies
+            time.sleep(HEARTBEAT_INTERVAL)
+            continue
+
+        options = json.loads(job["options"])
+        if job["first_play"] is not None:
+            options["animations"] = [job["first_play"], job["last_play"]]
+        label = f"{job['module']}:{job['scene']} #{job['segment']}"
+        print(f"[{worker_id}] rendering {label}", flush=True)
+
+        # Render in a fresh child (manim keeps global state) and heartbeat while it runs
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            future = pool.submit(render_scene, job["module"], job["scene"], options)
+            while True:
+                try:
+                    result = future.result(timeout=HEARTBEAT_INTERVAL)
+                    break
+                except TimeoutError:
+                    connection.execute(
+                        "UPDATE jobs SET heartbeat = ? WHERE id = ? AND worker = ?",
+                        (time.time(), job["id"], worker_id),
+                    )
+                except Exception:
+                    # The render process itself died
+                    result = {"status": "failed", "output": None, "seconds": 0.0, "error": traceback.format_exc()}
+                    break
+        finish_job(connection, job["id"], worker_id, result, job["attempts"] + 1)
+        print(f"[{worker_id}] {result['status']:>6} {label} {result['seconds']:.1f}s", flush=True)
+
+
+def run_workers(db_path, workers):
+    """Run `workers` local worker processes until the queue is drained."""
+    host = socket.gethostname()
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=work, args=(str(db_path), f"{host}-{os.getpid()}-{i}"))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+def concat_segments(segment_files, output_file):
+    """Concatenate movie segments by copying packets (same codec settings, no re-encode)."""
+    import av
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as listing:
+        for path in segment_files:
+            escaped = Path(path).resolve().as_posix().replace("'", "'\\''")
+            listing.write(f"file '{escaped}'\n")
+    try:
+        with av.open(listing.name, format="concat", options={"safe": "0"}) as source:
+            stream = source.streams.video[0]
+            with av.open(str(output_file), mode="w") as target:
+                output_stream = target.add_stream_from_template(template=stream)
+                for packet in source.demux(stream):
+                    if packet.dts is None:
+                        continue
+                    # Let the muxer recompute dts across segment boundaries
+                    packet.dts = None
+                    packet.stream = output_stream
+                    target.mux(packet)
+    finally:
+        os.unlink(listing.name)
+
+
+def assemble(connection):
+    """Write the final movie of every scene whose segments are all done; returns failures."""
+    scenes = connection.execute(
+        "SELECT module, scene, options, COUNT(*) AS segments, "
+        "SUM(status = 'done') AS done, SUM(status = 'failed') AS failed "
+        "FROM jobs GROUP BY module, scene, options ORDER BY module, scene"
+    ).fetchall()
+    failures = []
+    for row in scenes:
+        name = f"{row['module']}:{row['scene']}"
+        if row["done"] != row["segments"]:
+            failures.append(name)
+            print(f"Not assembling {name}: {row['done']}/{row['segments']} segments done", file=sys.stderr)
+            continue
+        outputs = [
+            r["output"] for r in connection.execute(
+                "SELECT output FROM jobs WHERE module = ? AND scene = ? AND options = ? ORDER BY segment",
+                (row["module"], row["scene"], row["options"]),
+            )
+        ]
+        if len(outputs) == 1 and Path(outputs[0]).stem == row["scene"]:
+            print(f"{name} -> {outputs[0]}")
+            continue
+        output_file = Path(outputs[0]).with_name(f"{row['scene']}{Path(outputs[0]).suffix}")
+        concat_segments(outputs, output_file)
+        print(f"{name} -> {output_file}")
+    return failures
+
+
+def print_status(connection):
+    for row in connection.execute(
+        "SELECT module, scene, segment, first_play, last_play, status, attempts, worker, seconds "
+        "FROM jobs ORDER BY module, scene, segment"
+    ):
+        plays = "all" if row["first_play"] is None else f"{row['first_play']}-{row['last_play']}"
+        print(f"{row['module']}:{row['scene']:<40} #{row['segment']:<3} plays {plays:<8} "
+              f"{row['status']:<8} tries {row['attempts']} {row['worker'] or ''} {row['seconds'] or ''}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["submit", "work", "assemble", "status", "run"])
+    parser.add_argument("scenes", nargs="*", help='"module", "Scene" or "module:Scene" (default: all)')
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITIES), default="l")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="local worker processes")
+    parser.add_argument("--plays-per-segment", type=int, default=DEFAULT_PLAYS_PER_SEGMENT)
+    parser.add_argument("--media-dir", default=str(REPO_DIR / "media"),
+                        help="shared media directory (must be the same path on every node)")
+    parser.add_argument("--db", default=None, help="job database (default: <media-dir>/render_farm.db)")
+    args = parser.parse_args(argv)
+
+    db_path = Path(args.db or Path(args.media_dir) / "render_farm.db")
+    connection = connect(db_path)
+
+    if args.command in ("submit", "run"):
+        scenes = select_scenes(discover_scenes(), args.scenes)
+        if not scenes:
+            print("No scenes matched.", file=sys.stderr)
+            return 1
+        options = {"quality": args.quality, "media_dir": args.media_dir}
+        submit(connection, scenes, options, args.plays_per_segment, workers=args.workers)
+    if args.command in ("work", "run"):
+        run_workers(db_path, args.workers)
+    if args.command in ("assemble", "run"):
+        return 1 if assemble(connection) else 0
+    if args.command == "status":
+        print_status(connection)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
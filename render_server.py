@@ -0,0 +1,175 @@
+"""Warm fork-server: render scenes without paying manim's startup each time.
+
+`serve` imports manim and numpy once, loads the config and TeX template,
+touches font discovery and opens the glyph cache, then listens on a Unix
+socket. Every render request forks a child from that warm process, so the
+child starts rendering immediately; it imports the (freshly read) scene
+module, renders with render_all.render_scene and sends the result back.
+Scene modules are never imported into the server itself, so edits are
+always picked up.
+
+Usage:
+    python render_server.py serve &                         # once
+    python render_server.py render opening:LLMScene
+    python render_server.py render dot_product -q h
+    python render_server.py stop
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+
+from render_all import QUALITIES, REPO_DIR, discover_scenes, render_scene, select_scenes
+
+DEFAULT_SOCKET = REPO_DIR / "media" / "render_server.sock"
+
+
+def warm_up(media_dir):
+    """Do all the per-process setup a render would otherwise start with."""
+    import numpy  # noqa: F401
+    import manim
+    from manim import config
+
+    import frame_pipeline
+    import static_holds
+    import tex_cache
+
+    config.tex_template  # parses the default TeX template
+    tex_cache.install(Path(media_dir) / "glyph_cache")
+    static_holds.install()
+    frame_pipeline.install()
+    try:
+        import manimpango
+
+        manimpango.list_fonts()  # font discovery for Text/MarkupText
+    except ImportError:
+        pass
+    # Import the heavier submodules scenes reach on their first Tex/3D object
+    import manim.mobject.text.tex_mobject  # noqa: F401
+    import manim.mobject.three_d.three_dimensions  # noqa: F401
+    return manim.__version__
+
+
+def read_message(connection):
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = connection.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return json.loads(data) if data else None
+
+
+def send_message(connection, message):
+    connection.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def handle_request(connection, request):
+    """Runs in the forked child: render the requested scenes and report back."""
+    results = []
+    for module_name, scene_name in request["scenes"]:
+        results.append(render_scene(module_name, scene_name, request["options"]))
+    send_message(connection, {"results": results})
+
+
+def serve(socket_path, media_dir):
+    version = warm_up(media_dir)
+    socket_path = Path(socket_path)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    socket_path.unlink(missing_ok=True)
+
+    # Children are not waited for individually; let the kernel reap them
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    server.listen()
+    print(f"Warm render server (manim {version}) listening on {socket_path}", flush=True)
+    try:
+        while True:
+            connection, _ = server.accept()
+            request = read_message(connection)
+            if request is None:
+                connection.close()
+                continue
+            if request.get("command") == "stop":
+                send_message(connection, {"stopped": True})
+                connection.close()
+                break
+
+            pid = os.fork()
+            if pid == 0:
+                # Child: the listening socket belongs to the server
+                server.close()
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                status = 0
+                try:
+                    handle_request(connection, request)
+                except BaseException:
+                    status = 1
+                finally:
+                    connection.close()
+                    # Skip atexit handlers and buffered state inherited from the server
+                    os._exit(status)
+            connection.close()
+    finally:
+        server.close()
+        socket_path.unlink(missing_ok=True)
+
+
+def request(socket_path, message):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(str(socket_path))
+    try:
+        send_message(client, message)
+        return read_message(client)
+    finally:
+        client.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["serve", "render", "stop"])
+    parser.add_argument("scenes", nargs="*", help='"module", "Scene" or "module:Scene"')
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITIES), default="l")
+    parser.add_argument("--section", help="render only this section (see sections.py)")
+    parser.add_argument("--socket", default=str(DEFAULT_SOCKET))
+    parser.add_argument("--media-dir", default=str(REPO_DIR / "media"))
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.socket, args.media_dir)
+        return 0
+    if args.command == "stop":
+        request(args.socket, {"command": "stop"})
+        return 0
+
+    scenes = select_scenes(discover_scenes(), args.scenes)
+    if not scenes:
+        print("No scenes matched.", file=sys.stderr)
+        return 1
+    start = time.perf_counter()
+    reply = request(args.socket, {
+        "scenes": scenes,
+        "options": {"quality": args.quality, "media_dir": args.media_dir, "section": args.section},
+    })
+    if reply is None:
+        print("The render server closed the connection without a result.", file=sys.stderr)
+        return 1
+    failed = False
+    for result in reply["results"]:
+        print(f"{result['status']:>6}  {result['module']}:{result['scene']}  "
+              f"{result['seconds']:.2f}s  {result['output'] or ''}")
+        if result["status"] != "ok":
+            print(result["error"], file=sys.stderr)
+            failed = True
+    print(f"Round trip {time.perf_counter() - start:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""Numeric data and random numbers for each scene, identical in every render.
+
+    params = scene_params(self)                                  # this scene's store
+    ids = params.get("prompt_token_ids", [253, 16, 361, 54])     # params file value, else the default
+    rng = params.rng("embeddings")                               # seeded np.random.Generator
+
+Each scene class may have a JSON file params/<module>.<Scene>.json:
+
+    {"seed": 0, "values": {"prompt_token_ids": [253, 16, 361, 54]}}
+
+It is read on first use. Scenes keep their current numbers as get()
+defaults, so a missing file or key changes nothing, and editing the file
+retunes a scene without touching its code.
+
+rng(name) derives a Generator from (seed, module.Scene, name) through a
+SeedSequence, never from the global NumPy state: every call starts the same
+stream from the beginning, so two workers rendering different segments of
+one scene draw identical numbers, as does a re-render. Streams are
+independent by name, so adding a new one never shifts the others.
+
+render_cache.RenderCache and scene_state.state_key include the params file
+in their keys (params_digest), so editing it invalidates exactly that
+scene's cached movie and snapshots.
+"""
+import hashlib
+import inspect
+import json
+from pathlib import Path
+
+import numpy as np
+
+REPO_DIR = Path(__file__).resolve().parent
+PARAMS_DIR = REPO_DIR / "params"
+
+
+def params_path(module_name, scene_name, params_dir=PARAMS_DIR):
+    return Path(params_dir) / f"{module_name}.{scene_name}.json"
+
+
+def params_digest(module_name, scene_name, params_dir=PARAMS_DIR):
+    """sha256 of the scene's params file, or None when it has none."""
+    path = params_path(module_name, scene_name, params_dir)
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def _stable_hash(text):
+    # Python's hash() of a str changes between processes; this does not
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+
+
+class SceneParams:
+    def __init__(self, module_name, scene_name, params_dir=PARAMS_DIR):
+        self.module_name = module_name
+        self.scene_name = scene_name
+        self.path = params_path(module_name, scene_name, params_dir)
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            try:
+                self._data = json.loads(self.path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                self._data = {}
+        return self._data
+
+    @property
+    def seed(self):
+        return int(self.data.get("seed", 0))
+
+    def get(self, name, default=None):
+        """The params file's value for `name`, else `default`."""
+        return self.data.get("values", {}).get(name, default)
+
+    def array(self, name, default=None, dtype=float):
+        value = self.get(name, default)
+        return None if value is None else np.asarray(value, dtype=dtype)
+
+    def rng(self, name):
+        """A fresh Generator for the stream `name`, the same in every process."""
+        scene = f"{self.module_name}.{self.scene_name}"
+        return np.random.default_rng([self.seed, _stable_hash(scene), _stable_hash(name)])
+
+
+_stores = {}
+
+
+def scene_params(scene):
+    """The SceneParams of a scene (instance or class), shared by every call in this process."""
+    cls = scene if isinstance(scene, type) else type(scene)
+    # The file's stem, however manim or render_all named the module when importing it
+    key = (Path(inspect.getfile(cls)).stem, cls.__name__)
+    if key not in _stores:
+        _stores[key] = SceneParams(*key)
+    return _stores[key]
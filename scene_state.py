@@ -0,0 +1,252 @@
+"""Save a scene's mobjects to a compact file and restore them in a later run.
+
+A snapshot stores the geometry and style of every VMobject reachable from the
+scene (points, fill/stroke/background colours, stroke widths, z-index), the
+tree structure between them (shared submobjects stay shared), which of them
+were on screen, and named references into the tree such as self.q_matrix or
+the nested list self.attention_entries. Restoring rebuilds plain VMobject /
+VGroup objects from those arrays, so no Tex is compiled or parsed and none of
+the construction code runs. Classes that define snapshot_fields() and
+from_snapshot() (e.g. BracketMatrix) are restored as themselves, with
+their own layout data.
+
+Each snapshot carries a key (normally state_key() of the scene class that built it)
+and is ignored when the key no longer matches, so editing the construction
+code can never restore stale geometry.
+
+    # end of SelfAttentionAnimation.construct
+    save_scene_state(self, "self_attention_final", state_key(SelfAttentionAnimation), names=["q_matrix_body", ...])
+    # start of a later scene: the same mobjects, to be moved into its own layout
+    state = load_scene_state("self_attention_final", state_key(SelfAttentionAnimation))
+"""
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from render_cache import SourceGraph, data_fingerprint, manim_version
+from scene_params import params_digest
+
+# Bump when the file layout changes
+STATE_VERSION = 2
+
+# Scalar attributes restored onto each node
+NODE_ATTRIBUTES = ("stroke_width", "background_stroke_width", "z_index")
+
+
+def state_key(cls):
+    """
+    Key that changes whenever the source of `cls` (or anything it uses in this repo),
+    the data files that code reads or the scene's params file change.
+    """
+    module_name = Path(inspect.getfile(cls)).stem
+    sources = SourceGraph().dependencies(module_name, cls.__name__)
+    payload = {
+        "version": STATE_VERSION,
+        "sources": sources,
+        "data": data_fingerprint(sources),
+        "params": params_digest(module_name, cls.__name__),
+        "manim": manim_version(),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def state_path(name):
+    from manim import config
+
+    return Path(config.media_dir) / "scene_state" / f"{name}.npz"
+
+
+def _flatten(roots):
+    """Number every VMobject reachable from `roots` once; returns (nodes, children, index)."""
+    from manim import VMobject
+
+    nodes = []
+    children = []
+    index = {}
+
+    def visit(mob):
+        if id(mob) in index:
+            return index[id(mob)]
+        if not isinstance(mob, VMobject):
+            raise TypeError(f"Scene snapshots only support VMobjects, got {type(mob).__name__}")
+        i = len(nodes)
+        index[id(mob)] = i
+        nodes.append(mob)
+        children.append(None)
+        children[i] = [visit(sub) for sub in mob.submobjects]
+        return i
+
+    for root in roots:
+        visit(root)
+    return nodes, children, index
+
+
+def _encode_named(value, visit):
+    """Named references as node indices; lists/tuples keep their nesting."""
+    if isinstance(value, (list, tuple)):
+        return [_encode_named(item, visit) for item in value]
+    return visit(value)
+
+
+def _decode_named(value, objects):
+    if isinstance(value, list):
+        return [_decode_named(item, objects) for item in value]
+    return objects[value]
+
+
+def _concat(arrays, width):
+    offsets = np.cumsum([0] + [len(a) for a in arrays])
+    values = np.concatenate(arrays) if arrays else np.zeros((0, width))
+    return values.reshape(-1, width), offsets
+
+
+def save_scene_state(scene, name, key, names=()):
+    """
+    Snapshot scene.mobjects plus the scene attributes listed in `names`
+    (mobjects or nested lists of them) to state_path(name).
+    """
+    named_values = {attr: getattr(scene, attr) for attr in names}
+
+    # Named mobjects that are not on screen (e.g. a regrouping VGroup) become extra roots
+    extra_roots = []
+
+    def collect(value):
+        if isinstance(value, (list, tuple)):
+            for item in value:
+                collect(item)
+        else:
+            extra_roots.append(value)
+
+    for value in named_values.values():
+        collect(value)
+    nodes, children, index = _flatten(list(scene.mobjects) + extra_roots)
+
+    header = {
+        "version": STATE_VERSION,
+        "key": key,
+        "groups": [i for i, mob in enumerate(nodes) if _is_group(mob)],
+        "tex_strings": {
+            str(i): mob.tex_string for i, mob in enumerate(nodes) if isinstance(getattr(mob, "tex_string", None), str)
+        },
+        "custom": {
+            str(i): {"class": f"{type(mob).__module__}:{type(mob).__qualname__}", "fields": mob.snapshot_fields()}
+            for i, mob in enumerate(nodes) if hasattr(mob, "snapshot_fields")
+        },
+        "scene": [index[id(mob)] for mob in scene.mobjects],
+        "named": {attr: _encode_named(value, lambda mob: index[id(mob)]) for attr, value in named_values.items()},
+    }
+
+    points, point_offsets = _concat([mob.points for mob in nodes], 3)
+    fill, fill_offsets = _concat([mob.fill_rgbas for mob in nodes], 4)
+    stroke, stroke_offsets = _concat([mob.stroke_rgbas for mob in nodes], 4)
+    background, background_offsets = _concat([mob.background_stroke_rgbas for mob in nodes], 4)
+    attributes = np.array(
+        [[getattr(mob, attr, 0.0) or 0.0 for attr in NODE_ATTRIBUTES] for mob in nodes], dtype=float
+    ).reshape(-1, len(NODE_ATTRIBUTES))
+    child_offsets = np.cumsum([0] + [len(c) for c in children])
+    child_indices = np.array([i for c in children for i in c], dtype=np.int64)
+
+    path = state_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez_compressed(
+                f,
+                header=np.array(json.dumps(header)),
+                points=points,
+                point_offsets=point_offsets,
+                fill=fill,
+                fill_offsets=fill_offsets,
+                stroke=stroke,
+                stroke_offsets=stroke_offsets,
+                background=background,
+                background_offsets=background_offsets,
+                attributes=attributes,
+                child_offsets=child_offsets,
+                child_indices=child_indices,
+            )
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return path
+
+
+def _is_group(mob):
+    from manim import VGroup
+
+    return isinstance(mob, VGroup)
+
+
+def load_scene_state(name, key):
+    """(scene_mobjects, named) from state_path(name), or None if missing or stale."""
+    from manim import VGroup, VMobject
+
+    try:
+        with np.load(state_path(name), allow_pickle=False) as data:
+            arrays = {field: data[field] for field in data.files}
+        header = json.loads(str(arrays["header"]))
+    except (OSError, ValueError, KeyError):
+        return None
+    if header.get("version") != STATE_VERSION or header.get("key") != key:
+        return None
+
+    def rows(field, offsets_field, i):
+        offsets = arrays[offsets_field]
+        return arrays[field][offsets[i]:offsets[i + 1]].copy()
+
+    groups = set(header["groups"])
+    custom = header["custom"]
+    objects = []
+    for i, values in enumerate(arrays["attributes"]):
+        if str(i) in custom:
+            module_name, class_name = custom[str(i)]["class"].split(":")
+            cls = getattr(importlib.import_module(module_name), class_name)
+            mob = cls.from_snapshot(custom[str(i)]["fields"])
+        elif i in groups:
+            mob = VGroup()
+        else:
+            mob = VMobject()
+        mob.points = rows("points", "point_offsets", i)
+        mob.fill_rgbas = rows("fill", "fill_offsets", i)
+        mob.stroke_rgbas = rows("stroke", "stroke_offsets", i)
+        mob.background_stroke_rgbas = rows("background", "background_offsets", i)
+        for attr, value in zip(NODE_ATTRIBUTES, values):
+            setattr(mob, attr, float(value))
+        if len(mob.fill_rgbas):
+            mob.fill_opacity = float(mob.fill_rgbas[0, 3])
+        if len(mob.stroke_rgbas):
+            mob.stroke_opacity = float(mob.stroke_rgbas[0, 3])
+        objects.append(mob)
+
+    for i_str, tex_string in header["tex_strings"].items():
+        objects[int(i_str)].tex_string = tex_string
+
+    # Assign directly: add() would re-check and reorder shared submobjects
+    child_offsets = arrays["child_offsets"]
+    child_indices = arrays["child_indices"]
+    for i, mob in enumerate(objects):
+        mob.submobjects = [objects[j] for j in child_indices[child_offsets[i]:child_offsets[i + 1]]]
+
+    scene_mobjects = [objects[i] for i in header["scene"]]
+    named = {attr: _decode_named(value, objects) for attr, value in header["named"].items()}
+    return scene_mobjects, named
+
+
+def restore_scene_state(scene, name, key):
+    """Add a saved snapshot to `scene` and set its named attributes. Returns False if there is none."""
+    state = load_scene_state(name, key)
+    if state is None:
+        return False
+    scene_mobjects, named = state
+    for attr, value in named.items():
+        setattr(scene, attr, value)
+    scene.add(*scene_mobjects)
+    return True
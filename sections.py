@@ -0,0 +1,48 @@
+"""Render one named section of a scene on its own.
+
+Scenes that mix in SectionedScene mark their steps with
+self.next_section("name"). With MANIM_SECTION=<name> in the environment
+(render_all.py --section <name> sets it), every section before <name> is
+fast-forwarded: its plays still run, so the scene state is exactly what the
+target section expects, but nothing is rasterized or encoded. The scene
+stops at the end of <name>, so later sections are not even constructed.
+
+    MANIM_SECTION=column_3 manim -ql compute_attn.py ExtendedAttentionCalculation
+    python render_all.py --section column_3 compute_attn:ExtendedAttentionCalculation
+"""
+import os
+
+from manim import DefaultSectionType
+from manim.utils.exceptions import EndSceneEarlyException
+
+SECTION_ENV_VAR = "MANIM_SECTION"
+
+
+class SectionedScene:
+    """Scene mixin: honour MANIM_SECTION by skipping to (and stopping after) that section."""
+
+    def setup(self):
+        super().setup()
+        self.target_section = os.environ.get(SECTION_ENV_VAR) or None
+        self.section_names = []
+        self._in_target_section = False
+        if self.target_section:
+            # Plays before the first next_section() call belong to no named section
+            super().next_section("preamble", skip_animations=True)
+
+    def next_section(self, name="unnamed", section_type=DefaultSectionType.NORMAL, skip_animations=False):
+        self.section_names.append(name)
+        if self.target_section:
+            if self._in_target_section:
+                raise EndSceneEarlyException()
+            self._in_target_section = name == self.target_section
+            skip_animations = not self._in_target_section
+        super().next_section(name, section_type, skip_animations)
+
+    def tear_down(self):
+        super().tear_down()
+        if self.target_section and self.target_section not in self.section_names:
+            raise ValueError(
+                f"{type(self).__name__} has no section {self.target_section!r}; "
+                f"sections: {', '.join(self.section_names) or 'none'}"
+            )
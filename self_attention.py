@@ -1,35 +1,124 @@
 from manim import *
 import numpy as np
 
-
-class SelfAttentionAnimation(Scene):
+from attention_engine import ADDITION_PROMPT
+from bracket_matrix import BracketMatrix, create_brackets
+from scene_state import save_scene_state, state_key
+from sections import SectionedScene
+from tiny_transformer import prompt_attention
+
+# SelfAttentionAnimation saves its final matrices under this name, with these attribute
+# names; compute_attn.ExtendedAttentionCalculation starts from them
+FINAL_STATE = "self_attention_final"
+FINAL_STATE_NAMES = (
+    "q_matrix_body", "q_row_labels", "q_matrix_label",
+    "kt_matrix_body", "kt_col_labels", "kt_matrix_label",
+    "attention_scores",
+)
+MATRIX_FONT_SIZE = 32
+
+
+def q_row_label_positions(q_matrix):
+    """Centres of the q_{token} labels, level with each row, left of the bracket."""
+    left = q_matrix.bracket_bounds()[0]
+    return [[left - 0.8, row[0][1], 0] for row in q_matrix.cell_positions()]
+
+
+def kt_col_label_positions(kt_matrix):
+    """Centres of the (k_{token})^T labels, under each column."""
+    bottom = kt_matrix.bracket_bounds()[3]
+    return [[col[0], bottom - 0.5, 0] for col in kt_matrix.cell_positions()[0]]
+
+
+def matrix_label_position(matrix):
+    """Centre of the name ("Q", "K^T") above the bracket."""
+    left, right, top, _ = matrix.bracket_bounds()
+    return [(left + right) / 2, top + 0.4, 0]
+
+
+def create_q_matrix(attention, positions, label_positions=None, font_size=MATRIX_FONT_SIZE):
+    """(Q, row labels, "Q"): the queries centred on `positions` (seq x d_k x 3)."""
+    q_matrix = BracketMatrix(
+        attention.q, positions=positions, h_padding=0.5, v_padding=0.4,
+        font_size=font_size, color=BLUE, entry_format="{:.1f}"
+    )
+    if label_positions is None:
+        label_positions = q_row_label_positions(q_matrix)
+    row_labels = VGroup(*(
+        MathTex(f"q_{{{token}}}", font_size=20, color=BLUE).move_to(position)
+        for token, position in zip(attention.tokens, label_positions)
+    ))
+    label = MathTex("Q", font_size=font_size, color=BLUE).move_to(matrix_label_position(q_matrix))
+    return q_matrix, row_labels, label
+
+
+def create_kt_matrix(attention, positions, label_positions=None, font_size=MATRIX_FONT_SIZE):
+    """(K^T, column labels, "K^T"): the keys as columns, centred on `positions` (d_k x seq x 3)."""
+    kt_matrix = BracketMatrix(
+        attention.k.T, positions=positions, h_padding=0.5, v_padding=0.35,
+        font_size=font_size, color=RED, entry_format="{:.1f}"
+    )
+    if label_positions is None:
+        label_positions = kt_col_label_positions(kt_matrix)
+    col_labels = VGroup(*(
+        MathTex(rf"(k_{{{token}}})^\top", font_size=20, color=RED).move_to(position)
+        for token, position in zip(attention.tokens, label_positions)
+    ))
+    label = MathTex(r"K^\top", font_size=font_size, color=RED).move_to(matrix_label_position(kt_matrix))
+    return kt_matrix, col_labels, label
+
+
+def create_attention_scores(attention, positions, bounds, known_rows, font_size=MATRIX_FONT_SIZE):
+    """Q K^T with the first `known_rows` rows filled in and yellow "?" for the rest."""
+    scores = attention.scores
+    entries = [[f"{score:.2f}" for score in row] for row in scores[:known_rows]]
+    entries += [["?"] * len(scores) for _ in range(known_rows, len(scores))]
+    return BracketMatrix(
+        entries, positions=positions, bounds=bounds, font_size=font_size, color=WHITE,
+        cell_colors=[[YELLOW if entry == "?" else WHITE for entry in row] for row in entries]
+    )
+
+
+class SelfAttentionAnimation(SectionedScene, Scene):
     def construct(self):
+        # The trained model's first attention head when there is a checkpoint, the toy values otherwise
+        self.attention = prompt_attention(ADDITION_PROMPT.tokens, fallback=ADDITION_PROMPT)
+
         # Title
+        self.next_section("title")
         title = Tex(r"\text{Self-Attention Mechanism}", font_size=48).to_edge(UP)
         self.play(Write(title))
         self.wait(1)
         self.play(FadeOut(title))
 
         # Step 1: Tokens
+        self.next_section("tokenization")
         self.animate_tokenization()
         self.wait(2)
 
         # Step 2: Transform to Q, K, V vectors with descriptive labels
+        self.next_section("qkv")
         self.animate_qkv_transformation()
         self.wait(2)
 
         # NEW STEP: Show attention formula and highlight Q·K^T
+        self.next_section("formula")
         self.show_attention_formula_and_highlight()
         self.wait(3)
 
         # Step 3: Show individual vectors, then transform to matrices
+        self.next_section("matrices")
         self.animate_individual_to_matrix_transformation()
         self.wait(3)
 
         # Step 4: Add attention matrix
+        self.next_section("attention_matrix")
         self.add_attention_matrix()
         self.wait(3)
 
+        # ExtendedAttentionCalculation starts from these matrices
+        save_scene_state(self, FINAL_STATE, state_key(SelfAttentionAnimation), names=FINAL_STATE_NAMES)
+
     # ------------------------------------------------------------------
     # Positional-encoding explanation
     # ------------------------------------------------------------------
@@ -95,7 +184,7 @@ class SelfAttentionAnimation(Scene):
     # and W_ labels at arrow midpoints
     # ------------------------------------------------------------------
     def animate_qkv_transformation(self):
-        token_labels = ['26', '+', '55', '=']
+        token_labels = self.attention.tokens
 
         for i, symbol in enumerate(self.x_symbols):
             # Wider arrow spacing: use 0.6 instead of 0.4
@@ -203,16 +292,11 @@ class SelfAttentionAnimation(Scene):
 
     def show_individual_q_vectors(self):
         """Show individual Q vectors as horizontal row vectors positioned where Q matrix will be"""
-        token_labels = ['26', '+', '55', '=']
+        token_labels = self.attention.tokens
 
         # Create individual Q vectors with 3D toy values (as row vectors)
         self.q_vectors = VGroup()
-        q_values = [
-            [0.2, 0.8, 0.1],  # q_26
-            [0.9, 0.1, 0.3],  # q_+
-            [0.4, 0.6, 0.9],  # q_55
-            [0.1, 0.3, 0.7]   # q_=
-        ]
+        q_values = self.attention.q
 
         # Position down and to the left where the Q matrix will be
         start_pos = LEFT * 3.2 + DOWN * 0.3
@@ -222,7 +306,7 @@ class SelfAttentionAnimation(Scene):
             vector_entries = [f"{val:.1f}" for val in values]
             vector_matrix = Matrix(
                 [vector_entries],
-                element_to_mobject=lambda x: Tex(x, font_size=32),
+                element_to_mobject=lambda x: MathTex(x, font_size=32),
                 h_buff=0.7
             )
             vector_matrix.set_color(BLUE)
@@ -246,16 +330,11 @@ class SelfAttentionAnimation(Scene):
 
     def show_individual_kt_vectors(self):
         """Show individual K vectors as column vectors positioned where K^T matrix will be"""
-        token_labels = ['26', '+', '55', '=']
+        token_labels = self.attention.tokens
 
         # Create individual K vectors (which will become columns in K^T)
         self.kt_vectors = VGroup()
-        k_values = [
-            [0.3, 0.7, 0.2],  # k_26
-            [0.8, 0.2, 0.4],  # k_+
-            [0.1, 0.9, 0.6],  # k_55
-            [0.5, 0.3, 0.8]   # k_=
-        ]
+        k_values = self.attention.k
 
         # Position up and to the left where the K^T matrix will be
         start_pos = LEFT * 1.0 + UP * 1.9
@@ -265,7 +344,7 @@ class SelfAttentionAnimation(Scene):
             vector_entries = [f"{val:.1f}" for val in values]
             vector_matrix = Matrix(
                 [[entry] for entry in vector_entries],
-                element_to_mobject=lambda x: Tex(x, font_size=32)
+                element_to_mobject=lambda x: MathTex(x, font_size=32)
             )
             vector_matrix.set_color(RED)
 
@@ -329,171 +408,17 @@ class SelfAttentionAnimation(Scene):
             # Get position of the label
             kt_label_positions.append(label.get_center())
 
-        # Get the same values used in individual vectors
-        q_values = [
-            [0.2, 0.8, 0.1],  # q_26
-            [0.9, 0.1, 0.3],  # q_+
-            [0.4, 0.6, 0.9],  # q_55
-            [0.1, 0.3, 0.7]   # q_=
-        ]
-
-        k_values = [
-            [0.3, 0.7, 0.2],  # k_26
-            [0.8, 0.2, 0.4],  # k_+
-            [0.1, 0.9, 0.6],  # k_55
-            [0.5, 0.3, 0.8]   # k_=
-        ]
-
-        # Create Q matrix numbers at exact existing positions
-        q_matrix_numbers = VGroup()
-        for i, row_values in enumerate(q_values):
-            for j, val in enumerate(row_values):
-                number = Tex(f"{val:.1f}", font_size=32, color=BLUE)
-                number.move_to(q_number_positions[i][j])  # Exact position from existing vector
-                q_matrix_numbers.add(number)
-
-        # Create Q matrix brackets to encompass all numbers
-        q_all_positions = [pos for row in q_number_positions for pos in row]
-        q_left = min(pos[0] for pos in q_all_positions) - 0.5  # Increased padding
-        q_right = max(pos[0] for pos in q_all_positions) + 0.5
-        q_top = max(pos[1] for pos in q_all_positions) + 0.4
-        q_bottom = min(pos[1] for pos in q_all_positions) - 0.4
-
-        brace_width = 0.3
-        stroke_width = 4
-        overlap = 0.02
-
-        # Left Q bracket
-        q_left_vertical = Line(
-            start=[q_left, q_top + overlap, 0],
-            end=[q_left, q_bottom - overlap, 0],
-            stroke_width=stroke_width,
-            color=BLUE
+        # Q and K^T entries and labels at exactly those positions (K^T vectors become columns)
+        q_matrix_body, q_row_labels, q_matrix_label = create_q_matrix(
+            self.attention, q_number_positions, q_label_positions
         )
-        q_left_top = Line(
-            start=[q_left - overlap, q_top, 0],
-            end=[q_left + brace_width, q_top, 0],
-            stroke_width=stroke_width,
-            color=BLUE
-        )
-        q_left_bottom = Line(
-            start=[q_left - overlap, q_bottom, 0],
-            end=[q_left + brace_width, q_bottom, 0],
-            stroke_width=stroke_width,
-            color=BLUE
+        kt_matrix_body, kt_col_labels, kt_matrix_label = create_kt_matrix(
+            self.attention, np.array(kt_number_positions).transpose(1, 0, 2), kt_label_positions
         )
 
-        # Right Q bracket
-        q_right_vertical = Line(
-            start=[q_right, q_top + overlap, 0],
-            end=[q_right, q_bottom - overlap, 0],
-            stroke_width=stroke_width,
-            color=BLUE
-        )
-        q_right_top = Line(
-            start=[q_right - brace_width, q_top, 0],
-            end=[q_right + overlap, q_top, 0],
-            stroke_width=stroke_width,
-            color=BLUE
-        )
-        q_right_bottom = Line(
-            start=[q_right - brace_width, q_bottom, 0],
-            end=[q_right + overlap, q_bottom, 0],
-            stroke_width=stroke_width,
-            color=BLUE
-        )
-
-        q_matrix_brackets = VGroup(
-            q_left_vertical, q_left_top, q_left_bottom,
-            q_right_vertical, q_right_top, q_right_bottom
-        )
-
-        # Create Q row labels at exact existing positions
-        token_labels = ['26', '+', '55', '=']
-        q_row_labels = VGroup()
-        for i, label in enumerate(token_labels):
-            row_label = MathTex(f"q_{{{label}}}", font_size=20, color=BLUE)
-            row_label.move_to(q_label_positions[i])  # Exact position from existing label
-            q_row_labels.add(row_label)
-
-        # Create K^T matrix numbers at exact existing positions
-        kt_matrix_numbers = VGroup()
-        for row in range(3):  # 3 rows in K^T
-            for col in range(4):  # 4 columns in K^T
-                val = k_values[col][row]  # Transposed indexing
-                number = Tex(f"{val:.1f}", font_size=32, color=RED)
-                number.move_to(kt_number_positions[col][row])  # Exact position
-                kt_matrix_numbers.add(number)
-
-        # Create K^T matrix brackets to encompass all numbers
-        kt_all_positions = [pos for col in kt_number_positions for pos in col]
-        kt_left = min(pos[0] for pos in kt_all_positions) - 0.5
-        kt_right = max(pos[0] for pos in kt_all_positions) + 0.5
-        kt_top = max(pos[1] for pos in kt_all_positions) + 0.35
-        kt_bottom = min(pos[1] for pos in kt_all_positions) - 0.35
-
-        # Left K^T bracket
-        kt_left_vertical = Line(
-            start=[kt_left, kt_top + overlap, 0],
-            end=[kt_left, kt_bottom - overlap, 0],
-            stroke_width=stroke_width,
-            color=RED
-        )
-        kt_left_top = Line(
-            start=[kt_left - overlap, kt_top, 0],
-            end=[kt_left + brace_width, kt_top, 0],
-            stroke_width=stroke_width,
-            color=RED
-        )
-        kt_left_bottom = Line(
-            start=[kt_left - overlap, kt_bottom, 0],
-            end=[kt_left + brace_width, kt_bottom, 0],
-            stroke_width=stroke_width,
-            color=RED
-        )
-
-        # Right K^T bracket
-        kt_right_vertical = Line(
-            start=[kt_right, kt_top + overlap, 0],
-            end=[kt_right, kt_bottom - overlap, 0],
-            stroke_width=stroke_width,
-            color=RED
-        )
-        kt_right_top = Line(
-            start=[kt_right - brace_width, kt_top, 0],
-            end=[kt_right + overlap, kt_top, 0],
-            stroke_width=stroke_width,
-            color=RED
-        )
-        kt_right_bottom = Line(
-            start=[kt_right - brace_width, kt_bottom, 0],
-            end=[kt_right + overlap, kt_bottom, 0],
-            stroke_width=stroke_width,
-            color=RED
-        )
-
-        kt_matrix_brackets = VGroup(
-            kt_left_vertical, kt_left_top, kt_left_bottom,
-            kt_right_vertical, kt_right_top, kt_right_bottom
-        )
-
-        # Create K^T column labels at exact existing positions
-        kt_col_labels = VGroup()
-        for i, label in enumerate(token_labels):
-            col_label = MathTex(r"(k_{" + label + r"})^\top", font_size=20, color=RED)
-            col_label.move_to(kt_label_positions[i])  # Exact position
-            kt_col_labels.add(col_label)
-
-        # Add matrix labels
-        q_matrix_label = MathTex(r"Q", font_size=32, color=BLUE)
-        q_matrix_label.move_to([(q_right + q_left) / 2, q_top + 0.4, 0])
-
-        kt_matrix_label = MathTex(r"K^\top", font_size=32, color=RED)
-        kt_matrix_label.move_to([(kt_right + kt_left) / 2, kt_top + 0.4, 0])
-
         # Group matrix components
-        q_matrix_complete = VGroup(q_matrix_numbers, q_matrix_brackets, q_row_labels)
-        kt_matrix_complete = VGroup(kt_matrix_numbers, kt_matrix_brackets, kt_col_labels)
+        q_matrix_complete = VGroup(q_matrix_body, q_row_labels)
+        kt_matrix_complete = VGroup(kt_matrix_body, kt_col_labels)
 
         # Cross fade: individual vectors out, complete matrices in
         self.play(
@@ -508,8 +433,8 @@ class SelfAttentionAnimation(Scene):
         # Store references for next steps
         self.q_matrix = q_matrix_complete
         self.kt_matrix = kt_matrix_complete
-        self.q_matrix_label = q_matrix_label
-        self.kt_matrix_label = kt_matrix_label
+        self.q_matrix_body, self.q_row_labels, self.q_matrix_label = q_matrix_body, q_row_labels, q_matrix_label
+        self.kt_matrix_body, self.kt_col_labels, self.kt_matrix_label = kt_matrix_body, kt_col_labels, kt_matrix_label
 
     def add_attention_matrix(self):
         """Add attention matrix positioned vertically aligned with Q and horizontally aligned with K^T"""
@@ -530,54 +455,7 @@ class SelfAttentionAnimation(Scene):
         att_top = q_top
         att_bottom = q_bottom
 
-        bracket_width = 0.3
-        stroke_width = 4
-        overlap = 0.02
-
-        # Left attention bracket
-        att_left_vertical = Line(
-            start=[att_left, att_top + overlap, 0],
-            end=[att_left, att_bottom - overlap, 0],
-            stroke_width=stroke_width,
-            color=WHITE
-        )
-        att_left_top = Line(
-            start=[att_left - overlap, att_top, 0],
-            end=[att_left + bracket_width, att_top, 0],
-            stroke_width=stroke_width,
-            color=WHITE
-        )
-        att_left_bottom = Line(
-            start=[att_left - overlap, att_bottom, 0],
-            end=[att_left + bracket_width, att_bottom, 0],
-            stroke_width=stroke_width,
-            color=WHITE
-        )
-
-        # Right attention bracket
-        att_right_vertical = Line(
-            start=[att_right, att_top + overlap, 0],
-            end=[att_right, att_bottom - overlap, 0],
-            stroke_width=stroke_width,
-            color=WHITE
-        )
-        att_right_top = Line(
-            start=[att_right - bracket_width, att_top, 0],
-            end=[att_right + overlap, att_top, 0],
-            stroke_width=stroke_width,
-            color=WHITE
-        )
-        att_right_bottom = Line(
-            start=[att_right - bracket_width, att_bottom, 0],
-            end=[att_right + overlap, att_bottom, 0],
-            stroke_width=stroke_width,
-            color=WHITE
-        )
-
-        att_matrix_brackets = VGroup(
-            att_left_vertical, att_left_top, att_left_bottom,
-            att_right_vertical, att_right_top, att_right_bottom
-        )
+        att_matrix_brackets = create_brackets(att_left, att_right, att_top, att_bottom, WHITE)
 
         # Create the "Attention Matrix" label in the center
         att_label = Tex(r"\text{Attention Scores}", font_size=30, color=WHITE)
@@ -588,4 +466,15 @@ class SelfAttentionAnimation(Scene):
         # Animate the attention matrix appearing
         self.play(Create(att_matrix_brackets), Write(att_label), run_time=2)
 
-        self.attention_matrix = attention_matrix
\ No newline at end of file
+        self.attention_matrix = attention_matrix
+
+        # The scores compute_attn starts from, inside these brackets: not shown here, only saved
+        # with the final state (see FINAL_STATE_NAMES)
+        columns = self.kt_matrix_body.cell_positions()[0, :, 0]
+        rows = self.q_matrix_body.cell_positions()[:, 0, 1]
+        self.attention_scores = create_attention_scores(
+            self.attention,
+            positions=[[[x, y, 0] for x in columns] for y in rows],
+            bounds=(att_left, att_right, att_top, att_bottom),
+            known_rows=self.attention.seq_len - 1,
+        )
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""Encode static holds (self.wait() with nothing moving) as two frames.
+
+manim already notices when a wait has no time-based updaters: it rasterizes
+a single frame and hands it to the segment encoder with repeat=N. The
+encoder then converts and encodes that same image N times, so a
+self.wait(3) at 60 fps still costs 180 colour conversions and 180 encoded
+frames.
+
+install() makes the encoder emit a variable-frame-rate hold instead: the
+frame is converted once and encoded at the first and last timestamp of the
+hold, and the timestamps in between are simply left out. Players keep
+showing the first frame until the next one is due, the segment still has
+the full duration, and manim's concat step copies the packets (and their
+timestamps) unchanged.
+
+Only MP4 movie output uses this; GIF output re-times frames while
+combining, so holds there keep every frame.
+"""
+from fractions import Fraction
+
+# Holds shorter than this are cheaper to encode as-is
+MIN_HOLD_FRAMES = 3
+
+_installed = False
+
+
+def supports_vfr_holds(encoder):
+    from manim import config
+
+    return encoder.spec.container_format == "mp4" and config.format != "gif"
+
+
+def install():
+    """Make every VideoSegmentEncoder in this process encode holds as two frames. Returns False if this manim lacks it."""
+    global _installed
+    if _installed:
+        return True
+
+    try:
+        import av
+        from manim.scene.video_segment_encoder import VideoSegmentEncoder
+    except ImportError:
+        return False
+
+    original_write_frame = VideoSegmentEncoder.write_frame
+
+    def write_frame(self, pixels, *, repeat=1):
+        if repeat < MIN_HOLD_FRAMES or not supports_vfr_holds(self):
+            return original_write_frame(self, pixels, repeat=repeat)
+
+        self._validate_frame(pixels, repeat)
+        time_base = Fraction(self.spec.frame_rate.denominator, self.spec.frame_rate.numerator)
+        try:
+            rgba = av.VideoFrame.from_ndarray(pixels, format="rgba")
+            # 1) first frame of the hold, 2) last frame, so the segment keeps its full length
+            for pts in (self._next_pts, self._next_pts + repeat - 1):
+                frame = rgba.reformat(format=self.spec.pixel_format)
+                frame.pts = pts
+                frame.time_base = time_base
+                for packet in self._stream.encode(frame):
+                    self._container.mux(packet)
+            self._next_pts += repeat
+        except BaseException as error:
+            raise self._operation_error("encode", error) from error
+
+    VideoSegmentEncoder.write_frame = write_frame
+    _installed = True
+    return True
@@ -0,0 +1,271 @@
+"""Persistent, cross-process cache of parsed Tex/SVG glyph geometry.
+
+manim already keeps compiled .svg files on disk (media/Tex), but every
+process still re-parses them with svgelements for each Tex/MathTex it
+builds. The matrix scenes build dozens of identical short strings ("0.2",
+"0.8", "q_{=}", ...), so every render worker spends most of its
+construction time re-parsing the same handful of SVGs.
+
+install() hooks SVGMobject.init_svg_mobject so the parsed glyph paths
+(points, styles and the id groups MathTex uses for get_part_by_tex) are
+stored once in a shared directory and read back by every worker. Entries
+are keyed by the SVG's content, which is determined by the tex string and
+template only: font_size is applied afterwards by scaling, so "0.2" at
+font_size 32 and at 36 share one entry.
+
+Writes are atomic (write to a temp file, then os.replace), readers treat
+anything unreadable as a miss, and the directory is trimmed back under
+`max_bytes` in least-recently-used order.
+"""
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Run eviction after this many bytes have been written by this process
+EVICTION_INTERVAL_BYTES = 8 * 1024 * 1024
+
+# Evict down to this fraction of max_bytes so we don't evict on every write
+EVICTION_LOW_WATER = 0.8
+
+
+class GlyphCache:
+    """On-disk store of parsed glyph geometry, one .npz file per SVG."""
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.memory = {}
+        self.hits = 0
+        self.misses = 0
+        self._written_since_eviction = 0
+
+    def path_for(self, key):
+        return self.cache_dir / key[:2] / f"{key}.npz"
+
+    def get(self, key):
+        """The cached entry for `key`, or None."""
+        entry = self.memory.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        path = self.path_for(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                entry = {name: data[name] for name in data.files}
+            # Bump the mtime: eviction drops the least recently used files
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            # Truncated or foreign file: drop it and rebuild
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+        self.memory[key] = entry
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        self.memory[key] = entry
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **entry)
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+        self._written_since_eviction += path.stat().st_size
+        if self._written_since_eviction >= EVICTION_INTERVAL_BYTES:
+            self._written_since_eviction = 0
+            self.evict()
+
+    def evict(self):
+        """Trim the cache below max_bytes, dropping least recently used entries first."""
+        lock_path = self.cache_dir / ".evict.lock"
+        with open(lock_path, "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return  # another worker is already evicting
+
+            files = []
+            total = 0
+            for path in self.cache_dir.glob("*/*.npz"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+            if total <= self.max_bytes:
+                return
+
+            files.sort()
+            target = self.max_bytes * EVICTION_LOW_WATER
+            for _, size, path in files:
+                if total <= target:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+
+def glyph_key(svg_mobject, renderer):
+    """Stable key for an SVGMobject's parsed geometry (Python's hash() is per-process)."""
+    with open(svg_mobject.get_file_path(), "rb") as f:
+        svg_digest = hashlib.sha256(f.read()).hexdigest()
+    seed = json.dumps(
+        [
+            type(svg_mobject).__name__,
+            svg_mobject.svg_default,
+            svg_mobject.path_string_config,
+            str(renderer),
+            svg_digest,
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(seed.encode("utf-8")).hexdigest()
+
+
+def _concat(arrays, width):
+    """Concatenate (n_i, width) arrays and return (values, offsets)."""
+    offsets = np.cumsum([0] + [len(a) for a in arrays])
+    values = np.concatenate(arrays) if arrays else np.zeros((0, width))
+    return values.reshape(-1, width), offsets
+
+
+def encode_glyphs(svg_mobject):
+    """Flatten the freshly parsed submobjects of `svg_mobject` into arrays."""
+    leaves = list(svg_mobject.submobjects)
+    leaf_index = {id(leaf): i for i, leaf in enumerate(leaves)}
+
+    points, point_offsets = _concat([leaf.points for leaf in leaves], 3)
+    fill, fill_offsets = _concat([leaf.fill_rgbas for leaf in leaves], 4)
+    stroke, stroke_offsets = _concat([leaf.stroke_rgbas for leaf in leaves], 4)
+    background, background_offsets = _concat([leaf.background_stroke_rgbas for leaf in leaves], 4)
+    widths = np.array(
+        [[leaf.stroke_width, leaf.background_stroke_width] for leaf in leaves],
+        dtype=float,
+    ).reshape(-1, 2)
+
+    # id groups hold the same leaf objects; store them as leaf indices
+    group_names = list(svg_mobject.id_to_vgroup_dict)
+    members = [
+        [leaf_index[id(mob)] for mob in svg_mobject.id_to_vgroup_dict[name].submobjects if id(mob) in leaf_index]
+        for name in group_names
+    ]
+    group_offsets = np.cumsum([0] + [len(m) for m in members])
+    group_members = np.array([i for m in members for i in m], dtype=np.int64)
+
+    return {
+        "points": points,
+        "point_offsets": point_offsets,
+        "fill": fill,
+        "fill_offsets": fill_offsets,
+        "stroke": stroke,
+        "stroke_offsets": stroke_offsets,
+        "background": background,
+        "background_offsets": background_offsets,
+        "widths": widths,
+        "group_names": np.array(group_names, dtype=str),
+        "group_offsets": group_offsets,
+        "group_members": group_members,
+    }
+
+
+def decode_glyphs(entry):
+    """Rebuild (leaves, id_to_vgroup_dict) from an encoded entry."""
+    from manim import VGroup, VMobject
+
+    def rows(name, i, offsets_name=None):
+        offsets = entry[offsets_name or f"{name}_offsets"]
+        return entry[name][offsets[i]:offsets[i + 1]].copy()
+
+    leaves = []
+    for i, (stroke_width, background_width) in enumerate(entry["widths"]):
+        leaf = VMobject()
+        leaf.points = rows("points", i, "point_offsets")
+        leaf.fill_rgbas = rows("fill", i)
+        leaf.stroke_rgbas = rows("stroke", i)
+        leaf.background_stroke_rgbas = rows("background", i)
+        leaf.stroke_width = float(stroke_width)
+        leaf.background_stroke_width = float(background_width)
+        leaf.fill_opacity = float(leaf.fill_rgbas[0, 3]) if len(leaf.fill_rgbas) else 0.0
+        leaf.stroke_opacity = float(leaf.stroke_rgbas[0, 3]) if len(leaf.stroke_rgbas) else 0.0
+        leaves.append(leaf)
+
+    groups = {}
+    offsets = entry["group_offsets"]
+    for i, name in enumerate(entry["group_names"]):
+        members = entry["group_members"][offsets[i]:offsets[i + 1]]
+        groups[str(name)] = VGroup(*[leaves[j] for j in members])
+    return leaves, groups
+
+
+_cache = None
+_original_init_svg_mobject = None
+
+
+def install(cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Route SVGMobject parsing through the shared glyph cache.
+    Call before any Tex is built; calling again only changes the cache directory.
+    """
+    global _cache, _original_init_svg_mobject
+    from manim import config
+    from manim.constants import RendererType
+    from manim.mobject.svg.svg_mobject import SVGMobject
+
+    if cache_dir is None:
+        cache_dir = os.environ.get("GLYPH_CACHE_DIR") or Path(config.media_dir) / "glyph_cache"
+    _cache = GlyphCache(cache_dir, max_bytes=max_bytes)
+    if _original_init_svg_mobject is not None:
+        return _cache
+
+    _original_init_svg_mobject = SVGMobject.init_svg_mobject
+
+    def init_svg_mobject(self, use_svg_cache):
+        # The OpenGL mobjects store style differently; leave them alone
+        if not use_svg_cache or config.renderer != RendererType.CAIRO:
+            return _original_init_svg_mobject(self, use_svg_cache)
+
+        key = glyph_key(self, config.renderer)
+        entry = _cache.get(key)
+        if entry is None:
+            _original_init_svg_mobject(self, use_svg_cache)
+            _cache.put(key, encode_glyphs(self))
+            return self
+
+        leaves, groups = decode_glyphs(entry)
+        self.add(*leaves)
+        self.id_to_vgroup_dict = groups
+        return self
+
+    SVGMobject.init_svg_mobject = init_svg_mobject
+    return _cache
+
+
+def uninstall():
+    global _cache, _original_init_svg_mobject
+    if _original_init_svg_mobject is None:
+        return
+    from manim.mobject.svg.svg_mobject import SVGMobject
+
+    SVGMobject.init_svg_mobject = _original_init_svg_mobject
+    _original_init_svg_mobject = None
+    _cache = None
@@ -0,0 +1,267 @@
+"""Compile every Tex/MathTex string the scenes need in one LaTeX run.
+
+Normally each new Tex/MathTex spawns its own latex + dvisvgm pair, so a cold
+render of compute_attn or mlpvsclt spends minutes starting subprocesses.
+This pre-pass:
+
+  1. dry-runs each scene (animations skipped, nothing written) with
+     tex_to_svg_file swapped for a recorder that notes every .tex file the
+     scene asks for and hands back a placeholder SVG,
+  2. groups the missing strings by preamble/compiler and typesets each group
+     as one multi-page standalone document (one page per string),
+  3. converts all pages with a single dvisvgm call and moves page i to the
+     exact media/Tex/<hash>.svg path manim looks up for string i.
+
+Afterwards the real render finds every SVG already in place. Anything that
+cannot be batched (a custom non-standalone template, a compile error in the
+batch) is left for manim to compile on demand as usual.
+
+Usage:
+    python tex_precompile.py                  # every scene
+    python tex_precompile.py compute_attn mlpvsclt:MLPvsCLTComparison
+    python render_all.py --precompile-tex     # as part of a batch render
+"""
+import argparse
+import hashlib
+import importlib
+import multiprocessing
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from render_all import QUALITIES, REPO_DIR, discover_scenes, scene_config, select_scenes
+
+BEGIN_DOCUMENT = r"\begin{document}"
+END_DOCUMENT = r"\end{document}"
+
+# Environment that standalone's `multi` option turns into one page each
+PAGE_ENVIRONMENT = "manimpage"
+
+STANDALONE_CLASS = re.compile(r"\\documentclass(\[(?P<options>[^\]]*)\])?\{standalone\}")
+
+# The group markers MathTex injects so get_part_by_tex can find substrings
+GROUP_SPECIAL = re.compile(r"dvisvgm:raw <g id='(?P<id>[^']+)'>|dvisvgm:raw </g>")
+
+PLACEHOLDER_PATH = '<path d="M0 0h10v10h-10z"/>'
+
+
+def placeholder_svg(texcode, path):
+    """
+    Write a stand-in SVG that has the same id groups as the real one would,
+    so MathTex substring lookups (get_part_by_tex etc.) work during the dry run.
+    """
+    parts = ['<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 10 10">', PLACEHOLDER_PATH]
+    for match in GROUP_SPECIAL.finditer(texcode):
+        if match["id"] is None:
+            parts.append("</g>")
+        else:
+            parts.append(f'<g id="{match["id"]}">{PLACEHOLDER_PATH}')
+    parts.append("</svg>")
+    path.write_text("".join(parts), encoding="utf-8")
+    return path
+
+
+def record_tex_files(module_name, scene_name, options):
+    """
+    Dry-run one scene and return the .tex files it needs that have no SVG yet,
+    as [{"tex_file", "compiler", "output_format"}, ...]. Runs in a worker.
+    """
+    from manim import config, tempconfig
+    from manim.mobject.text import tex_mobject
+    from manim.utils.tex_file_writing import generate_tex_file
+
+    placeholder_dir = Path(tempfile.mkdtemp(prefix="tex_precompile_"))
+    records = {}
+
+    def recording_tex_to_svg_file(expression, environment=None, tex_template=None):
+        tex_template = tex_template or config["tex_template"]
+        tex_file = generate_tex_file(expression, environment, tex_template)
+        svg_file = tex_file.with_suffix(".svg")
+        if svg_file.exists():
+            return svg_file
+        records[str(tex_file)] = {
+            "tex_file": str(tex_file),
+            "compiler": tex_template.tex_compiler,
+            "output_format": tex_template.output_format,
+        }
+        return placeholder_svg(tex_file.read_text(encoding="utf-8"), placeholder_dir / svg_file.name)
+
+    tex_mobject.tex_to_svg_file = recording_tex_to_svg_file
+    if str(REPO_DIR) not in sys.path:
+        sys.path.insert(0, str(REPO_DIR))
+    overrides = dict(scene_config(module_name, options), dry_run=True, write_to_movie=False)
+    with tempconfig(overrides):
+        module = importlib.import_module(module_name)
+        getattr(module, scene_name)(skip_animations=True).render()
+    return list(records.values())
+
+
+def collect_tex_files(scenes, options, workers=None):
+    """Dry-run `scenes` on a process pool; returns (records, failures)."""
+    workers = workers or os.cpu_count() or 1
+    records = {}
+    failures = []
+    with ProcessPoolExecutor(
+        max_workers=max(min(workers, len(scenes)), 1),
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=1,
+    ) as pool:
+        futures = {
+            pool.submit(record_tex_files, module_name, scene_name, options): (module_name, scene_name)
+            for module_name, scene_name in scenes
+        }
+        for future in as_completed(futures):
+            module_name, scene_name = futures[future]
+            try:
+                for record in future.result():
+                    records[record["tex_file"]] = record
+            except Exception:
+                # The real render will compile whatever this scene needs on demand
+                failures.append((f"{module_name}:{scene_name}", traceback.format_exc()))
+    return list(records.values()), failures
+
+
+def split_texcode(texcode):
+    """(head, body) of a full template document, or None if it has no document env."""
+    begin = texcode.find(BEGIN_DOCUMENT)
+    end = texcode.rfind(END_DOCUMENT)
+    if begin < 0 or end < begin:
+        return None
+    return texcode[:begin], texcode[begin + len(BEGIN_DOCUMENT):end]
+
+
+def multi_page_head(head):
+    """`head` with its standalone class switched to one page per PAGE_ENVIRONMENT, or None."""
+    match = STANDALONE_CLASS.search(head)
+    if match is None:
+        return None
+    options = [o for o in (match["options"] or "").split(",") if o.strip()]
+    options.append(f"multi={PAGE_ENVIRONMENT}")
+    documentclass = rf"\documentclass[{','.join(options)}]{{standalone}}"
+    return head[:match.start()] + documentclass + head[match.end():]
+
+
+def group_records(records):
+    """
+    Group records that can share one document: same preamble, compiler and
+    output format. Returns ({group_key: (head, [(record, body), ...])}, leftovers).
+    """
+    groups = {}
+    leftovers = []
+    for record in sorted(records, key=lambda r: r["tex_file"]):
+        split = split_texcode(Path(record["tex_file"]).read_text(encoding="utf-8"))
+        head = split and multi_page_head(split[0])
+        if head is None:
+            leftovers.append(record)
+            continue
+        compiler = record["compiler"]
+        key = (head, compiler if isinstance(compiler, str) else tuple(compiler), record["output_format"])
+        groups.setdefault(key, (head, []))[1].append((record, split[1]))
+    return groups, leftovers
+
+
+def convert_pages(output_file, output_format, page_count):
+    """Convert every page of a compiled batch with one dvisvgm call; returns page paths in order."""
+    pattern = f"{output_file.stem}-%p.svg"
+    command = [
+        "dvisvgm",
+        *(["--pdf"] if output_format == ".pdf" else []),
+        "--page=1-",
+        "--no-fonts",
+        "--verbosity=0",
+        f"--output={(output_file.parent / pattern).as_posix()}",
+        output_file.as_posix(),
+    ]
+    subprocess.run(command, stdout=subprocess.DEVNULL, check=False)
+
+    # dvisvgm may zero-pad %p, so match on the parsed page number
+    pages = {}
+    for path in output_file.parent.glob(f"{output_file.stem}-*.svg"):
+        number = path.stem.rsplit("-", 1)[1]
+        if number.isdigit():
+            pages[int(number)] = path
+    if sorted(pages) != list(range(1, page_count + 1)):
+        for path in pages.values():
+            path.unlink(missing_ok=True)
+        raise ValueError(f"dvisvgm produced {len(pages)} pages for {page_count} strings")
+    return [pages[i] for i in range(1, page_count + 1)]
+
+
+def compile_group(head, entries, compiler, output_format):
+    """Typeset one group as a multi-page document and place each page as its string's SVG."""
+    from manim import config
+    from manim.utils.tex_file_writing import compile_tex
+
+    pages = [f"\\begin{{{PAGE_ENVIRONMENT}}}{body}\\end{{{PAGE_ENVIRONMENT}}}" for _, body in entries]
+    texcode = "\n".join([head + BEGIN_DOCUMENT, *pages, END_DOCUMENT, ""])
+    digest = hashlib.sha256(texcode.encode("utf-8")).hexdigest()[:16]
+    tex_dir = config.get_dir("tex_dir")
+    batch_file = tex_dir / f"batch_{digest}.tex"
+    batch_file.write_text(texcode, encoding="utf-8")
+
+    output_file = compile_tex(batch_file, compiler, output_format)
+    svg_files = convert_pages(output_file, output_format, len(entries))
+    for (record, _), svg_file in zip(entries, svg_files):
+        os.replace(svg_file, Path(record["tex_file"]).with_suffix(".svg"))
+
+    if not config["no_latex_cleanup"]:
+        for path in tex_dir.glob(f"batch_{digest}.*"):
+            path.unlink(missing_ok=True)
+
+
+def compile_records(records, media_dir):
+    """Batch-compile `records`; returns the number of strings whose SVG is now in place."""
+    from manim import tempconfig
+
+    compiled = 0
+    with tempconfig({"media_dir": media_dir}):
+        groups, leftovers = group_records(records)
+        for (_, compiler, output_format), (head, entries) in groups.items():
+            compiler = list(compiler) if isinstance(compiler, tuple) else compiler
+            try:
+                compile_group(head, entries, compiler, output_format)
+                compiled += len(entries)
+            except Exception as error:
+                # Typically one bad string in the batch; let manim compile them one by one
+                print(f"Batch of {len(entries)} Tex strings failed ({error}); "
+                      f"they will be compiled individually.", file=sys.stderr)
+        if leftovers:
+            print(f"{len(leftovers)} Tex strings use a non-standalone template "
+                  f"and will be compiled individually.", file=sys.stderr)
+    return compiled
+
+
+def precompile(scenes, options, workers=None):
+    """Dry-run `scenes`, then batch-compile every Tex string they are missing."""
+    records, failures = collect_tex_files(scenes, options, workers=workers)
+    for scene, error in failures:
+        print(f"Dry run of {scene} failed; its Tex will compile on demand.\n{error}", file=sys.stderr)
+    compiled = compile_records(records, options["media_dir"]) if records else 0
+    print(f"Pre-compiled {compiled} of {len(records)} missing Tex strings "
+          f"from {len(scenes)} scenes.", flush=True)
+    return compiled
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenes", nargs="*", help='"module", "Scene" or "module:Scene" (default: all)')
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITIES), default="l")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="dry-run worker processes (default: CPU count)")
+    parser.add_argument("--media-dir", default=str(REPO_DIR / "media"))
+    args = parser.parse_args(argv)
+
+    scenes = select_scenes(discover_scenes(), args.scenes)
+    if not scenes:
+        print("No scenes matched.", file=sys.stderr)
+        return 1
+    precompile(scenes, {"quality": args.quality, "media_dir": args.media_dir}, workers=args.jobs)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,17 @@
 from manim import *
 import numpy as np
 
+from attention_engine import ADDITION_PROMPT, Attention
+from bracket_matrix import BracketMatrix
+from heatmap_matrix import HeatmapMatrix, MorphHeatmap
+from scene_params import scene_params
+from tiny_transformer import prompt_attention
+
 class SoftmaxTransformation(Scene):
     def construct(self):
+        # The same prompt (and model head) as the Q K^T scenes before this one
+        self.attention = prompt_attention(ADDITION_PROMPT.tokens, fallback=ADDITION_PROMPT)
+
         # Create the original attention matrix more centered
         attention_matrix = self.create_attention_matrix()
         attention_matrix.move_to(LEFT * 4.0)  # Position left matrix 4.0 units left of origin
@@ -39,21 +48,8 @@ class SoftmaxTransformation(Scene):
         )
         self.wait(1)
         
-        # Calculate softmax values
-        attention_values = [
-            [0.83, 0.32, 0.71, 0.42],
-            [0.36, 0.85, 0.45, 0.69],
-            [0.66, 0.58, 0.87, 0.92],
-            [0.38, 0.42, 0.70, 0.70]
-        ]
-        
-        # Apply softmax to each row
-        softmax_values = []
-        for row in attention_values:
-            exp_row = [np.exp(val) for val in row]
-            sum_exp = sum(exp_row)
-            softmax_row = [exp_val / sum_exp for exp_val in exp_row]
-            softmax_values.append(softmax_row)
+        # Row-softmax of the scaled scores, as the formula says
+        softmax_values = self.attention.weights
         
         # Create softmaxed matrix more centered
         softmax_matrix = self.create_softmax_matrix(softmax_values)
@@ -68,124 +64,27 @@ class SoftmaxTransformation(Scene):
         self.wait(1)
         
         # Optional: Highlight the transformation by showing one row calculation
-        self.animate_row_transformation(attention_matrix, softmax_matrix, row_index=3)
+        self.animate_row_transformation(attention_matrix, softmax_matrix, row_index=self.attention.seq_len - 1)
         self.wait(2)
 
     def create_attention_matrix(self):
-        """Create the original attention matrix with white brackets and values."""
-        # Hard-coded attention values from the image
-        attention_values = [
-            ["0.83", "0.32", "0.71", "0.42"],
-            ["0.36", "0.85", "0.45", "0.69"],
-            ["0.66", "0.58", "0.87", "0.92"],
-            ["0.38", "0.42", "0.70", "0.70"]
-        ]
-        
-        # Create matrix numbers
-        matrix_numbers = VGroup()
-        positions = []
-        
-        for i, row in enumerate(attention_values):
-            for j, val in enumerate(row):
-                entry = Tex(val, font_size=36, color=WHITE)
-                pos = RIGHT * j * 0.9 + DOWN * i * 0.8
-                entry.move_to(pos)
-                matrix_numbers.add(entry)
-                positions.append(pos)
-        
-        # Calculate bracket dimensions
-        mat_left   = min(p[0] for p in positions) - 0.5
-        mat_right  = max(p[0] for p in positions) + 0.5
-        mat_top    = max(p[1] for p in positions) + 0.4
-        mat_bottom = min(p[1] for p in positions) - 0.4
-        
-        # Create brackets
-        brackets = self.create_brackets(mat_left, mat_right, mat_top, mat_bottom, WHITE)
-        
-        return VGroup(matrix_numbers, brackets)
+        """Create the original attention matrix (the raw QK^T scores) with white brackets and values."""
+        return BracketMatrix(
+            self.attention.scores, h_spacing=0.9, v_spacing=0.8, font_size=36, color=WHITE, entry_format="{:.2f}"
+        )
 
     def create_softmax_matrix(self, values):
         """Create the softmax matrix with white brackets and values (2 decimal places)."""
-        # Create matrix numbers
-        matrix_numbers = VGroup()
-        positions = []
-        
-        for i, row in enumerate(values):
-            for j, val in enumerate(row):
-                # Show 2 decimal places for softmax values
-                entry = Tex(f"{val:.2f}", font_size=36, color=WHITE)  # Changed to WHITE and .2f
-                pos = RIGHT * j * 0.9 + DOWN * i * 0.8
-                entry.move_to(pos)
-                matrix_numbers.add(entry)
-                positions.append(pos)
-        
-        # Calculate bracket dimensions
-        mat_left   = min(p[0] for p in positions) - 0.5
-        mat_right  = max(p[0] for p in positions) + 0.5
-        mat_top    = max(p[1] for p in positions) + 0.4
-        mat_bottom = min(p[1] for p in positions) - 0.4
-        
-        # Create brackets
-        brackets = self.create_brackets(mat_left, mat_right, mat_top, mat_bottom, WHITE)  # Changed to WHITE
-        
-        return VGroup(matrix_numbers, brackets)
-
-    def create_brackets(self, left, right, top, bottom, color):
-        """Create matrix brackets with the specified dimensions and color."""
-        bracket_width = 0.3
-        stroke_width = 4
-        overlap = 0.02
-        
-        # Left bracket
-        left_vertical = Line(
-            start=[left, top + overlap, 0],
-            end=[left, bottom - overlap, 0],
-            stroke_width=stroke_width,
-            color=color
-        )
-        left_top = Line(
-            start=[left - overlap, top, 0],
-            end=[left + bracket_width, top, 0],
-            stroke_width=stroke_width,
-            color=color
-        )
-        left_bottom = Line(
-            start=[left - overlap, bottom, 0],
-            end=[left + bracket_width, bottom, 0],
-            stroke_width=stroke_width,
-            color=color
-        )
-        
-        # Right bracket
-        right_vertical = Line(
-            start=[right, top + overlap, 0],
-            end=[right, bottom - overlap, 0],
-            stroke_width=stroke_width,
-            color=color
-        )
-        right_top = Line(
-            start=[right - bracket_width, top, 0],
-            end=[right + overlap, top, 0],
-            stroke_width=stroke_width,
-            color=color
-        )
-        right_bottom = Line(
-            start=[right - bracket_width, bottom, 0],
-            end=[right + overlap, bottom, 0],
-            stroke_width=stroke_width,
-            color=color
-        )
-        
-        return VGroup(
-            left_vertical, left_top, left_bottom,
-            right_vertical, right_top, right_bottom
+        # Show 2 decimal places for softmax values
+        return BracketMatrix(
+            values, h_spacing=0.9, v_spacing=0.8, font_size=36, color=WHITE, entry_format="{:.2f}"
         )
 
     def animate_row_transformation(self, original_matrix, softmax_matrix, row_index):
         """Animate the transformation of a specific row to show the softmax calculation."""
         # Create highlight rectangles for the specified row
-        original_highlight = self.create_row_highlight(original_matrix, row_index, YELLOW)
-        softmax_highlight = self.create_row_highlight(softmax_matrix, row_index, YELLOW)
+        original_highlight = original_matrix.highlight(rows=row_index, color=YELLOW)
+        softmax_highlight = softmax_matrix.highlight(rows=row_index, color=YELLOW)
         
         # Fade in highlights
         self.play(
@@ -201,28 +100,60 @@ class SoftmaxTransformation(Scene):
             FadeOut(softmax_highlight)
         )
 
-    def create_row_highlight(self, matrix, row_index, color):
-        """Create a highlight rectangle for a specific row in the matrix."""
-        numbers = matrix[0]  # The VGroup containing all numbers
-        
-        # Get the numbers in the specified row (4 numbers per row)
-        row_start = row_index * 4
-        row_numbers = [numbers[row_start + i] for i in range(4)]
-        
-        # Calculate highlight dimensions
-        left   = min(n.get_left()[0] for n in row_numbers) - 0.2
-        right  = max(n.get_right()[0] for n in row_numbers) + 0.2
-        top    = max(n.get_top()[1] for n in row_numbers) + 0.15
-        bottom = min(n.get_bottom()[1] for n in row_numbers) - 0.15
-        
-        # Create highlight rectangle
-        rect = Rectangle(
-            width=right - left,
-            height=top - bottom,
-            fill_color=color,
-            fill_opacity=0.3,
-            stroke_width=0
+
+def large_attention(seq_len=64, d_model=32, d_k=16, rng=None):
+    """A realistic-size attention pattern: random embeddings plus a smooth positional term."""
+    rng = np.random.default_rng(0) if rng is None else rng
+    positions = np.arange(seq_len)[:, None] / seq_len
+    x = 0.5 * rng.standard_normal((seq_len, d_model)) + np.sin(np.pi * positions * np.arange(1, d_model + 1))
+    # Keys close to the queries, so tokens attend to themselves and their neighbours
+    w_q = rng.standard_normal((d_model, d_k)) / np.sqrt(d_model)
+    w_k = w_q + 0.3 * rng.standard_normal((d_model, d_k)) / np.sqrt(d_model)
+    w_v = rng.standard_normal((d_model, d_k)) / np.sqrt(d_model)
+    return Attention.from_embeddings(x, w_q, w_k, w_v)
+
+
+class LargeSoftmaxTransformation(Scene):
+    """SoftmaxTransformation for a 64×64 attention pattern, drawn as heatmaps instead of Tex cells."""
+
+    def construct(self):
+        attention = large_attention(rng=scene_params(self).rng("attention"))
+        
+        # Raw scores as one 64×64 image on the left
+        scores_map = HeatmapMatrix(attention.scores, cell_size=0.075)
+        scores_map.move_to(LEFT * 3.6)
+        before_text = MathTex(r"\text{Before Softmax}", font_size=42, color=WHITE)
+        before_text.next_to(scores_map, UP, buff=0.4)
+        self.play(FadeIn(scores_map), FadeIn(before_text))
+        self.wait(1)
+        
+        # Shorter arrow than the 4×4 scene: the heatmaps are wider
+        arrow = Arrow(start=LEFT * 1.0, end=RIGHT * 1.0, color=WHITE, stroke_width=4)
+        softmax_text = MathTex(
+            r"\text{softmax}\left(\frac{QK^T}{\sqrt{d_k}}\right)",
+            font_size=30,
+            color=WHITE
         )
-        rect.move_to([(left + right)/2, (top + bottom)/2, 0])
+        softmax_text.next_to(arrow, UP, buff=0.3)
+        self.play(Create(arrow), FadeIn(softmax_text))
+        self.wait(1)
+        
+        # A copy on the right whose pixels blend into the softmax weights
+        weights_map = scores_map.copy().move_to(RIGHT * 3.6)
+        after_text = MathTex(r"\text{After Softmax}", font_size=42, color=WHITE)
+        after_text.next_to(weights_map, UP, buff=0.4)
+        self.play(FadeIn(weights_map), FadeIn(after_text))
+        self.play(MorphHeatmap(weights_map, attention.weights), run_time=2.5)
+        self.wait(1)
+        
+        # Numbers only for three cells of the last row: first token, middle, itself
+        row = attention.seq_len - 1
+        cells = [(row, 0), (row, row // 2), (row, row)]
+        highlights = [scores_map.highlight(rows=row), weights_map.highlight(rows=row)]
+        self.play(*[Create(highlight) for highlight in highlights])
+        before_labels = scores_map.labels(cells)
+        after_labels = weights_map.labels(cells)
+        self.play(FadeIn(before_labels), FadeIn(after_labels))
+        self.wait(2)
         
-        return rect
\ No newline at end of file
+        self.play(*[FadeOut(mob) for mob in [*highlights, before_labels, after_labels]])
@@ -0,0 +1,218 @@
+"""Keyword index of a corpus, built in one pass over the text.
+
+    index = KeywordIndex(["brown", "fox", "dog"]).index(documents)
+    index.counts                       # total occurrences per keyword, in keyword order
+    index.term_frequencies             # CSRMatrix, documents x keywords
+    index.document_matches(0)          # [(start, end, keyword id), ...] in document 0
+    index.occurrences("fox")           # (document ids, start offsets) of every "fox"
+
+All keywords are matched at once with an Aho-Corasick automaton, so every
+document is read exactly once whatever the vocabulary size, instead of one
+str.count / str.find scan per (document, keyword) pair. Matching is
+case-insensitive substring matching by default (str.casefold, with offsets
+always into the original text), and counts like `doc.casefold().count(keyword)`:
+matches of one keyword never overlap, the leftmost wins, while matches of
+different keywords may overlap. A match never covers only part of a
+character's folding ('s' does not match inside 'ß'). Pass whole_words=True
+to only count matches bounded by non-word characters.
+
+Postings (document, offset) are kept in CSR layout per keyword and the
+term-frequency vectors in CSR layout per document, so thousands of
+documents and a real vocabulary cost a few flat integer arrays.
+"""
+from collections import deque
+
+import numpy as np
+
+
+class CSRMatrix:
+    """Minimal compressed sparse row matrix: row i is data[indptr[i]:indptr[i + 1]] at columns indices[...]."""
+
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data)
+        self.shape = tuple(shape)
+
+    @classmethod
+    def from_coo(cls, rows, cols, values, shape):
+        """Sum duplicate (row, col) entries and sort them into CSR order."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        keys, inverse = np.unique(rows * shape[1] + cols, return_inverse=True)
+        data = np.bincount(inverse, weights=values, minlength=len(keys))
+        indptr = np.searchsorted(keys // shape[1], np.arange(shape[0] + 1))
+        return cls(indptr, keys % shape[1], data, shape)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def row(self, i):
+        """(column indices, values) of the non-zero entries of row i."""
+        start, stop = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:stop], self.data[start:stop]
+
+    def column_sums(self):
+        return np.bincount(self.indices, weights=self.data, minlength=self.shape[1])
+
+    def toarray(self):
+        dense = np.zeros(self.shape, dtype=self.data.dtype)
+        rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        dense[rows, self.indices] = self.data
+        return dense
+
+
+class KeywordIndex:
+    """Aho-Corasick automaton over `keywords`."""
+
+    def __init__(self, keywords, case_sensitive=False, whole_words=False):
+        self.keywords = list(keywords)
+        self.case_sensitive = case_sensitive
+        self.whole_words = whole_words
+        self.keyword_ids = {keyword: i for i, keyword in enumerate(self.keywords)}
+        normalized = [self._normalize(keyword) for keyword in self.keywords]
+        if len(set(normalized)) != len(normalized):
+            raise ValueError("Keywords must be distinct" + ("" if case_sensitive else " (ignoring case)"))
+
+        # 1) Trie of the keywords: goto[state][char] -> state, output[state] = keyword ids ending there
+        self.goto = [{}]
+        self.output = [[]]
+        for keyword_id, keyword in enumerate(normalized):
+            if not keyword:
+                raise ValueError("Keywords must be non-empty")
+            state = 0
+            for char in keyword:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].append(keyword_id)
+
+        # 2) Failure links, breadth first: the longest proper suffix that is also a trie path
+        #    (depth-1 states fail to the root, which is how they start)
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+        # Lengths in normalized characters, which is what the automaton walks
+        self.lengths = [len(keyword) for keyword in normalized]
+
+    def _normalize(self, text):
+        return text if self.case_sensitive else text.casefold()
+
+    def _normalized_chars(self, text):
+        """(offset in `text`, normalized char) pairs; casefolding may turn one char into several."""
+        if self.case_sensitive:
+            return list(enumerate(text))
+        return [(offset, folded) for offset, char in enumerate(text) for folded in char.casefold()]
+
+    def find_all(self, text):
+        """
+        (start, end, keyword id) of every match in `text`, as offsets into `text`, in the order
+        their ends are reached. Matches of the same keyword do not overlap.
+        """
+        matches = []
+        state = 0
+        goto, fail, output, lengths = self.goto, self.fail, self.output, self.lengths
+        chars = self._normalized_chars(text)
+        # Normalized position after the last accepted match of each keyword
+        next_free = [0] * len(self.keywords)
+        for position, (offset, char) in enumerate(chars, start=1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword_id in output[state]:
+                first = position - lengths[keyword_id]
+                if first < next_free[keyword_id]:
+                    continue
+                start, end = chars[first][0], offset + 1
+                # A match must cover whole characters of `text`, not part of one's folding
+                if first > 0 and chars[first - 1][0] == start:
+                    continue
+                if position < len(chars) and chars[position][0] == offset:
+                    continue
+                if not self.whole_words or self._is_word_bounded(text, start, end):
+                    matches.append((start, end, keyword_id))
+                    next_free[keyword_id] = position
+        return matches
+
+    @staticmethod
+    def _is_word_bounded(text, start, end):
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        return not (before.isalnum() or before == "_") and not (after.isalnum() or after == "_")
+
+    def index(self, documents):
+        """CorpusIndex of `documents` (any iterable of strings), each scanned once."""
+        doc_ids, starts, ends, keyword_ids = [], [], [], []
+        n_documents = 0
+        for doc_id, document in enumerate(documents):
+            for start, end, keyword_id in self.find_all(document):
+                doc_ids.append(doc_id)
+                starts.append(start)
+                ends.append(end)
+                keyword_ids.append(keyword_id)
+            n_documents += 1
+        return CorpusIndex(
+            self,
+            np.array(doc_ids, dtype=np.int64),
+            np.array(starts, dtype=np.int64),
+            np.array(ends, dtype=np.int64),
+            np.array(keyword_ids, dtype=np.int64),
+            n_documents,
+        )
+
+
+class CorpusIndex:
+    """Every keyword match in a corpus, as flat arrays plus CSR views by document and by keyword."""
+
+    def __init__(self, keyword_index, doc_ids, starts, ends, keyword_ids, n_documents):
+        self.keywords = keyword_index.keywords
+        self.keyword_ids = keyword_index.keyword_ids
+        self.n_documents = n_documents
+        n_keywords = len(self.keywords)
+
+        # Matches sorted by (document, start): document_matches() is a slice
+        order = np.lexsort((keyword_ids, starts, doc_ids))
+        self.doc_ids = doc_ids[order]
+        self.starts = starts[order]
+        self.ends = ends[order]
+        self.match_keywords = keyword_ids[order]
+        self.doc_ptr = np.searchsorted(self.doc_ids, np.arange(n_documents + 1))
+
+        # Inverted index: postings of keyword k are posting_docs/posting_starts[posting_ptr[k]:posting_ptr[k + 1]]
+        by_keyword = np.argsort(self.match_keywords, kind="stable")
+        self.posting_docs = self.doc_ids[by_keyword]
+        self.posting_starts = self.starts[by_keyword]
+        self.posting_ptr = np.searchsorted(self.match_keywords[by_keyword], np.arange(n_keywords + 1))
+
+        self.term_frequencies = CSRMatrix.from_coo(
+            self.doc_ids, self.match_keywords, np.ones(len(self.doc_ids)), (n_documents, n_keywords)
+        )
+        self.counts = np.diff(self.posting_ptr)
+
+    def count(self, keyword):
+        return int(self.counts[self.keyword_ids[keyword]])
+
+    def occurrences(self, keyword):
+        """(document ids, start offsets) of every match of `keyword`."""
+        keyword_id = self.keyword_ids[keyword]
+        start, stop = self.posting_ptr[keyword_id], self.posting_ptr[keyword_id + 1]
+        return self.posting_docs[start:stop], self.posting_starts[start:stop]
+
+    def document_matches(self, doc_id):
+        """[(start, end, keyword id), ...] of the matches in document `doc_id`, by position."""
+        start, stop = self.doc_ptr[doc_id], self.doc_ptr[doc_id + 1]
+        return list(zip(
+            self.starts[start:stop].tolist(), self.ends[start:stop].tolist(), self.match_keywords[start:stop].tolist()
+        ))
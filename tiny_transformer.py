@@ -0,0 +1,394 @@
+"""A tiny NumPy transformer trained on every two-digit addition, so the scenes can show real numbers.
+
+    python tiny_transformer.py                       # train on all 10,000 'a + b =' and save a checkpoint
+    model = load_model()                             # None if there is no checkpoint yet
+    trace = model.trace("26 + 55 =")                 # or ["26", "+", "55", "="]
+    trace.prediction                                 # "81"
+    trace.attention(layer=0, head=0)                 # attention_engine.Attention: q, k, v, scores, weights
+    trace.residuals[0], trace.residuals[-1]          # residual stream at the input and at the output
+
+Tokens are whole numbers, as the video draws them: "0" ... "198", "+" and
+"=", so '26 + 55 =' is four tokens and the answer is the single token the
+model predicts after "=". The model is a causal decoder: token embedding
+plus sinusoidal positional encoding, N_LAYERS blocks of multi-head
+attention and a ReLU MLP, each added to the residual stream, then a linear
+unembedding of the last position. Heads are D_HEAD = 3 wide, so a head's
+Q and K fit on screen the way the toy example's do.
+
+Everything is batched: the forward pass of a minibatch is a handful of
+matrix products over (batch, heads, seq, dim) arrays, the backward pass is written
+out by hand beside it, and Adam updates every parameter in place. The
+dataset is tiny (10,000 prompts of 4 tokens), so training to 100% accuracy
+takes about three minutes on a single CPU core.
+
+Checkpoints are .npz files holding the parameters and the config
+(data/tiny_transformer.npz, or $TINY_TRANSFORMER_PATH).
+prompt_attention() gives a scene the model's attention on its prompt, Q
+and K rounded for display, or the scene's own toy values without one.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from attention_engine import Attention, softmax
+
+REPO_DIR = Path(__file__).resolve().parent
+DEFAULT_CHECKPOINT = REPO_DIR / "data" / "tiny_transformer.npz"
+
+MAX_OPERAND = 99
+VOCAB = [str(n) for n in range(2 * MAX_OPERAND + 1)] + ["+", "="]
+TOKEN_IDS = {token: i for i, token in enumerate(VOCAB)}
+PROMPT_LENGTH = 4
+
+D_MODEL = 64
+N_HEADS = 4
+D_HEAD = 3
+D_MLP = 256
+N_LAYERS = 2
+
+
+def tokenize(prompt):
+    """'26 + 55 =' (or an already split list) -> ["26", "+", "55", "="]."""
+    if isinstance(prompt, str):
+        return re.findall(r"\d+|\S", prompt)
+    return [str(token) for token in prompt]
+
+
+def encode(prompt):
+    tokens = tokenize(prompt)
+    unknown = [token for token in tokens if token not in TOKEN_IDS]
+    if unknown:
+        raise KeyError(f"Not in the vocabulary: {unknown}")
+    return np.array([TOKEN_IDS[token] for token in tokens], dtype=np.int64)
+
+
+def addition_dataset(max_operand=MAX_OPERAND):
+    """(inputs, targets): every 'a + b =' with 0 <= a, b <= max_operand, and the id of a + b."""
+    a, b = np.divmod(np.arange((max_operand + 1) ** 2), max_operand + 1)
+    inputs = np.column_stack([a, np.full_like(a, TOKEN_IDS["+"]), b, np.full_like(a, TOKEN_IDS["="])])
+    return inputs, a + b
+
+
+def positional_encoding(seq_len, d_model):
+    """The sinusoidal encoding of 'Attention Is All You Need', (seq_len, d_model)."""
+    positions = np.arange(seq_len)[:, None]
+    frequencies = 1.0 / 10000 ** (np.arange(0, d_model, 2) / d_model)
+    encoding = np.zeros((seq_len, d_model))
+    encoding[:, 0::2] = np.sin(positions * frequencies)
+    encoding[:, 1::2] = np.cos(positions * frequencies)
+    return encoding
+
+
+# Per-head weights are stored as (heads, d_in, d_out) but multiplied as one (d_in, heads * d_out)
+# matrix: one BLAS call per projection instead of a batched product per head
+
+def _stacked(w):
+    """(heads, d_model, d_head) -> (d_model, heads * d_head)."""
+    return w.transpose(1, 0, 2).reshape(w.shape[1], -1)
+
+
+def _unstacked(w, n_heads):
+    """(d_model, heads * d_head) -> (heads, d_model, d_head), the inverse of _stacked."""
+    return w.reshape(w.shape[0], n_heads, -1).transpose(1, 0, 2)
+
+
+def _split_heads(x, n_heads):
+    """(batch, seq, heads * d_head) -> (batch, heads, seq, d_head)."""
+    return x.reshape(*x.shape[:-1], n_heads, -1).swapaxes(-2, -3)
+
+
+def _merge_heads(x):
+    """(batch, heads, seq, d_head) -> (batch, seq, heads * d_head)."""
+    x = x.swapaxes(-2, -3)
+    return x.reshape(*x.shape[:-2], -1)
+
+
+def _flat(x):
+    return x.reshape(-1, x.shape[-1])
+
+
+class TinyTransformer:
+    """Parameters live in self.params (name -> array); layer l's are "l{l}.w_q" etc."""
+
+    def __init__(self, params, d_model=D_MODEL, n_heads=N_HEADS, d_head=D_HEAD, d_mlp=D_MLP, n_layers=N_LAYERS):
+        self.params = params
+        self.config = {"d_model": d_model, "n_heads": n_heads, "d_head": d_head, "d_mlp": d_mlp,
+                       "n_layers": n_layers}
+        self.n_heads = n_heads
+        self.n_layers = n_layers
+        self.positions = positional_encoding(PROMPT_LENGTH, d_model)
+
+    @classmethod
+    def initialize(cls, seed=0, d_model=D_MODEL, n_heads=N_HEADS, d_head=D_HEAD, d_mlp=D_MLP, n_layers=N_LAYERS):
+        """Fresh random weights, scaled by 1/sqrt(fan in)."""
+        rng = np.random.default_rng(seed)
+
+        def weights(*shape, fan_in):
+            return rng.standard_normal(shape) / np.sqrt(fan_in)
+
+        params = {"embed": weights(len(VOCAB), d_model, fan_in=1) * 0.5}
+        for layer in range(n_layers):
+            for name in ("w_q", "w_k", "w_v"):
+                params[f"l{layer}.{name}"] = weights(n_heads, d_model, d_head, fan_in=d_model)
+            params[f"l{layer}.w_o"] = weights(n_heads, d_head, d_model, fan_in=n_heads * d_head)
+            params[f"l{layer}.w_in"] = weights(d_model, d_mlp, fan_in=d_model)
+            params[f"l{layer}.b_in"] = np.zeros(d_mlp)
+            params[f"l{layer}.w_out"] = weights(d_mlp, d_model, fan_in=d_mlp)
+            params[f"l{layer}.b_out"] = np.zeros(d_model)
+        params["unembed"] = weights(d_model, len(VOCAB), fan_in=d_model)
+        params["b_unembed"] = np.zeros(len(VOCAB))
+        return cls(params, d_model=d_model, n_heads=n_heads, d_head=d_head, d_mlp=d_mlp, n_layers=n_layers)
+
+    def forward(self, inputs):
+        """
+        (logits, cache) for a (batch, seq) array of token ids. logits are (batch, vocab),
+        the prediction after the last token; cache holds what backward() and trace() need.
+        """
+        p = self.params
+        x = p["embed"][inputs] + self.positions[:inputs.shape[1]]
+        cache = {"inputs": inputs, "residuals": [x], "attention": [], "mlp": []}
+        for layer in range(self.n_layers):
+            # Attention: one Attention over (batch, heads), heads written back into the stream through W_O
+            q, k, v = (
+                _split_heads(x @ _stacked(p[f"l{layer}.{name}"]), self.n_heads) for name in ("w_q", "w_k", "w_v")
+            )
+            attention = Attention(q, k, v, causal=True)
+            w_o = p[f"l{layer}.w_o"]
+            x = x + _merge_heads(attention.output) @ w_o.reshape(-1, w_o.shape[-1])
+            cache["attention"].append(attention)
+            cache["residuals"].append(x)
+
+            # MLP
+            hidden = np.maximum(x @ p[f"l{layer}.w_in"] + p[f"l{layer}.b_in"], 0)
+            x = x + hidden @ p[f"l{layer}.w_out"] + p[f"l{layer}.b_out"]
+            cache["mlp"].append(hidden)
+            cache["residuals"].append(x)
+
+        logits = x[:, -1] @ p["unembed"] + p["b_unembed"]
+        return logits, cache
+
+    def backward(self, cache, d_logits):
+        """Gradients of every parameter, given d(loss)/d(logits)."""
+        p = self.params
+        grads = {}
+        residuals = cache["residuals"]
+
+        final = residuals[-1][:, -1]
+        grads["unembed"] = final.T @ d_logits
+        grads["b_unembed"] = d_logits.sum(axis=0)
+        d_x = np.zeros_like(residuals[-1])
+        d_x[:, -1] = d_logits @ p["unembed"].T
+
+        for layer in reversed(range(self.n_layers)):
+            # MLP (the residual connection passes d_x straight through)
+            x, hidden = residuals[2 * layer + 1], cache["mlp"][layer]
+            grads[f"l{layer}.w_out"] = _flat(hidden).T @ _flat(d_x)
+            grads[f"l{layer}.b_out"] = d_x.sum(axis=(0, 1))
+            d_hidden = (d_x @ p[f"l{layer}.w_out"].T) * (hidden > 0)
+            grads[f"l{layer}.w_in"] = _flat(x).T @ _flat(d_hidden)
+            grads[f"l{layer}.b_in"] = d_hidden.sum(axis=(0, 1))
+            d_x = d_x + d_hidden @ p[f"l{layer}.w_in"].T
+
+            # Attention
+            x, attention = residuals[2 * layer], cache["attention"][layer]
+            w_o = p[f"l{layer}.w_o"]
+            grads[f"l{layer}.w_o"] = (_flat(_merge_heads(attention.output)).T @ _flat(d_x)).reshape(w_o.shape)
+            d_output = _split_heads(d_x @ w_o.reshape(-1, w_o.shape[-1]).T, self.n_heads)
+            weights = attention.weights
+            d_weights = d_output @ np.swapaxes(attention.v, -1, -2)
+            d_v = np.swapaxes(weights, -1, -2) @ d_output
+            # Softmax backward; masked (zero-weight) positions get no gradient
+            d_scores = weights * (d_weights - (d_weights * weights).sum(axis=-1, keepdims=True))
+            d_scores /= np.sqrt(attention.d_k)
+            d_q = d_scores @ attention.k
+            d_k = np.swapaxes(d_scores, -1, -2) @ attention.q
+            for name, d_proj in (("w_q", d_q), ("w_k", d_k), ("w_v", d_v)):
+                w = p[f"l{layer}.{name}"]
+                d_merged = _merge_heads(d_proj)
+                grads[f"l{layer}.{name}"] = _unstacked(_flat(x).T @ _flat(d_merged), self.n_heads)
+                d_x = d_x + d_merged @ _stacked(w).T
+
+        grads["embed"] = np.zeros_like(p["embed"])
+        np.add.at(grads["embed"], cache["inputs"], d_x)
+        return grads
+
+    def loss_and_grads(self, inputs, targets):
+        """Mean cross-entropy of the next-token prediction, and its gradients."""
+        logits, cache = self.forward(inputs)
+        probs = softmax(logits)
+        rows = np.arange(len(targets))
+        loss = -np.log(probs[rows, targets] + 1e-12).mean()
+        d_logits = probs
+        d_logits[rows, targets] -= 1
+        return loss, self.backward(cache, d_logits / len(targets))
+
+    def predict(self, inputs):
+        logits, _ = self.forward(np.asarray(inputs))
+        return logits.argmax(axis=-1)
+
+    def accuracy(self, inputs, targets, batch_size=2000):
+        correct = sum(
+            int((self.predict(inputs[start:start + batch_size]) == targets[start:start + batch_size]).sum())
+            for start in range(0, len(inputs), batch_size)
+        )
+        return correct / len(inputs)
+
+    def trace(self, prompt):
+        """Everything the model computes on one prompt (see Trace)."""
+        tokens = tokenize(prompt)
+        logits, cache = self.forward(encode(tokens)[None, :])
+        return Trace(self, tokens, logits[0], cache)
+
+    def save(self, path=DEFAULT_CHECKPOINT):
+        """Write an .npz checkpoint: the parameters plus the config as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, __config__=np.array(json.dumps(self.config)), **self.params)
+
+    @classmethod
+    def load(cls, path=DEFAULT_CHECKPOINT):
+        with np.load(path) as checkpoint:
+            config = json.loads(str(checkpoint["__config__"]))
+            params = {name: checkpoint[name] for name in checkpoint.files if name != "__config__"}
+        return cls(params, **config)
+
+
+class Trace:
+    """
+    One forward pass on one prompt.
+    residuals[0] is token embedding + position, residuals[2l + 1] the stream after layer l's
+    attention and residuals[2l + 2] after its MLP; each is (seq, d_model).
+    """
+
+    def __init__(self, model, tokens, logits, cache):
+        self.tokens = tokens
+        self.logits = logits
+        self.probabilities = softmax(logits)
+        self.prediction = VOCAB[int(logits.argmax())]
+        self.embeddings = model.params["embed"][cache["inputs"][0]]
+        self.positions = model.positions[:len(tokens)]
+        self.residuals = [residual[0] for residual in cache["residuals"]]
+        self._attention = cache["attention"]
+
+    def attention(self, layer=0, head=0):
+        """The Attention of one head: q, k, v are (seq, d_head), weights (seq, seq)."""
+        attention = self._attention[layer]
+        return Attention(attention.q[0, head], attention.k[0, head], attention.v[0, head],
+                         tokens=self.tokens, causal=True)
+
+    def attention_patterns(self, layer=0):
+        """(heads, seq, seq) attention weights of `layer`."""
+        return self._attention[layer].weights[0]
+
+
+class Adam:
+    def __init__(self, params, lr=3e-3, betas=(0.9, 0.98), eps=1e-8, weight_decay=0.0):
+        self.params = params
+        self.lr = lr
+        self.betas = betas
+        self.eps = eps
+        self.weight_decay = weight_decay
+        self.step_count = 0
+        self.m = {name: np.zeros_like(value) for name, value in params.items()}
+        self.v = {name: np.zeros_like(value) for name, value in params.items()}
+
+    def step(self, grads, lr=None):
+        lr = self.lr if lr is None else lr
+        beta1, beta2 = self.betas
+        self.step_count += 1
+        correction1 = 1 - beta1 ** self.step_count
+        correction2 = 1 - beta2 ** self.step_count
+        for name, grad in grads.items():
+            m, v = self.m[name], self.v[name]
+            m *= beta1
+            m += (1 - beta1) * grad
+            v *= beta2
+            v += (1 - beta2) * grad * grad
+            param = self.params[name]
+            if self.weight_decay:
+                param *= 1 - lr * self.weight_decay
+            param -= lr * (m / correction1) / (np.sqrt(v / correction2) + self.eps)
+
+
+def train(model, epochs=150, batch_size=500, lr=1e-2, weight_decay=1e-4, seed=0, log=print):
+    """
+    Minibatch Adam on the whole addition dataset, with a linear warm-up and cosine decay of the
+    learning rate. Returns the final accuracy on the dataset.
+    """
+    inputs, targets = addition_dataset()
+    rng = np.random.default_rng(seed)
+    optimizer = Adam(model.params, lr=lr, weight_decay=weight_decay)
+    steps_per_epoch = -(-len(inputs) // batch_size)
+    total_steps = epochs * steps_per_epoch
+    warmup = min(200, total_steps // 10)
+    started = time.perf_counter()
+
+    for epoch in range(epochs):
+        order = rng.permutation(len(inputs))
+        losses = []
+        for start in range(0, len(inputs), batch_size):
+            batch = order[start:start + batch_size]
+            loss, grads = model.loss_and_grads(inputs[batch], targets[batch])
+            step = optimizer.step_count
+            if step < warmup:
+                step_lr = lr * (step + 1) / warmup
+            else:
+                step_lr = lr * 0.5 * (1 + np.cos(np.pi * (step - warmup) / max(1, total_steps - warmup)))
+            optimizer.step(grads, lr=step_lr)
+            losses.append(loss)
+        if log and (epoch % 10 == 0 or epoch == epochs - 1):
+            log(f"epoch {epoch:4d}  loss {np.mean(losses):.4f}  accuracy {model.accuracy(inputs, targets):.2%}"
+                f"  ({time.perf_counter() - started:.0f}s)")
+    return model.accuracy(inputs, targets)
+
+
+def checkpoint_path(path=None):
+    return Path(path or os.environ.get("TINY_TRANSFORMER_PATH") or DEFAULT_CHECKPOINT)
+
+
+def load_model(path=None):
+    """The TinyTransformer at `path` ($TINY_TRANSFORMER_PATH, then data/tiny_transformer.npz), or None."""
+    path = checkpoint_path(path)
+    if not path.exists():
+        return None
+    return TinyTransformer.load(path)
+
+
+def prompt_attention(tokens, layer=0, head=0, decimals=1, fallback=None):
+    """
+    The trained model's attention on `tokens`, Q, K and V rounded to `decimals` so the
+    products shown on screen add up, or `fallback` without a checkpoint.
+    """
+    model = load_model()
+    if model is None:
+        return fallback
+    return model.trace(tokens).attention(layer, head).rounded(decimals)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", default=None, help="checkpoint path (default: data/tiny_transformer.npz)")
+    parser.add_argument("--epochs", type=int, default=150)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--lr", type=float, default=1e-2)
+    parser.add_argument("--layers", type=int, default=N_LAYERS, choices=(1, 2))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    model = TinyTransformer.initialize(seed=args.seed, n_layers=args.layers)
+    accuracy = train(model, epochs=args.epochs, batch_size=args.batch_size, lr=args.lr, seed=args.seed)
+    path = checkpoint_path(args.output)
+    model.save(path)
+    trace = model.trace("26 + 55 =")
+    print(f"Saved {path} (accuracy {accuracy:.2%}); 26 + 55 = {trace.prediction}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,29 @@
 from manim import *
 import numpy as np
 
+from embedding_data import fit_to_extent, load_embedding_table
+from point_cloud import FadeInPoints, PointCloud3D
+from scene_params import scene_params
+
+PROMPT_TOKENS = ["26", "+", "55", "="]
+# Shown when there is no embedding table (or no vocabulary) to look them up in
+PROMPT_TOKEN_IDS = [253, 16, 361, 54]
+# The tokens lit up around the prompt in latent_space, in the same order
+ADDITIONAL_TOKENS = ["7", "100", "42", "-", "*", "/", "the", "and", "is", "of", ".", ",", "?"]
+# Largest |coordinate| of a projected token on the latent-space axes
+LATENT_EXTENT = 3.5
+
 class LLMTokenizationAndEmbedding(ThreeDScene):
     def construct(self):
         # Enhanced color scheme
         self.token_colors = [BLUE_C, BLUE_C, BLUE_C, BLUE_C]
+
+        # Real embeddings when data/embeddings.npy exists, made-up values otherwise
+        self.params = scene_params(self)
+        self.embedding_table = load_embedding_table()
+        self.prompt_ids = self.lookup_token_ids(PROMPT_TOKENS)
+        if self.prompt_ids is None:
+            self.prompt_ids = self.params.get("prompt_token_ids", PROMPT_TOKEN_IDS)
         
         # Scene 2: Tokenization Process
         token_elements, token_ids = self.tokenization()
@@ -14,6 +33,15 @@ class LLMTokenizationAndEmbedding(ThreeDScene):
         
         # Scene 4: Latent Space Visualization
         self.latent_space(individual_embeddings, arrows, token_elements)
+
+    def lookup_token_ids(self, tokens):
+        """Vocabulary ids of `tokens`, or None without a table/vocabulary that has them all."""
+        if self.embedding_table is None:
+            return None
+        try:
+            return self.embedding_table.token_ids(tokens).tolist()
+        except KeyError:
+            return None
         
         
     def tokenization(self):
@@ -53,10 +81,8 @@ class LLMTokenizationAndEmbedding(ThreeDScene):
             self.play(token.animate.scale(1 / 1.3), run_time=0.4)
         
         token_ids = [
-            Tex(r"\text{ID: 253}", font_size=30, color=YELLOW_C),
-            Tex(r"\text{ID: 16}", font_size=30, color=YELLOW_C),
-            Tex(r"\text{ID: 361}", font_size=30, color=YELLOW_C),
-            Tex(r"\text{ID: 54}", font_size=30, color=YELLOW_C)
+            Tex(rf"\text{{ID: {token_id}}}", font_size=30, color=YELLOW_C)
+            for token_id in self.prompt_ids
         ]
         for token_id, token in zip(token_ids, tokens):
             token_id.next_to(token, DOWN, buff=0.8)
@@ -86,12 +112,20 @@ class LLMTokenizationAndEmbedding(ThreeDScene):
         self.wait(1)
         self.play(FadeOut(explanation), run_time=1)
         
+        if self.embedding_table is None:
+            dim = 768
+            rows = self.params.rng("embeddings").uniform(-1, 1, (4, dim))
+        else:
+            dim = self.embedding_table.dim
+            rows = self.embedding_table.gather(self.prompt_ids)
+
         embeddings = []
         for i in range(4):
-            values = [round(np.random.uniform(-1, 1), 2) for _ in range(4)]
+            # The first four components, then the last one after the ellipsis
+            values = [round(val, 2) for val in rows[i, :4]]
             vector_components = VGroup()
             for j, val in enumerate(values):
-                text = Tex(f"{val:.2f}", font_size=28, color=WHITE)
+                text = MathTex(f"{val:.2f}", font_size=28, color=WHITE)
                 if j == 0:
                     text.move_to(ORIGIN)
                 else:
@@ -100,7 +134,7 @@ class LLMTokenizationAndEmbedding(ThreeDScene):
             ellipsis = Tex(r"\vdots", font_size=28, color=WHITE)
             ellipsis.next_to(vector_components[-1], DOWN, buff=0.2)
             vector_components.add(ellipsis)
-            final_val = Tex(f"{round(np.random.uniform(-1, 1), 2):.2f}", font_size=28, color=WHITE)
+            final_val = MathTex(f"{round(rows[i, -1], 2):.2f}", font_size=28, color=WHITE)
             final_val.next_to(ellipsis, DOWN, buff=0.2)
             vector_components.add(final_val)
             
@@ -127,7 +161,7 @@ class LLMTokenizationAndEmbedding(ThreeDScene):
             )
             arrows.append(arrow)
         
-        dim_label = Tex(r"\text{768-dim}", font_size=38, color=WHITE)
+        dim_label = Tex(rf"\text{{{dim}-dim}}", font_size=38, color=WHITE)
         brace = Tex(r"\{", font_size=150, color=WHITE)
         all_embeddings = VGroup(*embeddings)
         brace.next_to(all_embeddings, LEFT, buff=0.3)
@@ -178,23 +212,55 @@ class LLMTokenizationAndEmbedding(ThreeDScene):
             run_time=2.5
         )
         
-        dots = []
-        labels = []
         token_vectors = [
             (axes.c2p(2.2, 1.5, 2.8), r"\text{‘26’}", self.token_colors[0]),
             (axes.c2p(-2.8, -1.8, 0.5), r"\text{‘+’}", self.token_colors[1]),
             (axes.c2p(2.5, 1.2, 3.1), r"\text{‘55’}", self.token_colors[2]),
             (axes.c2p(-2.5, -2.1, 0.8), r"\text{‘=’}", self.token_colors[3])
         ]
-        for pos, txt, color in token_vectors:
-            dot = Dot3D(radius=0.09, color=color).move_to(pos)
-            dots.append(dot)
-            label = Tex(txt, font_size=30, color=color).scale(0.8).move_to(pos + OUT * 0.3 + UP * 0.3)
-            self.add_fixed_orientation_mobjects(label)
-            labels.append(label)
         
+        # Additional tokens (all light up simultaneously later on)
+        additional_tokens = [
+            (axes.c2p(1.8, 2.1, 2.3), r"\text{‘7’}", BLUE_A),
+            (axes.c2p(2.7, 0.9, 3.5), r"\text{‘100’}", BLUE_A),
+            (axes.c2p(1.5, 1.8, 2.1), r"\text{‘42’}", BLUE_A),
+            (axes.c2p(-2.2, -1.5, 1.1), r"\text{‘-’}", GREEN_C),
+            (axes.c2p(-3.1, -2.4, 0.2), r"\text{‘*’}", GREEN_C),
+            (axes.c2p(-2.0, -2.8, 0.9), r"\text{‘/’}", GREEN_C),
+            (axes.c2p(-1.2, 3.2, -2.1), r"\text{‘the’}", PURPLE_C),
+            (axes.c2p(0.5, -3.1, -1.8), r"\text{‘and’}", PURPLE_C),
+            (axes.c2p(3.2, -0.8, -2.5), r"\text{‘is’}", PURPLE_C),
+            (axes.c2p(-3.5, 1.2, -1.2), r"\text{‘of’}", PURPLE_C),
+            (axes.c2p(0.8, 2.8, -3.2), r"\text{‘.’}", ORANGE),
+            (axes.c2p(-0.5, -2.2, -2.8), r"\text{‘,’}", ORANGE),
+            (axes.c2p(2.1, -2.5, -1.5), r"\text{‘?’}", ORANGE),
+        ]
+        
+        # One point cloud for every token; the additional ones start hidden
+        all_tokens = token_vectors + additional_tokens
+        n_initial = len(token_vectors)
+        positions = [pos for pos, _, _ in all_tokens]
+        latent_ids = self.lookup_token_ids(PROMPT_TOKENS + ADDITIONAL_TOKENS)
+        if latent_ids is not None:
+            # Real layout: the tokens along the table's top three principal axes
+            coords = fit_to_extent(self.embedding_table.project(latent_ids), LATENT_EXTENT)
+            positions = [axes.c2p(*point) for point in coords]
+        cloud = PointCloud3D(
+            positions,
+            self.camera,
+            colors=[color for _, _, color in all_tokens],
+            sizes=0.09,
+            opacities=[1.0] * n_initial + [0.0] * len(additional_tokens)
+        )
+        initial_indices = range(n_initial)
+        additional_indices = range(n_initial, len(all_tokens))
+        
+        labels = cloud.labels(initial_indices, [txt for _, txt, _ in token_vectors], offset=(OUT + UP) * 0.3)
+        self.add_fixed_orientation_mobjects(*labels)
+        
+        # The embeddings become the (still camera-facing) dots, which the cloud then takes over
         transform_animations = [
-            Transform(individual_embeddings[i], dots[i]) for i in range(4)
+            Transform(individual_embeddings[i], cloud.marker(i)) for i in initial_indices
         ]
         self.play(
             *transform_animations,
@@ -203,6 +269,8 @@ class LLMTokenizationAndEmbedding(ThreeDScene):
             *[FadeIn(lab) for lab in labels],
             run_time=2.5
         )
+        self.remove(*individual_embeddings)
+        self.add(cloud)
         
         # Display explanation after transforms, in top-right corner
         self.play(Write(explanation), run_time=1.5)
@@ -213,34 +281,14 @@ class LLMTokenizationAndEmbedding(ThreeDScene):
         self.wait(1)
         
         # Additional tokens (all light up simultaneously)
-        additional_tokens = [
-            (axes.c2p(1.8, 2.1, 2.3), r"\text{‘7’}", BLUE_A),
-            (axes.c2p(2.7, 0.9, 3.5), r"\text{‘100’}", BLUE_A),
-            (axes.c2p(1.5, 1.8, 2.1), r"\text{‘42’}", BLUE_A),
-            (axes.c2p(-2.2, -1.5, 1.1), r"\text{‘-’}", GREEN_C),
-            (axes.c2p(-3.1, -2.4, 0.2), r"\text{‘*’}", GREEN_C),
-            (axes.c2p(-2.0, -2.8, 0.9), r"\text{‘/’}", GREEN_C),
-            (axes.c2p(-1.2, 3.2, -2.1), r"\text{‘the’}", PURPLE_C),
-            (axes.c2p(0.5, -3.1, -1.8), r"\text{‘and’}", PURPLE_C),
-            (axes.c2p(3.2, -0.8, -2.5), r"\text{‘is’}", PURPLE_C),
-            (axes.c2p(-3.5, 1.2, -1.2), r"\text{‘of’}", PURPLE_C),
-            (axes.c2p(0.8, 2.8, -3.2), r"\text{‘.’}", ORANGE),
-            (axes.c2p(-0.5, -2.2, -2.8), r"\text{‘,’}", ORANGE),
-            (axes.c2p(2.1, -2.5, -1.5), r"\text{‘?’}", ORANGE),
-        ]
-        
-        additional_dots = []
-        additional_labels = []
-        for pos, txt, color in additional_tokens:
-            dot = Dot3D(radius=0.09, color=color).move_to(pos)
-            additional_dots.append(dot)
-            label = Tex(txt, font_size=30, color=color).scale(0.8).move_to(pos + OUT * 0.2 + UP * 0.2)
-            self.add_fixed_orientation_mobjects(label)
-            additional_labels.append(label)
+        additional_labels = cloud.labels(
+            additional_indices, [txt for _, txt, _ in additional_tokens], offset=(OUT + UP) * 0.2
+        )
+        self.add_fixed_orientation_mobjects(*additional_labels)
         
         # Fade in all additional dots and labels at once
         self.play(
-            *[FadeIn(dot, scale=0.5) for dot in additional_dots],
+            FadeInPoints(cloud, additional_indices, scale=0.5),
             *[FadeIn(label, scale=0.5) for label in additional_labels],
             run_time=1.5
         )
@@ -1,10 +1,18 @@
 from manim import *
 import numpy as np
 
+from tiny_transformer import load_model
+
+# Position of each token shown in the prompt '26 + 55 ='
+TOKEN_POSITIONS = {"26": 0, "=": 3}
+
 class EmbeddingContextEvolution(Scene):
     def construct(self):
         # Use a slightly wider spacing between tokens/embeddings
         self.token_spacing = 3.5
+
+        # The trained model's residual stream when there is a checkpoint, made-up values otherwise
+        self.model = load_model()
         
         # Show the main embedding evolution sequence
         self.embedding_evolution()
@@ -15,7 +23,7 @@ class EmbeddingContextEvolution(Scene):
         """
         vector_components = VGroup()
         for j, val in enumerate(values[:3]):
-            text = Tex(f"{val:.2f}", font_size=26 * scale_factor, color=WHITE)
+            text = MathTex(f"{val:.2f}", font_size=26 * scale_factor, color=WHITE)
             if j == 0:
                 text.move_to(ORIGIN)
             else:
@@ -26,7 +34,7 @@ class EmbeddingContextEvolution(Scene):
         ellipsis.next_to(vector_components[-1], DOWN, buff=0.15 * scale_factor)
         vector_components.add(ellipsis)
 
-        final_val = Tex(f"{values[-1]:.2f}", font_size=26 * scale_factor, color=WHITE)
+        final_val = MathTex(f"{values[-1]:.2f}", font_size=26 * scale_factor, color=WHITE)
         final_val.next_to(ellipsis, DOWN, buff=0.15 * scale_factor)
         vector_components.add(final_val)
 
@@ -57,6 +65,11 @@ class EmbeddingContextEvolution(Scene):
             [-0.65, 0.34, -0.18, 0.52, 0.73],  # "="
             [0.23, -0.45, 0.12, 0.78, -0.34],  # "26"
         ]
+        if self.model is not None:
+            # Token embedding + position going in, the residual stream after the last layer coming out
+            trace = self.model.trace("26 + 55 =")
+            positions = [TOKEN_POSITIONS[tok] for tok in ['=', '26']]
+            original_vals = trace.residuals[0][positions]
         original_embeddings = VGroup()
         for i, vals in enumerate(original_vals):
             emb = self.create_embedding_vector(vals, WHITE, scale_factor=0.8)
@@ -98,6 +111,8 @@ class EmbeddingContextEvolution(Scene):
             [-0.71, 0.48, -0.32, 0.65, 0.94],  # "26" → "first operand in addition"
             [0.18, -0.62, 0.35, 0.91, -0.47],   # "=" → "conclusion of 26 + 55"
         ]
+        if self.model is not None:
+            new_vals = trace.residuals[-1][positions]
         new_embeddings = VGroup()
         for i, vals in enumerate(new_vals):
             ne = self.create_embedding_vector(vals, WHITE, scale_factor=0.8)
@@ -1,5 +1,8 @@
 from manim import *
 
+from attention_engine import ADDITION_PROMPT
+from tiny_transformer import prompt_attention
+
 class AttentionWeightsAnimation(Scene):
     def construct(self):
         # Title
@@ -9,17 +12,20 @@ class AttentionWeightsAnimation(Scene):
         )
         title.to_edge(UP, buff=1)
         
-        # Mathematical expression with highlighted weights
-        expression = MathTex(
-            "0.21", r" \cdot V_{26} + ", "0.22", r" \cdot V_{+} + ", "0.29", r" \cdot V_{55} + ", "0.29", r" \cdot V_{=}"
-        )
+        # Mathematical expression with highlighted weights: the q_{=} row of the softmax
+        attention = prompt_attention(ADDITION_PROMPT.tokens, fallback=ADDITION_PROMPT)
+        weights = attention.weights[-1]
+        tokens = attention.tokens
+        parts = []
+        for i, (weight, token) in enumerate(zip(weights, tokens)):
+            parts.append(f"{weight:.2f}")
+            parts.append(rf" \cdot V_{{{token}}}" + (" + " if i < len(tokens) - 1 else ""))
+        expression = MathTex(*parts)
         expression.move_to(ORIGIN)
         
         # Highlight the weights with light yellow
-        expression.set_color_by_tex("0.21", YELLOW_C)
-        expression.set_color_by_tex("0.22", YELLOW_C)
-        expression.set_color_by_tex("0.29", YELLOW_C)
-        expression.set_color_by_tex("0.29", YELLOW_C)
+        for weight_part in expression[::2]:
+            weight_part.set_color(YELLOW_C)
         
         # Animation sequence
         self.play(Write(title))
@@ -0,0 +1,143 @@
+"""High-dimensional vectors drawn as one coloured strip.
+
+    strip = VectorStrip(dense_768, width=12, colors=DIVERGING_COLORS, vmin=-1, vmax=1)
+    strip.value_labels(strip.nonzero_indices())     # numbers only where they matter
+    strip.index_labels([0, 767])                     # dimension numbers under the strip
+    window, zoomed = strip.zoom(0, 16, target=DOWN * 2.5)
+    self.play(Create(strip.window_outline(0, 16)), ReplacementTransform(window, zoomed))
+
+A Square plus two Tex per dimension stops being readable (and renderable)
+at a few dozen dimensions. A VectorStrip is Group(image, outline): one
+pixel per dimension, coloured through a heatmap_matrix LUT in a single
+array lookup and upscaled with nearest-neighbour sampling, so 768
+dimensions cost one texture. Labels are only made for the indices asked
+for, and zoom() returns the slice as its own strip, first squeezed over
+its window of this one, so a Transform to the full-size slice zooms in.
+"""
+import numpy as np
+from manim import (
+    BLUE, GREEN, GREY, GREY_E, RESAMPLING_ALGORITHMS, UP, DOWN, WHITE, YELLOW, YELLOW_C,
+    Group, ImageMobject, MathTex, Rectangle, Tex, VGroup,
+)
+
+from heatmap_matrix import colormap_lut, value_range, values_to_pixels
+
+# Negative -> blue, zero -> white, positive -> green, as the dense vectors are drawn
+DIVERGING_COLORS = (BLUE, WHITE, GREEN)
+# Zero -> near background, counts -> yellow, as the sparse vectors are drawn
+SPARSE_COLORS = (GREY_E, YELLOW_C, YELLOW)
+
+
+class VectorStrip(Group):
+    """
+    values: 1D array-like, drawn as a width x height strip centred on the origin.
+    start_index is the dimension number of values[0] (for slices of a longer vector).
+    """
+
+    def __init__(
+        self,
+        values,
+        width=12.0,
+        height=0.4,
+        colors=DIVERGING_COLORS,
+        vmin=None,
+        vmax=None,
+        start_index=0,
+        outline_color=GREY,
+        outline_width=1,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.values = np.asarray(values, dtype=float).reshape(-1)
+        self.colors = colors
+        self.vmin, self.vmax = value_range(self.values, vmin, vmax)
+        self.start_index = start_index
+
+        pixels = values_to_pixels(self.values[None, :], colormap_lut(colors), self.vmin, self.vmax)
+        image = ImageMobject(pixels)
+        image.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        image.stretch_to_fit_width(width)
+        image.stretch_to_fit_height(height)
+        image.move_to([0, 0, 0])
+        outline = Rectangle(width=width, height=height, stroke_color=outline_color, stroke_width=outline_width)
+        self.add(image, outline)
+
+    @property
+    def n_dims(self):
+        return len(self.values)
+
+    @property
+    def image(self):
+        return self[0]
+
+    def _corners(self):
+        # ImageMobject points are its UL, UR, DL, DR corners, wherever it has been moved
+        top_left, top_right, bottom_left, _ = self.image.points
+        return top_left, top_right - top_left, bottom_left - top_left
+
+    def cell_center(self, index):
+        """Centre of dimension `index` (counted from start_index)."""
+        origin, across, down = self._corners()
+        return origin + (index - self.start_index + 0.5) / self.n_dims * across + 0.5 * down
+
+    def window_bounds(self, start, stop):
+        """(left, right, top, bottom) of dimensions [start, stop)."""
+        origin, across, down = self._corners()
+        left = origin + (start - self.start_index) / self.n_dims * across
+        right = origin + (stop - self.start_index) / self.n_dims * across
+        return left[0], right[0], origin[1], (origin + down)[1]
+
+    def window_outline(self, start, stop, color=YELLOW, stroke_width=3, buff=0.05):
+        left, right, top, bottom = self.window_bounds(start, stop)
+        rect = Rectangle(width=right - left + 2 * buff, height=top - bottom + 2 * buff,
+                         stroke_color=color, stroke_width=stroke_width)
+        rect.move_to([(left + right) / 2, (top + bottom) / 2, 0])
+        return rect
+
+    def nonzero_indices(self):
+        return np.flatnonzero(self.values) + self.start_index
+
+    def value_labels(self, indices, entry_format="{:.1f}", font_size=14, color=WHITE, direction=UP, buff=0.1):
+        """Tex of the values at `indices`, just outside the strip (above by default)."""
+        origin, across, down = self._corners()
+        edge = origin if np.dot(direction, down) < 0 else origin + down
+        labels = VGroup()
+        for index in indices:
+            value = self.values[index - self.start_index]
+            label = MathTex(entry_format.format(value), font_size=font_size, color=color)
+            label.next_to([self.cell_center(index)[0], edge[1], 0], direction, buff=buff)
+            labels.add(label)
+        return labels
+
+    def index_labels(self, indices, font_size=12, color=GREY, direction=DOWN, buff=0.1):
+        """Dimension numbers under (by default) the strip."""
+        origin, across, down = self._corners()
+        edge = origin if np.dot(direction, down) < 0 else origin + down
+        labels = VGroup()
+        for index in indices:
+            label = Tex(f"{index}", font_size=font_size, color=color)
+            label.next_to([self.cell_center(index)[0], edge[1], 0], direction, buff=buff)
+            labels.add(label)
+        return labels
+
+    def zoom(self, start, stop, target, width=None, height=None):
+        """
+        (window, zoomed): the strip of dimensions [start, stop) at `target`, full width unless
+        given, and a copy of it squeezed over that window of this strip. Transform the
+        window into the zoomed strip to zoom in.
+        """
+        _, across, down = self._corners()
+        width = np.linalg.norm(across) if width is None else width
+        height = np.linalg.norm(down) if height is None else height
+        zoomed = VectorStrip(
+            self.values[start - self.start_index:stop - self.start_index],
+            width=width, height=height, colors=self.colors, vmin=self.vmin, vmax=self.vmax,
+            start_index=start, outline_color=YELLOW,
+        ).move_to(target)
+
+        left, right, top, bottom = self.window_bounds(start, stop)
+        window = zoomed.copy()
+        window.stretch_to_fit_width(right - left)
+        window.stretch_to_fit_height(top - bottom)
+        window.move_to([(left + right) / 2, (top + bottom) / 2, 0])
+        return window, zoomed
@@ -1,6 +1,10 @@
 from manim import *
 import numpy as np
 
+from scene_params import scene_params
+from text_index import KeywordIndex
+from vector_strip import DIVERGING_COLORS, SPARSE_COLORS, VectorStrip
+
 class VectorComparison(Scene):
     def construct(self):
         # Title
@@ -8,8 +12,7 @@ class VectorComparison(Scene):
         title.to_edge(UP)
         self.play(Write(title))
         
-        # Create sparse and dense vector data
-        sparse_vector = [0, 0, 3, 0, 2, 0, 0, 1, 0, 0]
+        # Create dense vector data
         dense_vector = [0.1, -0.3, 0.7, 0.2, 0.5, -0.1, 0.4, 0.6, -0.2, 0.3]
         
         # Create document examples that match sparse vector frequencies
@@ -26,12 +29,19 @@ class VectorComparison(Scene):
             "dog": 7     # Index 7 has value 1 (frequency count)
         }
         
+        # Scan the corpus once for every keyword; the sparse vector holds each
+        # keyword's total count at its index (0, 0, 3, 0, 2, 0, 0, 1, 0, 0)
+        corpus_index = KeywordIndex(keywords).index(documents)
+        sparse_vector = [0] * len(dense_vector)
+        for keyword, idx in keywords.items():
+            sparse_vector[idx] = corpus_index.count(keyword)
+        
         # Create frequency counter visualization
-        freq_counter = self.create_frequency_counter(documents, keywords)
+        freq_counter = self.create_frequency_counter(corpus_index)
         freq_counter.to_edge(UP).shift(DOWN * 0.8 + LEFT * 2)
         
         # Show documents first with enhanced highlighting
-        doc_viz = self.create_document_visualization(documents, keywords)
+        doc_viz = self.create_document_visualization(documents, corpus_index)
         doc_viz.to_edge(UP).shift(DOWN * 0.8 + RIGHT * 2)
         
         self.play(Create(doc_viz))
@@ -69,7 +79,7 @@ class VectorComparison(Scene):
         self.wait(2)
         
         # Add frequency labels to show counts more clearly
-        freq_labels = self.create_frequency_labels(freq_counter, sparse_visual, keywords)
+        freq_labels = self.create_frequency_labels(freq_counter, sparse_visual, keywords, sparse_vector)
         self.play(Write(freq_labels))
         self.wait(1.5)
         
@@ -94,15 +104,9 @@ class VectorComparison(Scene):
         )
         self.wait(2)
     
-    def create_frequency_counter(self, documents, keywords):
-        """Create a visual frequency counter for keywords."""
-        counts = {keyword: 0 for keyword in keywords}
-        
-        # Count occurrences
-        for doc in documents:
-            for keyword in keywords:
-                # Count all occurrences in the document
-                counts[keyword] += doc.lower().count(keyword.lower())
+    def create_frequency_counter(self, corpus_index):
+        """Create a visual frequency counter for the keywords of a text_index.CorpusIndex."""
+        counts = dict(zip(corpus_index.keywords, corpus_index.counts.tolist()))
         
         # Create visual counter
         counter_group = VGroup()
@@ -134,8 +138,8 @@ class VectorComparison(Scene):
         
         return counter_group
         
-    def create_document_visualization(self, documents, keywords):
-        """Create a visualization of documents with highlighted keywords."""
+    def create_document_visualization(self, documents, corpus_index):
+        """Create a visualization of documents with their indexed keyword matches highlighted."""
         doc_rects = VGroup()
         
         for i, doc in enumerate(documents):
@@ -157,40 +161,30 @@ class VectorComparison(Scene):
             doc_text.set_width(rect.width - 0.4)
             doc_text.move_to(rect)
             
-            # Highlight keywords with more emphasis
+            # Highlight keywords with more emphasis, at the offsets found by the index
             keyword_highlights = VGroup()
-            for keyword, idx in keywords.items():
-                if keyword in doc.lower():
-                    # Find all occurrences of the keyword
-                    start_idx = 0
-                    while True:
-                        start_idx = doc.lower().find(keyword, start_idx)
-                        if start_idx == -1:
-                            break
-                        end_idx = start_idx + len(keyword)
-                        
-                        # Create highlighted keyword with background highlight
-                        keyword_text = Tex(rf"\text{{{doc[start_idx:end_idx]}}}", font_size=14, color=BLACK)
-                        highlight_box = Rectangle(
-                            height=keyword_text.height + 0.05,
-                            width=keyword_text.width + 0.05,
-                            fill_color=YELLOW,
-                            fill_opacity=1,
-                            stroke_width=0
-                        )
-                        highlight_box.move_to(keyword_text)
-                        
-                        # Group the highlight and text
-                        keyword_group = VGroup(highlight_box, keyword_text)
-                        
-                        # Position it based on the original text
-                        orig_text_width = doc_text.width
-                        relative_pos = (start_idx / len(doc) - 0.5) * orig_text_width
-                        keyword_group.move_to(doc_text).shift(RIGHT * relative_pos)
-                        
-                        # Add to keyword highlights
-                        keyword_highlights.add(keyword_group)
-                        start_idx = end_idx
+            for start_idx, end_idx, _ in corpus_index.document_matches(i):
+                # Create highlighted keyword with background highlight
+                keyword_text = Tex(rf"\text{{{doc[start_idx:end_idx]}}}", font_size=14, color=BLACK)
+                highlight_box = Rectangle(
+                    height=keyword_text.height + 0.05,
+                    width=keyword_text.width + 0.05,
+                    fill_color=YELLOW,
+                    fill_opacity=1,
+                    stroke_width=0
+                )
+                highlight_box.move_to(keyword_text)
+                
+                # Group the highlight and text
+                keyword_group = VGroup(highlight_box, keyword_text)
+                
+                # Position it based on the original text
+                orig_text_width = doc_text.width
+                relative_pos = (start_idx / len(doc) - 0.5) * orig_text_width
+                keyword_group.move_to(doc_text).shift(RIGHT * relative_pos)
+                
+                # Add to keyword highlights
+                keyword_highlights.add(keyword_group)
             
             # Combine elements (add keyword highlights as separate group)
             doc_group = VGroup(rect, lines, doc_text, keyword_highlights)
@@ -205,7 +199,7 @@ class VectorComparison(Scene):
         return VGroup(label, doc_rects)
     
     def create_vector_visual(self, vector, label, fill_colors=None):
-        """Create visualization of a vector."""
+        """Create visualization of a vector, one cell per dimension (see create_vector_strip for long ones)."""
         cells = VGroup(*[
             Square(side_length=0.5)
             for _ in vector
@@ -239,6 +233,18 @@ class VectorComparison(Scene):
         label_text = Tex(rf"\text{{{label}}}", font_size=20).next_to(cells, LEFT)
         return VGroup(cells, values, dim_indices, label_text)
     
+    def create_vector_strip(self, vector, label, colors, vmin=None, vmax=None, entry_format="{:.1f}", labelled=None):
+        """
+        Group(Group(strip, first/last index labels), value labels, label) for a long vector.
+        labelled: None, "nonzero" or a list of dimensions whose values are written above the strip.
+        """
+        strip = VectorStrip(vector, width=11, height=0.4, colors=colors, vmin=vmin, vmax=vmax)
+        ends = strip.index_labels([0, strip.n_dims - 1])
+        indices = strip.nonzero_indices() if labelled == "nonzero" else (labelled or [])
+        values = strip.value_labels(indices, entry_format=entry_format)
+        label_text = Tex(rf"\text{{{label}}}", font_size=20).next_to(strip, LEFT)
+        return Group(Group(strip, ends), values, label_text)
+    
     def create_keyword_connections(self, doc_viz, freq_counter, sparse_visual, keywords):
         """Create clearer connections between keywords, frequency counters and sparse vector cells."""
         connections = VGroup()
@@ -289,15 +295,12 @@ class VectorComparison(Scene):
         
         return connections
     
-    def create_frequency_labels(self, freq_counter, sparse_visual, keywords):
+    def create_frequency_labels(self, freq_counter, sparse_visual, keywords, sparse_vector):
         """Create labels that explicitly show how frequencies map to sparse vector values."""
         labels = VGroup()
         freq_rows = freq_counter[1:]  # Skip the title
         cells = sparse_visual[0]
         
-        # Get the original sparse vector values
-        sparse_vector = [0, 0, 3, 0, 2, 0, 0, 1, 0, 0]
-        
         for i, (keyword, idx) in enumerate(keywords.items()):
             freq_row = freq_rows[i]
             cell = cells[idx]
@@ -379,4 +382,51 @@ class VectorComparison(Scene):
         sparse_label = Tex(r"\text{Sparse}", color=RED, font_size=16).next_to(sparse_docs, RIGHT)
         dense_label = Tex(r"\text{Dense}", color=BLUE, font_size=16).next_to(dense_docs, LEFT)
         
-        return VGroup(axes, x_label, y_label, sparse_docs, dense_docs, sparse_label, dense_label)
\ No newline at end of file
+        return VGroup(axes, x_label, y_label, sparse_docs, dense_docs, sparse_label, dense_label)
+
+
+class HighDimVectorComparison(VectorComparison):
+    """Sparse vs dense at a real embedding size: 768 dimensions, each vector one strip."""
+
+    n_dims = 768
+    zoom_dims = 16
+
+    def construct(self):
+        # Keyword counts in a handful of dimensions vs small values in all of them
+        rng = scene_params(self).rng("vectors")
+        sparse_vector = np.zeros(self.n_dims)
+        sparse_vector[rng.choice(self.n_dims, 12, replace=False)] = rng.integers(1, 4, 12)
+        dense_vector = np.clip(rng.normal(0, 0.35, self.n_dims), -1, 1)
+        
+        title = Tex(rf"\text{{Sparse vs Dense Vectors ({self.n_dims} dimensions)}}").scale(0.8)
+        title.to_edge(UP)
+        self.play(Write(title))
+        
+        # Sparse: label only the non-zero counts
+        sparse_group = self.create_vector_strip(
+            sparse_vector, "Sparse Vector", colors=SPARSE_COLORS, vmin=0, entry_format="{:.0f}", labelled="nonzero"
+        )
+        sparse_group.move_to(UP * 1.6)
+        self.play(FadeIn(sparse_group[0]), Write(sparse_group[2]))
+        self.play(Write(sparse_group[1]))
+        self.wait(1)
+        
+        # Dense: every dimension is coloured, none labelled until we zoom in
+        dense_group = self.create_vector_strip(dense_vector, "Dense Vector", colors=DIVERGING_COLORS, vmin=-1, vmax=1)
+        dense_group.move_to(DOWN * 0.2)
+        self.play(FadeIn(dense_group[0]), Write(dense_group[2]))
+        self.wait(1)
+        
+        # Zoom from the whole dense vector into its first dimensions
+        dense_strip = dense_group[0][0]
+        outline = dense_strip.window_outline(0, self.zoom_dims)
+        window, zoomed = dense_strip.zoom(0, self.zoom_dims, target=DOWN * 2.4 + RIGHT * dense_strip.get_center()[0])
+        self.play(Create(outline))
+        self.play(ReplacementTransform(window, zoomed), run_time=2)
+        
+        indices = range(self.zoom_dims)
+        zoom_labels = VGroup(zoomed.value_labels(indices, font_size=16), zoomed.index_labels(indices))
+        self.play(Write(zoom_labels))
+        self.wait(2)
+        
+        self.play(FadeOut(Group(*self.mobjects)))